@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ActorIndex queries versus scanning every actor dict.
+
+Index lookups should stay flat (or grow with the result size) as the level grows,
+while scans grow with the actor count.
+
+    python3 benchmarks/bench_actor_index.py --counts 10000,100000
+"""
+
+import argparse
+import fnmatch
+import time
+
+from bench_common import load_placer, write_results
+
+CLASSES = ["StaticMeshActor", "PointLight", "SpotLight", "CameraActor", "SkeletalMeshActor"]
+
+
+def make_actors(count: int):
+    # Names follow the example scripts: <Kind>_<index>_<timestamp>
+    return [{"name": f"{CLASSES[i % 5]}_{i}_{1712000000 + i // 1000}", "class": CLASSES[i % 5],
+             "location": {"x": float(i), "y": 0.0, "z": 0.0}} for i in range(count)]
+
+
+def best_of(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(counts) -> list:
+    placer = load_placer()
+    results = []
+    for count in counts:
+        actors = make_actors(count)
+        cache = placer.SceneCache()
+        start = time.perf_counter()
+        cache.load(actors)
+        build_s = time.perf_counter() - start
+        index = cache.index
+        timestamp = 1712000000 + count // 2000
+
+        queries = {
+            # Rare class: about 20 actors of it regardless of level size
+            "class": (lambda: index.with_class("CameraActor_rare"),
+                      lambda: [a for a in actors if a["class"] == "CameraActor_rare"]),
+            "prefix": (lambda: index.with_prefix("PointLight_1000_"),
+                       lambda: [a for a in actors if a["name"].startswith("PointLight_1000_")]),
+            "glob": (lambda: index.match("SpotLight_2?_*"),
+                     lambda: [a for a in actors if fnmatch.fnmatchcase(a["name"], "SpotLight_2?_*")]),
+            "timestamp": (lambda: index.with_timestamp(timestamp),
+                          lambda: [a for a in actors if a["name"].endswith(f"_{timestamp}")]),
+        }
+        for i in range(20):
+            cache._put({"name": f"RareCamera_{i}", "class": "CameraActor_rare"})
+
+        row = {"actors": count, "build_s": round(build_s, 4)}
+        for name, (indexed, scan) in queries.items():
+            row[f"{name}_index_us"] = round(best_of(indexed) * 1e6, 2)
+            row[f"{name}_scan_us"] = round(best_of(scan, 3) * 1e6, 2)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="10000,100000")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = run([int(count) for count in args.counts.split(",")])
+    for row in results:
+        print(f"{row['actors']} actors (index build {row['build_s']:.3f}s)")
+        for query in ("class", "prefix", "glob", "timestamp"):
+            print(f"   {query:>10}: index {row[query + '_index_us']:>10.1f} us   scan {row[query + '_scan_us']:>12.1f} us")
+    if args.json:
+        write_results(args.json, {"benchmark": "actor_index", "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spawning many actors with batched, pipelined and one-at-a-time commands.
+
+    python3 benchmarks/bench_batch_spawn.py --actors 5000 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+def actor_specs(count: int, prefix: str):
+    return [{"name": f"{prefix}_{i}", "type": "StaticMeshActor",
+             "location": [(i % 100) * 150.0, (i // 100) * 150.0, 0.0]} for i in range(count)]
+
+
+async def spawn_sequential(placer, specs):
+    conn = placer.get_unreal_connection()
+    for spec in specs:
+        await conn.send_command("spawn_actor", placer.spawn_params(spec))
+
+
+async def spawn_batched(placer, specs):
+    results = await placer.get_unreal_connection().spawn_actors_batch(specs)
+    assert not results["errors"], results["errors"][:3]
+
+
+async def measure(placer, mode: str, count: int, latency: float) -> dict:
+    # Stock-like server for the pipelined fallback, extended one for real batches
+    server = FakeUnrealServer(latency=latency, batch=(mode == "batched"))
+    port = await server.start()
+    use_server(placer, port)
+    specs = actor_specs(count, mode)
+    try:
+        start = time.perf_counter()
+        if mode == "sequential":
+            await spawn_sequential(placer, specs)
+        else:
+            await spawn_batched(placer, specs)
+        elapsed = time.perf_counter() - start
+    finally:
+        placer.get_unreal_connection().pool.close()
+        await server.stop()
+    assert len(server.actors) == count
+    return {"mode": mode, "actors": count, "latency_s": latency, "elapsed_s": round(elapsed, 4),
+            "actors_per_s": round(count / elapsed, 1)}
+
+
+async def run(count: int, latency: float, sequential_max: int) -> list:
+    placer = load_placer()
+    results = [await measure(placer, "batched", count, latency),
+               await measure(placer, "pipelined", count, latency)]
+    results.append(await measure(placer, "sequential", min(count, sequential_max), latency))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.002, help="Fake server delay per request")
+    parser.add_argument("--sequential-max", type=int, default=500,
+                        help="Cap for the one-at-a-time baseline")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.actors, args.latency, args.sequential_max))
+    print(f"{'mode':>12} {'actors':>8} {'seconds':>9} {'actors/s':>10}")
+    for row in results:
+        print(f"{row['mode']:>12} {row['actors']:>8} {row['elapsed_s']:>9.3f} {row['actors_per_s']:>10.1f}")
+    if args.json:
+        write_results(args.json, {"benchmark": "batch_spawn", "results": results})
+
+
+if __name__ == "__main__":
+    main()
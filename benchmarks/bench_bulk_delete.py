@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: clear_workspace on a large level behind a slow fake UnrealMCP server.
+
+Runs against a batch-capable server and a stock-like one (pipelined deletes), and
+prints the one-delete-at-a-time cost the tool used to pay for comparison.
+
+    python3 benchmarks/bench_bulk_delete.py --actors 10000 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+async def measure(placer, batch: bool, count: int, latency: float, concurrency: int) -> dict:
+    server = FakeUnrealServer(latency=latency, batch=batch)
+    server.populate(count, prefix="Cube")
+    server.handle("spawn_actor", {"type": "PlayerStart", "name": "PlayerStart_0"})
+    # Own thread and loop, so server work does not count against the client
+    port = server.start_in_thread()
+    use_server(placer, port, max_size=concurrency)  # Keep every pipelined stream alive
+
+    try:
+        start = time.perf_counter()
+        conn = placer.get_unreal_connection()
+        response = await conn.send_command("get_all_actors", {})
+        names = [actor["name"] for actor in response["actors"]
+                 if actor["class"] not in placer.PROTECTED_ACTOR_CLASSES]
+        results = await conn.delete_actors_bulk(names, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+    finally:
+        placer.get_unreal_connection().pool.close()
+        server.stop_thread()
+
+    assert list(server.actors) == ["PlayerStart_0"], "protected actors must survive"
+    return {"mode": "batched" if batch else f"pipelined x{concurrency}", "actors": count,
+            "latency_s": latency, "elapsed_s": round(elapsed, 4), "deleted": len(results["deleted"]),
+            "sequential_estimate_s": round(count * latency, 2)}
+
+
+async def run(count: int, latency: float, concurrency: int) -> list:
+    placer = load_placer()
+    return [await measure(placer, True, count, latency, concurrency),
+            await measure(placer, False, count, latency, concurrency)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake server delay per request")
+    parser.add_argument("--concurrency", type=int, default=16, help="Deletes in flight without batching")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.actors, args.latency, args.concurrency))
+    print(f"{'mode':>14} {'actors':>8} {'seconds':>9} {'sequential est.':>16}")
+    for row in results:
+        print(f"{row['mode']:>14} {row['actors']:>8} {row['elapsed_s']:>9.3f} {row['sequential_estimate_s']:>15.1f}s")
+    if args.json:
+        write_results(args.json, {"benchmark": "bulk_delete", "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Shared helpers for the benchmark and stress scripts"""
+
+import importlib.util
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_placer():
+    """Import vhci-object-placer.py (hyphenated, so not importable by name)"""
+    if "vhci_object_placer" in sys.modules:
+        return sys.modules["vhci_object_placer"]
+    spec = importlib.util.spec_from_file_location("vhci_object_placer", ROOT / "vhci-object-placer.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["vhci_object_placer"] = module
+    spec.loader.exec_module(module)
+    logging.getLogger("VHCIUniversalCreator").setLevel(logging.WARNING)
+    return module
+
+
+def use_server(placer, port: int, **pool_options):
+    """Point the shared client used by the MCP tools at a local server"""
+    pool = placer.UnrealConnectionPool(port=port, **pool_options)
+    placer._shared_connection = placer.UnrealConnection(pool)
+    return placer._shared_connection
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like 512, 64K, 10M"""
+    text = text.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def write_results(path: str, data: dict):
+    with open(path, "w") as handle:
+        json.dump(data, handle, indent=2)
+    print(f"Results written to {path}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes on the wire and decode time for large actor lists per encoding.
+
+For each combination of encoding (JSON, plus MessagePack/CBOR when installed),
+compression (none, zlib, plus zstd when installed) and actor-list layout (rows
+of dicts or columnar parallel arrays), measures the get_all_actors reply size,
+the time to split and decode it into actor dicts, and the full fetch through
+get_actors(refresh=True) against the fake server.
+
+    python3 benchmarks/bench_encoding.py --actors 100000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import COMPRESSIONS, ENCODINGS, FakeUnrealServer
+
+
+def combinations() -> list:
+    return [(encoding, compression, columnar)
+            for encoding in ("json",) + ENCODINGS
+            for compression in ("none",) + COMPRESSIONS
+            for columnar in (False, True)]
+
+
+def decode_seconds(placer, reply: bytes, repeat: int) -> float:
+    """Median time to split one reply off the stream and expand it into actor dicts"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        framer = placer.JsonMessageFramer(placer.FRAMING_LENGTH)
+        (message,) = framer.feed(reply)
+        placer.extract_actors(message)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+async def measure(placer, server, port: int, encoding: str, compression: str, columnar: bool,
+                  repeat: int) -> dict:
+    placer.UNREAL_ENCODINGS = () if encoding == "json" else (encoding,)
+    placer.UNREAL_COMPRESSIONS = () if compression == "none" else (compression,)
+    placer.UNREAL_COLUMNAR_ACTORS = columnar
+    conn = use_server(placer, port)
+    await conn.send_command("ping", {})
+    assert (conn.encoding, conn.compression, conn.columnar) == (encoding, compression, columnar)
+
+    response = server.handle("get_all_actors", {"columnar": True} if columnar else {})
+    reply = server.encode(response, placer.FRAMING_LENGTH, encoding, compression, placer.UNREAL_COMPRESS_OVER)
+
+    start = time.perf_counter()
+    actors = await conn.get_actors(refresh=True)
+    fetch_s = time.perf_counter() - start
+    conn.pool.close()
+    assert len(actors) == len(server.actors)
+    return {"encoding": encoding, "compression": compression, "columnar": columnar,
+            "bytes": len(reply), "decode_s": round(decode_seconds(placer, reply, repeat), 4),
+            "fetch_s": round(fetch_s, 4)}
+
+
+async def run(count: int, repeat: int) -> list:
+    placer = load_placer()
+    defaults = (placer.UNREAL_ENCODINGS, placer.UNREAL_COMPRESSIONS, placer.UNREAL_COLUMNAR_ACTORS)
+    server = FakeUnrealServer()
+    server.populate(count)
+    port = server.start_in_thread()
+    try:
+        return [await measure(placer, server, port, *combination, repeat) for combination in combinations()]
+    finally:
+        placer.UNREAL_ENCODINGS, placer.UNREAL_COMPRESSIONS, placer.UNREAL_COLUMNAR_ACTORS = defaults
+        server.stop_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5, help="Decode timings to take the median of")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.actors, args.repeat))
+    baseline = results[0]["bytes"]
+    print(f"get_all_actors with {args.actors:,} actors")
+    print(f"{'encoding':>9} {'compression':>11} {'layout':>8} {'bytes':>12} {'vs json':>8} {'decode s':>9} {'fetch s':>8}")
+    for row in results:
+        layout = "columnar" if row["columnar"] else "rows"
+        print(f"{row['encoding']:>9} {row['compression']:>11} {layout:>8} {row['bytes']:>12,} "
+              f"{row['bytes'] / baseline:>7.0%} {row['decode_s']:>9.3f} {row['fetch_s']:>8.3f}")
+    if args.json:
+        write_results(args.json, {"benchmark": "encoding", "actors": args.actors, "results": results})
+
+
+if __name__ == "__main__":
+    main()
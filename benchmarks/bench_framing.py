@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: reply framing cost for get_all_actors-sized payloads.
+
+Compares JsonMessageFramer (raw, ndjson and length-prefixed modes) with the old
+"append chunk, re-parse everything" receive loop. The old loop is quadratic, so it
+only runs up to --legacy-max bytes.
+
+    python3 benchmarks/bench_framing.py --sizes 10K,100K,1M,10M,50M
+"""
+
+import argparse
+import json
+import time
+
+from bench_common import load_placer, parse_size, write_results
+
+
+def make_actor_payload(target_bytes: int) -> bytes:
+    """Build a get_all_actors reply of roughly target_bytes"""
+    actor = {"name": "StaticMeshActor_000000", "class": "StaticMeshActor",
+             "location": {"x": 1234.5, "y": -678.25, "z": 90.0}}
+    per_actor = len(json.dumps(actor)) + 2
+    count = max(1, target_bytes // per_actor)
+    actors = [{"name": f"StaticMeshActor_{i:06d}", "class": "StaticMeshActor",
+               "location": {"x": i * 1.5, "y": -i * 0.25, "z": 90.0}} for i in range(count)]
+    return json.dumps({"status": "success", "actors": actors}).encode("utf-8")
+
+
+def frame(payload: bytes, mode: str) -> bytes:
+    if mode == "ndjson":
+        return payload + b"\n"
+    if mode == "length":
+        return len(payload).to_bytes(4, "big") + payload
+    return payload
+
+
+def time_framer(placer, data: bytes, mode: str, chunk_size: int) -> float:
+    framer = placer.JsonMessageFramer(mode)
+    start = time.perf_counter()
+    messages = []
+    for offset in range(0, len(data), chunk_size):
+        messages.extend(framer.feed(data[offset:offset + chunk_size]))
+    elapsed = time.perf_counter() - start
+    assert len(messages) == 1
+    return elapsed
+
+
+def check_pipelined(placer, mode: str):
+    """A complete reply must come out even when the next one has only partly arrived"""
+    first, second = frame(b'{"status": "success", "a": "}{"}', mode), frame(b'{"status": "success", "b": 2}', mode)
+    framer = placer.JsonMessageFramer(mode)
+    assert framer.feed(first + second[:-3]) == [{"status": "success", "a": "}{"}], f"{mode}: first reply held back"
+    assert framer.feed(second[-3:]) == [{"status": "success", "b": 2}], f"{mode}: second reply lost"
+
+
+def time_legacy(data: bytes, chunk_size: int) -> float:
+    """The receive loop send_command used before incremental framing"""
+    start = time.perf_counter()
+    response_data = b""
+    for offset in range(0, len(data), chunk_size):
+        response_data += data[offset:offset + chunk_size]
+        try:
+            json.loads(response_data.decode("utf-8"))
+            break
+        except json.JSONDecodeError:
+            continue
+    return time.perf_counter() - start
+
+
+def run(sizes, chunk_size: int = 65536, legacy_max: int = 1 << 20) -> list:
+    placer = load_placer()
+    for mode in placer.JsonMessageFramer.MODES:
+        check_pipelined(placer, mode)
+    results = []
+    for size in sizes:
+        payload = make_actor_payload(size)
+        start = time.perf_counter()
+        json.loads(payload)
+        row = {"bytes": len(payload), "json_loads_s": time.perf_counter() - start}
+        for mode in placer.JsonMessageFramer.MODES:
+            row[f"{mode}_s"] = time_framer(placer, frame(payload, mode), mode, chunk_size)
+        # The old loop read 4 KB at a time
+        row["legacy_s"] = time_legacy(payload, 4096) if len(payload) <= legacy_max else None
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10K,100K,1M,10M,50M")
+    parser.add_argument("--chunk-size", default="64K", help="Bytes per simulated recv()")
+    parser.add_argument("--legacy-max", default="1M", help="Largest payload to run the old loop on")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = run([parse_size(size) for size in args.sizes.split(",")],
+                  parse_size(args.chunk_size), parse_size(args.legacy_max))
+
+    print(f"{'bytes':>12} {'json.loads':>11} {'raw':>9} {'ndjson':>9} {'length':>9} {'legacy':>10}")
+    for row in results:
+        legacy = f"{row['legacy_s']:.4f}" if row["legacy_s"] is not None else "skipped"
+        print(f"{row['bytes']:>12} {row['json_loads_s']:>11.4f} {row['raw_s']:>9.4f} "
+              f"{row['ndjson_s']:>9.4f} {row['length_s']:>9.4f} {legacy:>10}")
+    if args.json:
+        write_results(args.json, {"benchmark": "framing", "results": results})
+
+
+if __name__ == "__main__":
+    main()
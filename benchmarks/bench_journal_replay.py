@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rebuilding a journaled scene after small edits versus from scratch.
+
+Spawns --actors actors with a SceneJournal attached, then damages the live
+scene (removes, moves and adds a few actors) and replays the journal. Only the
+difference should be sent; the full rebuild into an empty level is timed for
+comparison.
+
+    python3 benchmarks/bench_journal_replay.py --actors 10000 --edits 10
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+async def replay(placer, conn, server, path: str) -> dict:
+    before = server.requests
+    start = time.perf_counter()
+    report = await placer.replay_journal_file(conn, path)
+    elapsed = time.perf_counter() - start
+    assert not report["failed"], report["failed"][:3]
+    return {"seconds": round(elapsed, 4), "commands": server.requests - before,
+            "spawned": report["spawned"], "moved": report["moved"], "deleted": report["deleted"]}
+
+
+async def run(count: int, edits: int, latency: float) -> dict:
+    placer = load_placer()
+    server = FakeUnrealServer(latency=latency)
+    port = server.start_in_thread()
+    handle, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(handle)
+    try:
+        conn = use_server(placer, port)
+        conn.journal = placer.SceneJournal(path)
+        specs = [{"name": f"Journaled_{i}", "type": "StaticMeshActor",
+                  "location": [(i % 100) * 150.0, (i // 100) * 150.0, 0.0]} for i in range(count)]
+        start = time.perf_counter()
+        results = await conn.spawn_actors_batch(specs)
+        build_s = time.perf_counter() - start
+        assert not results["errors"], results["errors"][:3]
+        conn.journal = None  # Replays below should not grow the journal being measured
+
+        # Damage the live scene behind the client's back, as an editor crash or undo would
+        names = list(server.actors)
+        for name in names[:edits]:
+            del server.actors[name]
+        for name in names[edits:2 * edits]:
+            server.actors[name]["location"]["z"] += 250.0
+        for i in range(edits):
+            server.actors[f"Stray_{i}"] = {"name": f"Stray_{i}", "class": "PointLight",
+                                           "location": {"x": 0.0, "y": 0.0, "z": 0.0}}
+        small = await replay(placer, conn, server, path)
+
+        server.actors.clear()
+        full = await replay(placer, conn, server, path)
+        return {"actors": count, "edits": edits, "journal_bytes": os.path.getsize(path),
+                "initial_build_s": round(build_s, 4), "after_edits": small, "from_empty": full}
+    finally:
+        server.stop_thread()
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=10000)
+    parser.add_argument("--edits", type=int, default=10, help="Actors removed and actors moved before replaying")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server delay per request")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.actors, args.edits, args.latency))
+    print(f"Journal: {result['actors']} actors, {result['journal_bytes']:,} bytes "
+          f"(initial build {result['initial_build_s']:.3f}s)")
+    for label, key in (("After edits", "after_edits"), ("From empty", "from_empty")):
+        row = result[key]
+        print(f"{label:>12}: {row['commands']:>6} commands in {row['seconds']:.3f}s "
+              f"(spawned {row['spawned']}, moved {row['moved']}, deleted {row['deleted']})")
+    if args.json:
+        write_results(args.json, {"benchmark": "journal_replay", "results": result})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: layout generators with NumPy and with the pure-Python fallback.
+
+    python3 benchmarks/bench_layouts.py --count 1000000
+"""
+
+import argparse
+import time
+
+from bench_common import load_placer, write_results
+
+SHAPES = ("ring", "grid", "spiral", "stack")
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(count: int, scatter_count: int, backends) -> list:
+    placer = load_placer()
+    numpy = placer.np
+    results = []
+    for backend in backends:
+        if backend == "numpy" and numpy is None:
+            print("NumPy is not installed - skipping the vectorized backend")
+            continue
+        placer.np = numpy if backend == "numpy" else None
+        try:
+            for shape in SHAPES:
+                results.append({"backend": backend, "shape": shape, "count": count,
+                                "seconds": round(timed(lambda: placer.build_layout(shape, count)), 4)})
+            spline = [[0, 0, 0], [1000, 0, 0], [1000, 1000, 200], [0, 1000, 400]]
+            results.append({"backend": backend, "shape": "spline", "count": count,
+                            "seconds": round(timed(lambda: placer.spline_layout(count, spline)), 4)})
+            # Poisson-disk sampling is sequential, so it runs at a smaller size
+            results.append({"backend": backend, "shape": "scatter", "count": scatter_count,
+                            "seconds": round(timed(lambda: placer.scatter_layout(
+                                scatter_count, radius=100000.0, min_distance=100.0, seed=1)), 4)})
+        finally:
+            placer.np = numpy
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--scatter-count", type=int, default=20000)
+    parser.add_argument("--backends", default="numpy,python")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.count, args.scatter_count, args.backends.split(","))
+    print(f"{'backend':>8} {'shape':>8} {'items':>9} {'seconds':>9}")
+    for row in results:
+        print(f"{row['backend']:>8} {row['shape']:>8} {row['count']:>9} {row['seconds']:>9.3f}")
+    if args.json:
+        write_results(args.json, {"benchmark": "layouts", "results": results})
+
+
+if __name__ == "__main__":
+    main()
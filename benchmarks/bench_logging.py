@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: send_command logging cost on large get_all_actors replies.
+
+Times log_request and log_reply on their own - no socket, no decoding - for a
+get_all_actors request and reply, with the old logging (the full request and
+reply formatted into f-strings on every call, even with INFO off) and with the
+current summaries, at INFO and WARNING.
+
+    python3 benchmarks/bench_logging.py --actors 1000,10000,50000
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+from bench_common import load_placer, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+def legacy_loggers(placer):
+    """The send_command logging this replaced"""
+    def log_request(envelope, message):
+        placer.logger.info(f"Sending: {message}")
+        return False
+
+    def log_reply(command_type, response, size, sampled):
+        placer.logger.info(f"UE Response: {response}")
+
+    return log_request, log_reply
+
+
+def time_logging(loggers, envelope: dict, payload: bytes, response: dict, repeat: int) -> float:
+    """Best time to log one request and its reply"""
+    log_request, log_reply = loggers
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sampled = log_request(envelope, payload)
+        log_reply("get_all_actors", response, len(payload), sampled)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(counts, repeat: int) -> list:
+    placer = load_placer()
+    logger = placer.logger
+    # Write to /dev/null so the cost measured is formatting and handler work, not the terminal
+    devnull = open(os.devnull, "w")
+    handler = logging.StreamHandler(devnull)
+    logger.addHandler(handler)
+    logger.propagate = False
+    envelope = {"type": "get_all_actors", "params": {}}
+    payload = json.dumps(envelope).encode("utf-8")
+    results = []
+    try:
+        for count in counts:
+            server = FakeUnrealServer()
+            server.populate(count)
+            response = server.handle("get_all_actors", {})
+            for level in ("INFO", "WARNING"):
+                logger.setLevel(level)
+                row = {"actors": count, "level": level}
+                for style, loggers in (("legacy", legacy_loggers(placer)),
+                                       ("summary", (placer.log_request, placer.log_reply))):
+                    row[f"{style}_us"] = round(time_logging(loggers, envelope, payload, response, repeat) * 1e6, 1)
+                results.append(row)
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+        logger.setLevel(logging.WARNING)
+        devnull.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", default="1000,10000,50000", help="Comma-separated level sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions per measurement")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = run([int(count) for count in args.actors.split(",")], args.repeat)
+    print(f"{'actors':>8} {'level':>8} {'legacy us':>11} {'summary us':>11}")
+    for row in results:
+        print(f"{row['actors']:>8} {row['level']:>8} {row['legacy_us']:>11,.1f} {row['summary_us']:>11,.1f}")
+    if args.json:
+        write_results(args.json, {"benchmark": "logging", "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: many moves of a few actors, sent directly versus through the transform queue.
+
+Models an agent animating --actors actors with --moves moves each, all issued
+concurrently: as one set_actor_location per move (what move_actor used to
+send, UNREAL_PIPELINE_DEPTH in flight), through move_actor (queued, coalesced and batched) and as one
+move_actors call.
+
+    python3 benchmarks/bench_move_coalescing.py --actors 100 --moves 50 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+MODES = ("direct", "move_actor", "move_actors")
+
+
+def frames(actors: int, moves: int) -> list:
+    return [(f"Mover_{i}", [float(i * 100), float(step * 10), 0.0]) for step in range(moves) for i in range(actors)]
+
+
+async def run_moves(placer, server, port: int, transforms: list, mode: str) -> dict:
+    conn = use_server(placer, port)
+    await conn.send_command("ping", {})
+    before = server.requests
+    start = time.perf_counter()
+    if mode == "direct":
+        # Bounded like the pipelined fallback - thousands of unbounded sends run out of sockets
+        replies = await conn._send_pipelined([
+            {"type": "set_actor_location", "params": {"actor_name": name, "location": dict(zip("xyz", location))}}
+            for name, location in transforms])
+        ok = all(reply.get("status") == "success" for reply in replies)
+    elif mode == "move_actor":
+        replies = await asyncio.gather(*[placer.move_actor(name, *location) for name, location in transforms])
+        ok = all("Moved Successfully" in reply for reply in replies)
+    else:
+        reply = await placer.move_actors([{"name": name, "location": location} for name, location in transforms])
+        ok = "❌" not in reply
+    elapsed = time.perf_counter() - start
+    conn.pool.close()
+    last = {name: location for name, location in transforms}
+    assert ok and all(server.actors[name]["location"]["y"] == location[1] for name, location in last.items())
+    return {"seconds": round(elapsed, 4), "commands": server.requests - before, **conn.transforms.stats()}
+
+
+async def run(actors: int, moves: int, latency: float) -> dict:
+    placer = load_placer()
+    server = FakeUnrealServer(latency=latency)
+    server.populate(actors, prefix="Mover")
+    port = server.start_in_thread()
+    try:
+        transforms = frames(actors, moves)
+        result = {"moves": len(transforms)}
+        for mode in MODES:
+            result[mode] = await run_moves(placer, server, port, transforms, mode)
+        return result
+    finally:
+        server.stop_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=100)
+    parser.add_argument("--moves", type=int, default=50, help="Moves per actor")
+    parser.add_argument("--latency", type=float, default=0.002, help="Fake server delay per request")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.actors, args.moves, args.latency))
+    print(f"{result['moves']} moves of {args.actors} actors")
+    print(f"{'mode':>12} {'seconds':>8} {'commands':>9} {'coalesced':>10}")
+    for mode in MODES:
+        row = result[mode]
+        print(f"{mode:>12} {row['seconds']:>8.3f} {row['commands']:>9} {row['coalesced']:>10}")
+    if args.json:
+        write_results(args.json, {"benchmark": "move_coalescing", "results": result})
+
+
+if __name__ == "__main__":
+    main()
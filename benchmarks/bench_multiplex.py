@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: command throughput with request ids multiplexed on one socket.
+
+For each simulated latency, sends --commands set_actor_location commands:
+one at a time on one socket (the old wire format's limit), pipelined over one
+pooled socket per in-flight command, and multiplexed on a single socket with
+request ids, at each --depths commands in flight.
+
+    python3 benchmarks/bench_multiplex.py --latencies 1,5,10,20 --depths 16,64
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+async def measure(placer, latency_ms: float, count: int, depth: int, multiplex: bool) -> dict:
+    placer.UNREAL_MULTIPLEX = multiplex
+    server = FakeUnrealServer(latency=latency_ms / 1000.0)
+    server.populate(count)
+    port = server.start_in_thread()
+    try:
+        conn = use_server(placer, port)
+        await conn.send_command("ping", {})  # Negotiate outside the timing
+        assert conn.multiplex == multiplex
+        commands = [{"type": "set_actor_location", "params": {"actor_name": f"Seed_{i}", "location": [i, 0, 0]}}
+                    for i in range(count)]
+        start = time.perf_counter()
+        replies = await conn._send_pipelined(commands, depth)
+        elapsed = time.perf_counter() - start
+        conn.pool.close()
+        failed = sum(1 for reply in replies if reply.get("status") != "success")
+        assert not failed, f"{failed} commands failed"
+        return {"latency_ms": latency_ms, "depth": depth, "multiplexed": multiplex,
+                "commands_per_s": round(count / elapsed, 1),
+                "sockets": server.counters["connections"]}
+    finally:
+        server.stop_thread()
+
+
+async def run(latencies, depths, count: int) -> list:
+    placer = load_placer()
+    default = placer.UNREAL_MULTIPLEX
+    results = []
+    try:
+        for latency_ms in latencies:
+            # Sequential commands are slow at high latency, so time fewer of them
+            results.append(await measure(placer, latency_ms, min(count, 200), 1, False))
+            for depth in depths:
+                results.append(await measure(placer, latency_ms, count, depth, False))
+                results.append(await measure(placer, latency_ms, count, depth, True))
+    finally:
+        placer.UNREAL_MULTIPLEX = default
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencies", default="1,5,10,20", help="Comma-separated server latencies in ms")
+    parser.add_argument("--depths", default="16,64", help="Comma-separated commands in flight")
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run([float(value) for value in args.latencies.split(",")],
+                              [int(value) for value in args.depths.split(",")], args.commands))
+    print(f"{'latency ms':>10} {'in flight':>9} {'mode':>12} {'commands/s':>11} {'sockets':>8}")
+    for row in results:
+        mode = "multiplexed" if row["multiplexed"] else ("sequential" if row["depth"] == 1 else "pooled")
+        print(f"{row['latency_ms']:>10g} {row['depth']:>9} {mode:>12} {row['commands_per_s']:>11,.0f} {row['sockets']:>8}")
+    if args.json:
+        write_results(args.json, {"benchmark": "multiplex", "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: natural-language parsing throughput, checked against a regression corpus.
+
+    python3 benchmarks/bench_parser.py --rounds 200
+
+parser_corpus.json holds descriptions with the game type, element names and
+spawn plans parse_game_description is expected to produce; any mismatch is
+reported and the script exits non-zero.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from bench_common import load_placer, write_results
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_corpus.json")
+
+
+def describe_plan(plan) -> str:
+    """Compact form used in the corpus, e.g. "10 PointLight circle r=500 palette=8 intensity=5000" """
+    parts = [str(plan.count), plan.actor_class, plan.shape]
+    for key, label in (("radius", "r"), ("spacing", "spacing"), ("min_distance", "min")):
+        if key in plan.options:
+            parts.append(f"{label}={plan.options[key]:g}")
+    if plan.options["center"][2]:
+        parts.append(f"z={plan.options['center'][2]:g}")
+    if plan.palette:
+        parts.append(f"palette={len(plan.palette)}")
+    if plan.intensity is not None:
+        parts.append(f"intensity={plan.intensity:g}")
+    if plan.scale:
+        parts.append("scale=" + "x".join(f"{value:g}" for value in plan.scale))
+    return " ".join(parts)
+
+
+def check_corpus(placer, creator, corpus) -> list:
+    mismatches = []
+    for case in corpus:
+        features = placer.DESCRIPTION_MATCHER.features(case["description"])
+        got = {"game_type": creator._detect_game_type(features),
+               "elements": [element.name for element in creator.parse_game_description(case["description"])],
+               "plans": [describe_plan(plan) for plan in placer.PLAN_EXTRACTOR.extract(case["description"].lower())]}
+        expected = {"game_type": case["game_type"], "elements": case["elements"], "plans": case.get("plans", [])}
+        if got != expected:
+            mismatches.append({"description": case["description"], "expected": expected, "got": got})
+    return mismatches
+
+
+def throughput(fn, items, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+    return rounds * len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the corpus per measurement")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    placer = load_placer()
+    # Parsing never touches the connection, so skip building one
+    creator = placer.GameCreationIntelligence.__new__(placer.GameCreationIntelligence)
+    with open(args.corpus) as handle:
+        corpus = json.load(handle)
+    descriptions = [case["description"] for case in corpus]
+    long_description = " ".join(descriptions) * 20
+
+    # Measure the parser itself; the parse cache is timed separately below
+    placer.PARSE_CACHE.enabled = False
+    mismatches = check_corpus(placer, creator, corpus)
+    results = {
+        "corpus_size": len(corpus),
+        "mismatches": mismatches,
+        "features_per_s": round(throughput(placer.DESCRIPTION_MATCHER.features, descriptions, args.rounds)),
+        "plans_per_s": round(throughput(placer.PLAN_EXTRACTOR.extract, [text.lower() for text in descriptions],
+                                        args.rounds)),
+        "parses_per_s": round(throughput(creator.parse_game_description, descriptions, args.rounds)),
+        "long_description_chars": len(long_description),
+        "long_parses_per_s": round(throughput(creator.parse_game_description, [long_description],
+                                              max(1, args.rounds // 10))),
+    }
+    placer.PARSE_CACHE.enabled = True
+    results["cached_parses_per_s"] = round(throughput(creator.parse_game_description, descriptions, args.rounds))
+    results["parse_cache"] = placer.PARSE_CACHE.stats()
+
+    print(f"Corpus: {len(corpus)} descriptions, {len(mismatches)} mismatches")
+    for mismatch in mismatches:
+        print(f"  ❌ {mismatch['description']!r}\n     expected {mismatch['expected']}\n     got      {mismatch['got']}")
+    print(f"Feature extraction: {results['features_per_s']:>10,} descriptions/s")
+    print(f"Plan extraction:    {results['plans_per_s']:>10,} descriptions/s")
+    print(f"Full parse:         {results['parses_per_s']:>10,} descriptions/s")
+    print(f"Full parse ({results['long_description_chars']:,} chars): {results['long_parses_per_s']:,}/s")
+    print(f"Cached parse:       {results['cached_parses_per_s']:>10,} descriptions/s "
+          f"(hit rate {results['parse_cache']['hit_rate']})")
+    if args.json:
+        write_results(args.json, {"benchmark": "parser", "results": results})
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: apply_scene on a large spec - first build, unchanged re-apply and a small edit.
+
+    python3 benchmarks/bench_scene_apply.py --actors 20000
+
+The unchanged re-apply should send nothing beyond (at most) one get_all_actors.
+"""
+
+import argparse
+import asyncio
+import copy
+import tempfile
+import time
+
+from bench_common import load_placer, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+
+def make_spec(count: int) -> dict:
+    return {"scene": "bench", "layouts": [
+        {"name": "Block", "shape": "grid", "count": count - count // 10, "spacing": 150},
+        {"name": "Lamp", "shape": "ring", "count": count // 10, "radius": 20000, "type": "PointLight",
+         "intensity": 3000, "colors": "rainbow"},
+    ]}
+
+
+async def timed_apply(placer, server, document: dict, label: str, refresh: bool = True) -> dict:
+    before = server.requests
+    start = time.perf_counter()
+    report = await placer.apply_scene_spec(placer.get_unreal_connection(), document, refresh=refresh)
+    elapsed = time.perf_counter() - start
+    assert not report["failed"], report["failed"][:3]
+    return {"step": label, "seconds": round(elapsed, 4), "commands": server.requests - before,
+            "spawned": report["spawned"], "moved": report["moved"], "deleted": report["deleted"],
+            "unchanged": report["diff"].unchanged}
+
+
+async def run(count: int) -> list:
+    placer = load_placer()
+    placer.SCENE_STATE_DIR = tempfile.mkdtemp(prefix="vhci-scenes-")
+    server = FakeUnrealServer()
+    port = server.start_in_thread()
+    use_server(placer, port)
+    try:
+        spec = make_spec(count)
+        rows = [await timed_apply(placer, server, spec, "first apply"),
+                await timed_apply(placer, server, spec, "unchanged, cached", refresh=False),
+                await timed_apply(placer, server, spec, "unchanged, refreshed")]
+        edited = copy.deepcopy(spec)
+        edited["layouts"][1]["intensity"] = 4000  # Respawns every lamp
+        edited["layouts"][0]["count"] -= 100  # Deletes 100 blocks and reflows the grid
+        rows.append(await timed_apply(placer, server, edited, "edited"))
+        return rows
+    finally:
+        server.stop_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=20000)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.actors))
+    print(f"{'step':>22} {'seconds':>8} {'commands':>9} {'spawned':>8} {'moved':>6} {'deleted':>8} {'unchanged':>10}")
+    for row in rows:
+        print(f"{row['step']:>22} {row['seconds']:>8.3f} {row['commands']:>9} {row['spawned']:>8} "
+              f"{row['moved']:>6} {row['deleted']:>8} {row['unchanged']:>10}")
+    if args.json:
+        write_results(args.json, {"benchmark": "scene_apply", "actors": args.actors, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
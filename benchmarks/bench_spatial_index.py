@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SpatialIndex radius/box queries and free-slot search on large levels.
+
+    python3 benchmarks/bench_spatial_index.py --counts 10000,100000
+"""
+
+import argparse
+import math
+import random
+import time
+
+from bench_common import load_placer, write_results
+
+
+def make_actors(count: int, extent: float):
+    rng = random.Random(42)
+    return [{"name": f"Actor_{i}", "location": {"x": rng.uniform(-extent, extent),
+                                                "y": rng.uniform(-extent, extent),
+                                                "z": rng.uniform(0, 2000)}} for i in range(count)]
+
+
+def per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(counts, extent: float, queries: int) -> list:
+    placer = load_placer()
+    rng = random.Random(7)
+    results = []
+    for count in counts:
+        actors = make_actors(count, extent)
+        index = placer.SpatialIndex()
+        start = time.perf_counter()
+        index.rebuild(actors)
+        build_s = time.perf_counter() - start
+
+        centers = [(rng.uniform(-extent, extent), rng.uniform(-extent, extent), 1000.0) for _ in range(queries)]
+        points = list(index.points.values())
+        planner = placer.PlacementPlanner(index, clearance=100.0)
+
+        row = {
+            "actors": count,
+            "build_s": round(build_s, 4),
+            "radius_us": round(per_call_us(lambda i: index.query_radius(centers[i], 1000.0), queries), 2),
+            "box_us": round(per_call_us(lambda i: index.query_box(
+                (centers[i][0] - 500, centers[i][1] - 500, 0), (centers[i][0] + 500, centers[i][1] + 500, 2000)),
+                queries), 2),
+            "free_slot_us": round(per_call_us(lambda i: planner.nearest_free_slot(centers[i]), queries), 2),
+            # Reference: one brute-force radius query over every actor
+            "radius_scan_us": round(per_call_us(lambda i: [p for p in points if math.dist(p, centers[i]) <= 1000.0],
+                                                max(1, queries // 50)), 2),
+        }
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="10000,100000")
+    parser.add_argument("--extent", type=float, default=50000.0, help="Half-width of the level in units")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = run([int(count) for count in args.counts.split(",")], args.extent, args.queries)
+    print(f"{'actors':>8} {'build s':>8} {'radius us':>10} {'box us':>8} {'free slot us':>13} {'scan us':>10}")
+    for row in results:
+        print(f"{row['actors']:>8} {row['build_s']:>8.3f} {row['radius_us']:>10.1f} {row['box_us']:>8.1f} "
+              f"{row['free_slot_us']:>13.1f} {row['radius_scan_us']:>10.1f}")
+    if args.json:
+        write_results(args.json, {"benchmark": "spatial_index", "results": results})
+
+
+if __name__ == "__main__":
+    main()
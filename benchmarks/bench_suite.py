@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: transport, actor-list decoding, parsing, layouts and end-to-end
+create_objects, compared against a stored baseline.
+
+    python3 benchmarks/bench_suite.py --save-baseline          # record a baseline
+    python3 benchmarks/bench_suite.py --json results.json      # compare against it
+
+Every metric is written as {"value", "unit", "better"}; a metric that moved the
+wrong way by more than --tolerance against the baseline is a regression and the
+script exits non-zero. Baselines are machine specific, so record one on the
+machine (or CI runner) that will be compared against it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+
+from bench_common import load_placer, percentile, use_server, write_results
+from fake_unreal_server import FakeUnrealServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baseline.json")
+CORPUS = os.path.join(HERE, "parser_corpus.json")
+LAYOUT_SHAPES = ("ring", "grid", "spiral", "stack")
+
+
+def metric(value: float, unit: str, better: str) -> dict:
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def show(value: float) -> str:
+    return f"{value:,.0f}" if abs(value) >= 1000 else f"{value:.4g}"
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def bench_transport(placer, port: int, calls: int) -> dict:
+    """Round-trip latency of send_command on a keep-alive connection"""
+    conn = use_server(placer, port)
+    await conn.send_command("ping", {})  # Connect and negotiate outside the timings
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = await conn.send_command("ping", {})
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.get("status") == "success", response
+    conn.pool.close()
+    return {f"send_command.{name}_ms": metric(percentile(samples, pct), "ms", "lower")
+            for name, pct in (("p50", 50), ("p95", 95), ("p99", 99))}
+
+
+async def bench_actor_list(placer, port: int, actors: int, repeat: int) -> dict:
+    """Fetch and decode a full get_all_actors reply"""
+    conn = use_server(placer, port)
+    await conn.send_command("ping", {})
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        listed = await conn.get_actors(refresh=True)
+        best = min(best, time.perf_counter() - start)
+        assert len(listed) >= actors, len(listed)
+    conn.pool.close()
+
+    # Decoding alone, without the socket
+    reply = json.dumps({"status": "success", "actors": listed}).encode("utf-8")
+    framer = placer.JsonMessageFramer()
+    decode_s = best_of(lambda: placer.extract_actors(framer.feed(reply)[0]), repeat)
+    return {"actor_list.fetch_actors_per_s": metric(len(listed) / best, "actors/s", "higher"),
+            "actor_list.decode_mb_per_s": metric(len(reply) / decode_s / 1e6, "MB/s", "higher")}
+
+
+def bench_parser(placer, rounds: int) -> dict:
+    creator = placer.GameCreationIntelligence.__new__(placer.GameCreationIntelligence)
+    with open(CORPUS) as handle:
+        descriptions = [case["description"] for case in json.load(handle)]
+    placer.PARSE_CACHE.enabled = False
+    try:
+        elapsed = best_of(lambda: [creator.parse_game_description(text) for text in descriptions], rounds)
+    finally:
+        placer.PARSE_CACHE.enabled = True
+    return {"parser.parses_per_s": metric(len(descriptions) / elapsed, "ops/s", "higher")}
+
+
+def bench_layouts(placer, count: int, repeat: int) -> dict:
+    results = {}
+    for shape in LAYOUT_SHAPES:
+        elapsed = best_of(lambda: placer.build_layout(shape, count).transforms(), repeat)
+        results[f"layout.{shape}_per_s"] = metric(count / elapsed, "placements/s", "higher")
+    elapsed = best_of(lambda: placer.scatter_layout(count // 10, radius=100000.0, min_distance=100.0,
+                                                    seed=1), repeat)
+    results["layout.scatter_per_s"] = metric(count // 10 / elapsed, "placements/s", "higher")
+    return results
+
+
+async def bench_create_objects(placer, port: int, server: FakeUnrealServer, sizes, repeat: int) -> dict:
+    results = {}
+    for size in sizes:
+        best = float("inf")
+        # Single runs are noisy at small sizes; the largest one is slow enough to time once
+        for _ in range(repeat if size < max(sizes) else 1):
+            conn = use_server(placer, port)
+            await conn.send_command("ping", {})
+            before = len(server.actors)
+            start = time.perf_counter()
+            report = await placer.create_objects(f"Create {size} cubes in a grid")
+            best = min(best, time.perf_counter() - start)
+            conn.pool.close()
+            spawned = len(server.actors) - before
+            assert spawned == size, f"{size} requested, {spawned} spawned:\n{report}"
+        results[f"create_objects.{size}_actors_s"] = metric(best, "s", "lower")
+    return results
+
+
+async def run(args) -> dict:
+    placer = load_placer()
+    server = FakeUnrealServer(latency=args.latency, seed=1)
+    server.populate(args.list_actors)
+    port = server.start_in_thread()
+    try:
+        metrics = {}
+        metrics.update(await bench_transport(placer, port, args.calls))
+        metrics.update(await bench_actor_list(placer, port, args.list_actors, args.repeat))
+        metrics.update(bench_parser(placer, args.repeat))
+        metrics.update(bench_layouts(placer, args.layout_count, args.repeat))
+        metrics.update(await bench_create_objects(placer, port, server,
+                                                  [int(size) for size in args.sizes.split(",")],
+                                                  args.repeat))
+    finally:
+        server.stop_thread()
+    return metrics
+
+
+def compare(metrics: dict, baseline: dict, tolerance: float) -> list:
+    """Rows of (name, baseline, current, change, regressed) for metrics in both runs"""
+    rows = []
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if not previous or not previous["value"]:
+            continue
+        change = current["value"] / previous["value"] - 1
+        worse = -change if current["better"] == "higher" else change
+        rows.append((name, previous["value"], current["value"], change, worse > tolerance))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000, help="send_command round trips to time")
+    parser.add_argument("--list-actors", type=int, default=10000, help="Actors in the get_all_actors reply")
+    parser.add_argument("--layout-count", type=int, default=100000)
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="create_objects sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server delay per request")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions per measurement")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args))
+    document = {"benchmark": "suite",
+                "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                                "numpy": load_placer().np is not None},
+                "metrics": metrics}
+
+    rows = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            rows = compare(metrics, json.load(handle)["metrics"], args.tolerance)
+    changes = {row[0]: row for row in rows}
+
+    print(f"{'metric':<36} {'value':>14} {'unit':<13} {'baseline':>12} {'change':>8}")
+    for name, entry in metrics.items():
+        line = f"{name:<36} {show(entry['value']):>14} {entry['unit']:<13}"
+        if name in changes:
+            _, previous, _, change, regressed = changes[name]
+            line += f" {show(previous):>12} {change:>+7.0%}" + (" ❌" if regressed else "")
+        print(line)
+
+    regressions = [row[0] for row in rows if row[4]]
+    document["regressions"] = regressions
+    if args.json:
+        write_results(args.json, document)
+    if args.save_baseline:
+        write_results(args.baseline, document)
+    elif not rows:
+        print(f"No baseline at {args.baseline} - run with --save-baseline to record one")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
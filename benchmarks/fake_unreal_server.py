@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the UnrealMCP TCP listener
+=============================================
+
+Speaks the same {"type": ..., "params": ...} JSON protocol as the UnrealMCP plugin
+over an in-memory scene, so the client can be exercised without Unreal Engine.
+
+    python3 benchmarks/fake_unreal_server.py --port 55557 --latency 0.05 --jitter 0.02 --error-rate 0.01
+
+Latency, jitter, injected errors, dropped connections, reply padding and
+keep-alive versus close-after-reply are all configurable, so the same server
+serves load tests, CI benchmarks and manual runs of the examples.
+"""
+
+import argparse
+import array
+import asyncio
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import zlib
+from typing import Dict, Any, List, Optional, Sequence
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Reply framings the server can produce when a request asks for one
+FRAMINGS = ("ndjson", "length")
+
+# Binary frames, as in vhci-object-placer.py: magic, encoding id, compression id,
+# 4-byte big-endian body length, body
+BINARY_FRAME_MAGIC = 0xC1
+BINARY_FRAME_HEADER = 7
+WIRE_ENCODINGS = ("json", "msgpack", "cbor")
+WIRE_COMPRESSIONS = ("none", "zlib", "zstd")
+ENCODINGS = tuple(name for name, module in (("msgpack", msgpack), ("cbor", cbor2)) if module is not None)
+COMPRESSIONS = tuple(name for name, module in (("zstd", zstandard), ("zlib", zlib)) if module is not None)
+
+
+def encode_frame(message: Dict[str, Any], encoding: str, compression: str, compress_over: int = 0) -> bytes:
+    if encoding == "msgpack":
+        body = msgpack.packb(message, use_bin_type=True)
+    elif encoding == "cbor":
+        body = cbor2.dumps(message)
+    else:
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if compression == "none" or len(body) < compress_over:
+        compression = "none"
+    elif compression == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    else:
+        body = zlib.compress(body, 1)
+    header = bytes((BINARY_FRAME_MAGIC, WIRE_ENCODINGS.index(encoding), WIRE_COMPRESSIONS.index(compression)))
+    return header + len(body).to_bytes(4, "big") + body
+
+
+def decode_frame(frame: bytes) -> Dict[str, Any]:
+    encoding, compression = WIRE_ENCODINGS[frame[1]], WIRE_COMPRESSIONS[frame[2]]
+    body = frame[BINARY_FRAME_HEADER:]
+    if compression == "zlib":
+        body = zlib.decompress(body)
+    elif compression == "zstd":
+        body = zstandard.ZstdDecompressor().decompress(body)
+    if encoding == "msgpack":
+        return msgpack.unpackb(body, raw=False)
+    if encoding == "cbor":
+        return cbor2.loads(body)
+    return json.loads(body.decode("utf-8"))
+
+
+def float32_bytes(values: List[float]) -> bytes:
+    packed = array.array("f", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class RequestSplitter:
+    """Cuts a byte stream into complete JSON requests and binary request frames.
+
+    Only quotes, backslashes and braces are visited, and each byte is scanned
+    once even when a large request arrives in many reads. A binary frame is
+    recognised by its first byte between requests.
+    """
+
+    SPECIAL = re.compile(rb'["\\{}]')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.scanned = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape_at = -1  # Byte skipped because the previous one was a backslash
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        self.buffer += data
+        requests = []
+        start = 0
+        while True:
+            if self.depth == 0 and not self.in_string:
+                while start < len(self.buffer) and self.buffer[start] in b" \t\r\n":
+                    start += 1
+                if start < len(self.buffer) and self.buffer[start] == BINARY_FRAME_MAGIC:
+                    if len(self.buffer) < start + BINARY_FRAME_HEADER:
+                        break
+                    end = start + BINARY_FRAME_HEADER + int.from_bytes(
+                        self.buffer[start + 3:start + BINARY_FRAME_HEADER], "big")
+                    if len(self.buffer) < end:
+                        break
+                    requests.append(decode_frame(bytes(self.buffer[start:end])))
+                    start = self.scanned = end
+                    continue
+            end = self._scan(max(self.scanned, start))
+            if end is None:
+                break
+            requests.append(json.loads(bytes(self.buffer[start:end]).decode("utf-8")))
+            start = end
+        if start:
+            del self.buffer[:start]
+            self.escape_at -= start
+            self.scanned = max(self.scanned - start, 0)
+        return requests
+
+    def _scan(self, position: int) -> Optional[int]:
+        """End offset of the JSON request being scanned, or None until more bytes arrive"""
+        for match in self.SPECIAL.finditer(self.buffer, position):
+            position = match.start()
+            if position == self.escape_at:
+                continue
+            char = self.buffer[position]
+            if self.in_string:
+                if char == 0x5C:  # backslash
+                    self.escape_at = position + 1
+                elif char == 0x22:
+                    self.in_string = False
+            elif char == 0x22:
+                self.in_string = True
+            elif char == 0x7B:  # {
+                self.depth += 1
+            elif char == 0x7D and self.depth:  # }
+                self.depth -= 1
+                if self.depth == 0:
+                    self.scanned = position + 1
+                    return position + 1
+        self.scanned = len(self.buffer)
+        return None
+
+
+class FakeUnrealServer:
+    """In-memory UnrealMCP look-alike with simulated latency and faults.
+
+    Pass framing=(), batch=False, paging=False, multiplex=False, encodings=(),
+    compressions=() and columnar=False to behave like stock UnrealMCP, which has
+    no protocol extensions. With multiplex, requests carrying an "id" are
+    answered concurrently and the id is echoed, so replies on one connection
+    can overtake each other. Requests naming an encoding or compression are
+    answered with a binary frame inside length framing, and get_all_actors with
+    "columnar" returns parallel arrays with float32 locations.
+
+    latency/jitter: each request waits latency + uniform(0, jitter) seconds
+    error_rate: fraction of commands answered with a simulated error
+    drop_rate: fraction of requests whose connection is closed without a reply
+    reply_padding: extra bytes added to every reply, to model large responses
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, keep_alive: bool = True,
+                 framing: Sequence[str] = FRAMINGS, batch: bool = True,
+                 jitter: float = 0.0, error_rate: float = 0.0, drop_rate: float = 0.0,
+                 reply_padding: int = 0, seed: Optional[int] = None, paging: bool = True,
+                 multiplex: bool = True, encodings: Sequence[str] = ENCODINGS,
+                 compressions: Sequence[str] = COMPRESSIONS, columnar: bool = True):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.keep_alive = keep_alive
+        self.framing = tuple(framing)
+        self.batch = batch
+        self.paging = paging
+        self.multiplex = multiplex and keep_alive  # Out-of-order replies need a connection that stays open
+        self.encodings = tuple(encodings)
+        self.compressions = tuple(compressions)
+        self.columnar = columnar
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.reply_padding = reply_padding
+        self.random = random.Random(seed)
+        self.actors: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.counters = {"connections": 0, "injected_errors": 0, "dropped": 0, "bytes_in": 0, "bytes_out": 0}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> int:
+        """Start listening and return the bound port"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port,
+                                                  backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            # Open keep-alive connections would otherwise outlive the server
+            for task in list(self._clients):
+                task.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> int:
+        """Serve from a background thread with its own event loop and return the port.
+
+        Keeps server work off the client's loop, so benchmark timings measure
+        the client alone.
+        """
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="fake-unreal-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.port
+
+    def stop_thread(self):
+        if self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def populate(self, count: int, prefix: str = "Seed", actor_class: str = "StaticMeshActor"):
+        """Add count actors on a grid, for large get_all_actors replies"""
+        side = max(1, int(count ** 0.5))
+        for i in range(count):
+            name = f"{prefix}_{i}"
+            self.actors[name] = {"name": name, "class": actor_class,
+                                 "location": {"x": float(i % side) * 200, "y": float(i // side) * 200, "z": 0.0}}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "actors": len(self.actors), **self.counters}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.counters["connections"] += 1
+        task = asyncio.current_task()
+        self._clients.add(task)
+        splitter = RequestSplitter()
+        write_lock = asyncio.Lock()
+        concurrent: set = set()  # Replies to requests with an "id", answered out of order
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                self.counters["bytes_in"] += len(chunk)
+                for request in splitter.feed(chunk):
+                    if self.multiplex and "id" in request:
+                        reply_task = asyncio.ensure_future(self._reply(request, writer, write_lock))
+                        concurrent.add(reply_task)
+                        reply_task.add_done_callback(concurrent.discard)
+                    elif not await self._reply(request, writer, write_lock):
+                        return
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass
+        finally:
+            for reply_task in list(concurrent):
+                reply_task.cancel()
+            self._clients.discard(task)
+            writer.close()
+
+    async def _reply(self, request: Dict[str, Any], writer: asyncio.StreamWriter,
+                     write_lock: asyncio.Lock) -> bool:
+        """Answer one request; False when the connection should be closed"""
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            self.counters["dropped"] += 1
+            writer.close()
+            return False
+        response = self.handle(request.get("type", ""), request.get("params") or {})
+        if self.multiplex and "id" in request:
+            response["id"] = request["id"]
+        reply = self.encode(response, request.get("framing"), request.get("encoding"),
+                            request.get("compression"), request.get("compress_over", 0))
+        self.counters["bytes_out"] += len(reply)
+        async with write_lock:
+            writer.write(reply)
+            await writer.drain()
+        if not self.keep_alive:
+            writer.close()
+        return self.keep_alive
+
+    def encode(self, response: Dict[str, Any], framing: Optional[str] = None, encoding: Optional[str] = None,
+               compression: Optional[str] = None, compress_over: int = 0) -> bytes:
+        """Serialize a reply in the framing, encoding and compression the request asked for"""
+        if self.reply_padding:
+            response = dict(response, padding="x" * self.reply_padding)
+        encoding = encoding if encoding in self.encodings else "json"
+        compression = compression if compression in self.compressions else "none"
+        if framing == "length" and framing in self.framing and (encoding, compression) != ("json", "none"):
+            columns = response.get("actor_columns")
+            if encoding != "json" and columns:
+                response = dict(response, actor_columns=dict(columns, **{
+                    key: float32_bytes(columns[key]) for key in ("location", "rotation", "scale") if key in columns}))
+            payload = encode_frame(response, encoding, compression, compress_over)
+            return len(payload).to_bytes(4, "big") + payload
+        payload = json.dumps(response).encode("utf-8")
+        if framing == "ndjson" and framing in self.framing:
+            return payload + b"\n"
+        if framing == "length" and framing in self.framing:
+            return len(payload).to_bytes(4, "big") + payload
+        return payload
+
+    @staticmethod
+    def columns(actors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Actors as parallel arrays; class names are indexes into class_table.
+
+        Rotation and scale columns are only sent once some actor has one.
+        """
+        table: Dict[str, int] = {}
+        classes = [table.setdefault(actor["class"], len(table)) for actor in actors]
+        location = [actor["location"][axis] for actor in actors for axis in ("x", "y", "z")]
+        columns = {"name": [actor["name"] for actor in actors], "class_table": list(table),
+                   "class": classes, "location": location}
+        for key, default in (("rotation", [0.0, 0.0, 0.0]), ("scale", [1.0, 1.0, 1.0])):
+            if any(key in actor for actor in actors):
+                columns[key] = [float(value) for actor in actors for value in actor.get(key, default)]
+        return columns
+
+    def handle(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one command to the in-memory scene"""
+        self.requests += 1
+
+        if command_type == "ping":
+            result = {"message": "pong"}
+            capabilities = {}
+            if self.framing:
+                capabilities["framing"] = list(self.framing)
+            if self.batch:
+                capabilities["batch"] = True
+            if self.paging:
+                capabilities["paging"] = True
+            if self.multiplex:
+                capabilities["multiplex"] = True
+            if self.encodings:
+                capabilities["encoding"] = list(self.encodings)
+            if self.compressions:
+                capabilities["compression"] = list(self.compressions)
+            if self.columnar:
+                capabilities["columnar"] = True
+            if capabilities:
+                result["capabilities"] = capabilities
+            return {"status": "success", "result": result}
+
+        if command_type == "batch" and self.batch:
+            self.requests -= 1  # Counted per inner command below
+            return {"status": "success", "results": [
+                self.handle(command.get("type", ""), command.get("params") or {})
+                for command in params.get("commands", [])
+            ]}
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.counters["injected_errors"] += 1
+            return {"status": "error", "error": f"Simulated failure in {command_type}"}
+
+        if command_type == "spawn_actor":
+            name = params.get("name")
+            if not name:
+                return {"status": "error", "error": "Missing 'name' parameter"}
+            if name in self.actors:
+                return {"status": "error", "error": f"Actor already exists: {name}"}
+            location = params.get("location") or [0, 0, 0]
+            self.actors[name] = {
+                "name": name,
+                "class": params.get("type", "Actor"),
+                "location": {"x": float(location[0]), "y": float(location[1]), "z": float(location[2])}
+            }
+            for key in ("rotation", "scale"):
+                if key in params:
+                    self.actors[name][key] = [float(value) for value in params[key]]
+            return {"status": "success", "result": {"name": name, "class": params.get("type", "Actor"),
+                                                    "location": list(location)}}
+
+        if command_type == "get_all_actors":
+            actors = self.actors.values()
+            reply = {"status": "success"}
+            if self.paging and "limit" in params:
+                offset = max(0, int(params.get("offset", 0)))
+                actors = itertools.islice(actors, offset, offset + max(0, int(params["limit"])))
+                reply["total"] = len(self.actors)
+            if self.columnar and params.get("columnar"):
+                reply["actor_columns"] = self.columns(list(actors))
+            else:
+                reply["actors"] = list(actors)
+            return reply
+
+        if command_type == "delete_actor":
+            name = params.get("actor_name")
+            if self.actors.pop(name, None) is None:
+                return {"status": "error", "error": f"Actor not found: {name}"}
+            return {"status": "success", "result": {"deleted_actor": name}}
+
+        if command_type == "set_actor_location":
+            name = params.get("actor_name")
+            actor = self.actors.get(name)
+            if actor is None:
+                return {"status": "error", "error": f"Actor not found: {name}"}
+            location = params.get("location") or {}
+            if isinstance(location, (list, tuple)):
+                location = dict(zip("xyz", location))
+            actor["location"] = {axis: float(location.get(axis, 0.0)) for axis in ("x", "y", "z")}
+            return {"status": "success", "result": {"name": name, "location": actor["location"]}}
+
+        if command_type == "set_actor_transform":
+            name = params.get("actor_name")
+            actor = self.actors.get(name)
+            if actor is None:
+                return {"status": "error", "error": f"Actor not found: {name}"}
+            if "location" in params:
+                actor["location"] = dict(zip("xyz", map(float, params["location"])))
+            for key in ("rotation", "scale"):
+                if key in params:
+                    actor[key] = [float(value) for value in params[key]]
+            return {"status": "success", "result": {"name": name, "location": actor["location"]}}
+
+        if command_type == "save_level":
+            return {"status": "success", "result": {"saved": True}}
+
+        return {"status": "error", "error": f"Unknown command: {command_type}"}
+
+
+async def _serve(args):
+    server = FakeUnrealServer(args.host, args.port, latency=args.latency,
+                              keep_alive=not args.close_after_reply,
+                              framing=() if args.stock else FRAMINGS,
+                              batch=not args.stock, paging=not args.stock, multiplex=not args.stock,
+                              encodings=() if args.stock else ENCODINGS,
+                              compressions=() if args.stock else COMPRESSIONS, columnar=not args.stock,
+                              jitter=args.jitter,
+                              error_rate=args.error_rate, drop_rate=args.drop_rate,
+                              reply_padding=args.reply_padding, seed=args.seed)
+    if args.actors:
+        server.populate(args.actors)
+    port = await server.start()
+    print(f"Fake UnrealMCP listening on {args.host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(f"Served: {server.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake UnrealMCP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=55557)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of commands that fail")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="Fraction of requests whose connection is closed without a reply")
+    parser.add_argument("--reply-padding", type=int, default=0, help="Extra bytes added to every reply")
+    parser.add_argument("--actors", type=int, default=0, help="Pre-populate the scene with this many actors")
+    parser.add_argument("--seed", type=int, help="Random seed for jitter and injected faults")
+    parser.add_argument("--close-after-reply", action="store_true",
+                        help="Close the socket after every reply like stock UnrealMCP")
+    parser.add_argument("--stock", action="store_true",
+                        help="Advertise no protocol extensions in ping replies")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
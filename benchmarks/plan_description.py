@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Plan a create_objects description offline (no Unreal, no fake server) and
+report round trips, request bytes and planning time.
+
+    python3 benchmarks/plan_description.py "Create 5000 cubes in a grid" --no-batch --json plan.json
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_common import load_placer, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("description")
+    parser.add_argument("--avoid-overlaps", action="store_true")
+    parser.add_argument("--no-batch", action="store_true", help="Plan for a plugin without the batch command")
+    parser.add_argument("--json", help="Write the full plan, payloads included, to this file")
+    args = parser.parse_args()
+
+    placer = load_placer()
+    start = time.perf_counter()
+    plan = asyncio.run(placer.plan_creation(args.description, avoid_overlaps=args.avoid_overlaps,
+                                            supports_batch=not args.no_batch))
+    elapsed = time.perf_counter() - start
+
+    print(f"Elements:      {', '.join(element['name'] for element in plan['elements']) or 'none'}")
+    print(f"Waves:         {len(plan['waves'])}")
+    print(f"Round trips:   {plan['round_trips']}")
+    print(f"Commands:      {plan['commands']}")
+    print(f"Request bytes: {plan['request_bytes']:,}")
+    print(f"Reply bytes:   {plan['reply_bytes_estimate']:,} (estimated)")
+    print(f"Planned in:    {elapsed * 1000:.1f} ms")
+    for error in plan["errors"]:
+        print(f"Error:         {error}")
+    if args.json:
+        write_results(args.json, dict(plan, planning_ms=round(elapsed * 1000, 2)))
+
+
+if __name__ == "__main__":
+    main()
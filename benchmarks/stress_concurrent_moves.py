@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Stress test: N concurrent move_actor calls against a slow fake UnrealMCP server.
+
+With non-blocking transport the batch should finish in roughly one server latency,
+not N of them.
+
+    python3 benchmarks/stress_concurrent_moves.py --calls 50 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from bench_common import load_placer, use_server
+from fake_unreal_server import FakeUnrealServer
+
+
+async def run(calls: int, latency: float, keep_alive: bool) -> dict:
+    placer = load_placer()
+    server = FakeUnrealServer(latency=latency, keep_alive=keep_alive)
+    port = await server.start()
+    use_server(placer, port)
+    for i in range(calls):
+        server.handle("spawn_actor", {"type": "StaticMeshActor", "name": f"Cube_{i}", "location": [0, 0, 0]})
+
+    try:
+        start = time.perf_counter()
+        replies = await asyncio.gather(*[
+            placer.move_actor(f"Cube_{i}", i * 100.0, 0.0, 50.0) for i in range(calls)
+        ])
+        elapsed = time.perf_counter() - start
+    finally:
+        placer.get_unreal_connection().pool.close()
+        await server.stop()
+
+    return {
+        "calls": calls,
+        "latency_s": latency,
+        "keep_alive": keep_alive,
+        "elapsed_s": round(elapsed, 4),
+        "serial_estimate_s": round(calls * latency, 4),
+        "succeeded": sum(1 for reply in replies if "Moved Successfully" in reply)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--close-after-reply", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.calls, args.latency, not args.close_after_reply))
+    for key, value in result.items():
+        print(f"{key:>18}: {value}")
+
+    # Overlapping calls should cost about one latency plus scheduling overhead
+    ok = result["succeeded"] == args.calls and result["elapsed_s"] < args.latency * 3 + 0.5
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ import socket
 import json
 import time
 
+from unreal_socket import receive_json
+
 def create_visible_cube():
     print("🎯 Creating Visible Test Cube")
     print("=" * 30)
@@ -34,22 +36,9 @@ def create_visible_cube():
         sock.send(message.encode('utf-8'))
         
         # Get response
-        response_data = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response_data += chunk
-            try:
-                json.loads(response_data.decode('utf-8'))
-                break
-            except:
-                continue
-                
+        response = receive_json(sock)
         sock.close()
         
-        response = json.loads(response_data.decode('utf-8'))
-        
         if response.get('status') == 'success':
             print("✅ SUCCESS: Visible cube created!")
             print(f"   Name: {cube_name}")
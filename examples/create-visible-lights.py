@@ -8,6 +8,8 @@ import json
 import time
 import math
 
+from unreal_socket import receive_json
+
 def send_command(command_type, params):
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -17,19 +19,9 @@ def send_command(command_type, params):
         message = json.dumps({"type": command_type, "params": params})
         sock.send(message.encode('utf-8'))
         
-        response_data = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response_data += chunk
-            try:
-                json.loads(response_data.decode('utf-8'))
-                break
-            except:
-                continue
+        response = receive_json(sock)
         sock.close()
-        return json.loads(response_data.decode('utf-8'))
+        return response
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
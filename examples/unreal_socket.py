@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Socket helper shared by the examples: read one JSON reply from the UnrealMCP plugin
+"""
+
+import json
+import re
+
+ESCAPE = re.compile(rb'\\.', re.DOTALL)
+
+
+def receive_json(sock, read_size=65536):
+    """Read one JSON reply in large chunks.
+
+    The end of the object is found with bytes operations per chunk (escape
+    pairs dropped, quoted text skipped, braces counted) rather than a Python
+    loop over every byte.
+    """
+    buffer = bytearray()
+    depth = 0
+    in_string = False
+    carry = b''  # A trailing backslash whose escaped byte is in the next chunk
+    while True:
+        chunk = sock.recv(read_size)
+        if not chunk:
+            break
+        buffer += chunk
+        region = carry + chunk
+        carry = b''
+        if (len(region) - len(region.rstrip(b'\\'))) % 2:
+            region, carry = region[:-1], region[-1:]
+        segments = ESCAPE.sub(b'', region).split(b'"')
+        outside = b''.join(segments[1::2] if in_string else segments[0::2])
+        if (len(segments) - 1) % 2:
+            in_string = not in_string
+        depth += outside.count(b'{') - outside.count(b'}')
+        if depth <= 0 and buffer.strip():
+            break
+    text = bytes(buffer).decode('utf-8').lstrip()
+    return json.JSONDecoder().raw_decode(text)[0]
@@ -22,171 +22,3132 @@ License: MIT
 """
 
 import logging
-import socket
 import json
 import re
+import array
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
-from mcp.server.fastmcp import FastMCP
+import bisect
+import fnmatch
+import functools
+import hashlib
+import itertools
+import math
+import os
+import pickle
+import random
+import sys
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+from dataclasses import dataclass, field
+from mcp.server.fastmcp import FastMCP, Context
+
+try:
+    import numpy as np
+except ImportError:  # Layout generators fall back to pure Python
+    np = None
+
+try:
+    import msgpack
+except ImportError:  # Binary transport encodings are optional; JSON always works
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:  # zlib compression is still offered
+    zstandard = None
+
+try:
+    import yaml
+except ImportError:  # Scene specs can still be JSON (or TOML)
+    yaml = None
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("VHCIUniversalCreator")
 
-# UE Connection Config
-UNREAL_HOST = "127.0.0.1" 
-UNREAL_PORT = 55557
+# UE Connection Config
+UNREAL_HOST = "127.0.0.1" 
+UNREAL_PORT = 55557
+UNREAL_TIMEOUT = 5.0
+UNREAL_PIPELINE_DEPTH = 16  # Single commands kept in flight when batching is unavailable
+# Max idle keep-alive sockets kept open to the plugin - enough for a full pipeline, so it reuses them
+UNREAL_POOL_SIZE = UNREAL_PIPELINE_DEPTH
+UNREAL_POOL_IDLE_TIMEOUT = 30.0  # Idle pooled sockets older than this are dropped
+UNREAL_READ_SIZE = 65536
+UNREAL_NEGOTIATE = True  # Ask the plugin for optional protocol extensions with a ping
+UNREAL_NEGOTIATE_RETRY = 30.0  # Seconds on stock capabilities after a failed negotiation ping
+UNREAL_BATCH_SIZE = 500  # Commands packed into one "batch" request
+UNREAL_BATCH_ITEM_TIMEOUT = 0.05  # Extra reply deadline per command in a batch
+UNREAL_MULTIPLEX = True  # Keep many commands in flight on one socket when the plugin echoes request ids
+UNREAL_MULTIPLEX_MAX_IN_FLIGHT = 256  # Commands outstanding at once on the multiplexed socket
+UNREAL_ENCODINGS = ("msgpack", "cbor")  # Binary encodings offered in preference order, if installed
+UNREAL_COMPRESSIONS = ("zstd", "zlib")  # Compression offered in preference order, if installed
+UNREAL_COMPRESS_OVER = 16384  # Frames smaller than this many bytes are never compressed
+UNREAL_COLUMNAR_ACTORS = True  # Ask for get_all_actors as parallel arrays when the plugin can
+TRANSFORM_FLUSH_WINDOW = 0.01  # Seconds moves are held to coalesce and batch them (0: next loop turn)
+
+# Transport policy: retries, adaptive timeouts and the circuit breaker
+UNREAL_RETRY_ATTEMPTS = 3  # Retries of a command whose connection was refused
+UNREAL_RETRY_BASE_DELAY = 0.1  # First backoff ceiling in seconds, doubled per retry
+UNREAL_RETRY_MAX_DELAY = 2.0
+UNREAL_ADAPTIVE_TIMEOUT = True  # Shorten timeouts to a multiple of observed latency
+UNREAL_TIMEOUT_MULTIPLIER = 4.0  # Adaptive timeout = this x recent p99 per command type
+UNREAL_TIMEOUT_FLOOR = 1.0  # Adaptive timeouts never go below this many seconds
+UNREAL_LATENCY_WINDOW = 200  # Recent replies per command type the p99 is taken over
+UNREAL_LATENCY_MIN_SAMPLES = 20  # Replies needed before a timeout adapts
+UNREAL_BREAKER_THRESHOLD = 5  # Consecutive timeouts/connection errors that open the circuit
+UNREAL_BREAKER_COOLDOWN = 2.0  # Seconds before the first ping probe, doubled per failed probe
+UNREAL_BREAKER_MAX_COOLDOWN = 30.0
+UNREAL_BREAKER_PROBE_TIMEOUT = 1.0
+
+# Scene generation
+CREATION_CONCURRENCY = 4  # Independent game elements created at the same time
+
+# Actors clear_workspace never deletes
+PROTECTED_ACTOR_CLASSES = ("WorldSettings", "PlayerStart", "DefaultPawn", "LevelBounds")
+
+# Actor classes behind each list_actors filter_type
+ACTOR_TYPE_FILTERS = {
+    "lights": ["PointLight", "DirectionalLight", "SpotLight", "SkyLight"],
+    "meshes": ["StaticMeshActor", "SkeletalMeshActor"],
+    "cameras": ["CameraActor", "PlayerCameraManager"],
+    "audio": ["AudioSource", "SoundActor"]
+}
+
+LIST_ACTORS_PAGE_SIZE = 200  # Default list_actors page length
+ACTOR_LIST_FIELDS = ("name", "class", "location")  # Fields list_actors can show
+
+SCENE_CACHE_TTL = 30.0  # Seconds a get_all_actors snapshot is trusted
+SCENE_JOURNAL_PATH: Optional[str] = None  # JSONL file every scene-changing command is appended to (None = off)
+SCENE_DIFF_TOLERANCE = 0.5  # Unreal units a location may be off and still count as unchanged
+SCENE_ROTATION_TOLERANCE = 0.1  # Degrees a rotation may be off and still count as unchanged
+SCENE_SCALE_TOLERANCE = 0.001  # Scale factor difference that still counts as unchanged
+# apply_scene keeps the hashes of each applied scene here, independent of the server's working directory
+SCENE_STATE_DIR = os.environ.get("VHCI_SCENE_STATE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "vhci-scenes")
+SCENE_MAX_ACTORS = 100000  # Largest scene spec apply_scene accepts
+SPATIAL_CELL_SIZE = 500.0  # Unreal units per spatial grid cell
+PLACEMENT_CLEARANCE = 100.0  # Minimum gap between generated actors when avoiding overlaps
+LAYOUT_MAX_ITEMS = 10000  # Largest layout create_objects will spawn from one description
+
+# Parsed create_objects descriptions kept for reuse
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_SIZE = 256  # Descriptions remembered (least recently used dropped first)
+PARSE_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Budget for all cached plans, pickled
+PARSE_CACHE_MAX_LENGTH = 4096  # Longer descriptions are parsed every time, never cached
+
+# send_command logs a one-line summary per command at INFO; full bodies only at DEBUG
+LOG_BODY_SAMPLE_RATE = 0.05  # Fraction of commands whose request and reply bodies are logged
+LOG_BODY_MAX_CHARS = 2000  # Logged bodies are cut to this many characters
+
+# Latency histogram bucket bounds for get_performance_stats, in milliseconds
+METRICS_LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# get_performance_stats only writes files here, so a tool call cannot overwrite arbitrary paths
+METRICS_EXPORT_DIR = os.environ.get("VHCI_STATS_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "vhci-stats")
+
+# Reply framing modes - "raw" is what stock UnrealMCP speaks
+FRAMING_RAW = "raw"
+FRAMING_NDJSON = "ndjson"
+FRAMING_LENGTH = "length"
+
+# Binary frames: magic byte, encoding id, compression id, 4-byte big-endian body length, body.
+# 0xC1 never starts JSON text and is unused in MessagePack.
+BINARY_FRAME_MAGIC = 0xC1
+BINARY_FRAME_HEADER = 7
+WIRE_ENCODINGS = ("json", "msgpack", "cbor")  # Position is the id in the frame header
+WIRE_COMPRESSIONS = ("none", "zlib", "zstd")
+
+# Commands that move an actor; set_actor_transform also takes rotation and scale
+TRANSFORM_COMMANDS = ("set_actor_location", "set_actor_transform")
+
+@dataclass
+class GameElement:
+    """Represents a game element to be created"""
+    type: str  # 'level', 'character', 'mechanic', 'vr', 'ui', etc.
+    name: str
+    properties: Dict[str, Any]
+    dependencies: List[str]  # Other elements this depends on
+
+def available_encodings() -> List[str]:
+    """UNREAL_ENCODINGS whose library is installed"""
+    installed = {"msgpack": msgpack, "cbor": cbor2}
+    return [name for name in UNREAL_ENCODINGS if installed.get(name) is not None]
+
+def available_compressions() -> List[str]:
+    installed = {"zstd": zstandard, "zlib": zlib}
+    return [name for name in UNREAL_COMPRESSIONS if installed.get(name) is not None]
+
+def encode_binary_frame(message: Dict[str, Any], encoding: str = "json", compression: str = "none",
+                        compress_over: int = UNREAL_COMPRESS_OVER) -> bytes:
+    """Serialize a message as a binary frame; compression only applies to bodies of compress_over bytes or more"""
+    if encoding == "msgpack":
+        body = msgpack.packb(message, use_bin_type=True)
+    elif encoding == "cbor":
+        body = cbor2.dumps(message)
+    else:
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if compression == "none" or len(body) < compress_over:
+        compression = "none"
+    elif compression == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    else:
+        body = zlib.compress(body, 1)  # Level 1: most of the saving at a fraction of the time
+    header = bytes((BINARY_FRAME_MAGIC, WIRE_ENCODINGS.index(encoding), WIRE_COMPRESSIONS.index(compression)))
+    return header + len(body).to_bytes(4, "big") + body
+
+def decode_binary_frame(frame: Any) -> Dict[str, Any]:
+    """Parse one complete binary frame (bytes or memoryview); raises ValueError if it is malformed"""
+    if len(frame) < BINARY_FRAME_HEADER or frame[0] != BINARY_FRAME_MAGIC:
+        raise ValueError("Not a binary frame")
+    if frame[1] >= len(WIRE_ENCODINGS) or frame[2] >= len(WIRE_COMPRESSIONS):
+        raise ValueError(f"Unknown binary frame encoding {frame[1]}/{frame[2]}")
+    encoding, compression = WIRE_ENCODINGS[frame[1]], WIRE_COMPRESSIONS[frame[2]]
+    size = int.from_bytes(frame[3:BINARY_FRAME_HEADER], "big")
+    body = frame[BINARY_FRAME_HEADER:BINARY_FRAME_HEADER + size]
+    try:
+        if compression == "zlib":
+            body = zlib.decompress(body)
+        elif compression == "zstd":
+            body = zstandard.ZstdDecompressor().decompress(body)
+        if encoding == "msgpack":
+            message = msgpack.unpackb(body, raw=False)
+        elif encoding == "cbor":
+            message = cbor2.loads(body)
+        else:
+            message = json.loads(str(body, "utf-8"))
+    except Exception as e:  # Codec libraries raise their own error types
+        raise ValueError(f"Bad {encoding}/{compression} frame: {e}") from e
+    if not isinstance(message, dict):
+        raise ValueError(f"Binary frame holds {type(message).__name__}, not an object")
+    return message
+
+class JsonMessageFramer:
+    """Incremental splitter for JSON replies arriving on a byte stream.
+    
+    Modes:
+    - "raw": bare JSON objects back to back (stock UnrealMCP). Completion is
+      detected by tracking brace depth outside of strings, so every byte is
+      scanned once and the reply is parsed once.
+    - "ndjson": one JSON document per line.
+    - "length": 4-byte big-endian length prefix followed by the JSON payload,
+      or by a binary frame (see encode_binary_frame) once an encoding or
+      compression was negotiated.
+    """
+    
+    MODES = (FRAMING_RAW, FRAMING_NDJSON, FRAMING_LENGTH)
+    _ESCAPE = re.compile(rb'\\.', re.DOTALL)
+    _WHITESPACE = b' \t\r\n'
+    # Braces as signed steps (+1 / -1 as array('b')) with every other byte deleted
+    _BRACE_STEPS = bytes.maketrans(b'{}', b'\x01\xff')
+    _NOT_BRACES = bytes(byte for byte in range(256) if byte not in b'{}')
+    
+    def __init__(self, mode: str = FRAMING_RAW):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown framing mode: {mode}")
+        self.mode = mode
+        self.buffer = bytearray()
+        self._reset_scan()
+        
+    @property
+    def pending(self) -> int:
+        """Bytes received but not yet returned as a message"""
+        return len(self.buffer)
+    
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Add received bytes and return every message completed by them"""
+        self.buffer += data
+        if self.mode == FRAMING_NDJSON:
+            return self._split_lines()
+        if self.mode == FRAMING_LENGTH:
+            return self._split_length_prefixed()
+        return self._split_raw()
+    
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Parse whatever is left once the peer closed the stream (raw mode only)"""
+        data = bytes(self.buffer).strip()
+        self.buffer.clear()
+        self._reset_scan()
+        if not data:
+            return None
+        return json.loads(data.decode('utf-8'))
+    
+    def _reset_scan(self):
+        self._scanned = 0  # Bytes of the current message already brace-counted
+        self._depth = 0
+        self._in_string = False
+        self._started = False
+    
+    def _split_lines(self) -> List[Dict[str, Any]]:
+        messages = []
+        start = 0
+        while True:
+            end = self.buffer.find(b'\n', max(start, self._scanned))
+            if end < 0:
+                break
+            line = bytes(self.buffer[start:end]).strip()
+            if line:
+                messages.append(json.loads(line.decode('utf-8')))
+            start = end + 1
+        if start:
+            del self.buffer[:start]
+        self._scanned = len(self.buffer)  # Nothing so far holds a newline
+        return messages
+    
+    def _split_length_prefixed(self) -> List[Dict[str, Any]]:
+        messages = []
+        start = 0
+        view = memoryview(self.buffer)
+        try:
+            while len(self.buffer) - start >= 4:
+                size = int.from_bytes(view[start:start + 4], 'big')
+                if len(self.buffer) - start - 4 < size:
+                    break
+                payload = view[start + 4:start + 4 + size]
+                try:
+                    if size and payload[0] == BINARY_FRAME_MAGIC:
+                        messages.append(decode_binary_frame(payload))
+                    else:
+                        messages.append(json.loads(str(payload, 'utf-8')))
+                finally:
+                    payload.release()  # The buffer cannot shrink while a view of it is alive
+                start += 4 + size
+        finally:
+            view.release()
+        if start:
+            del self.buffer[:start]
+        return messages
+    
+    def _split_raw(self) -> List[Dict[str, Any]]:
+        messages = []
+        while True:
+            if not self._started:
+                stripped = self.buffer.lstrip(self._WHITESPACE)
+                if not stripped:
+                    self.buffer.clear()
+                    return messages
+                if len(stripped) != len(self.buffer):
+                    self.buffer = bytearray(stripped)
+                if self.buffer[:1] != b'{':
+                    return messages  # Not an object - only finish() can frame it
+                self._started = True
+                
+            region = bytes(self.buffer[self._scanned:])
+            if b'\\' in region:
+                # Drop escape pairs so escaped quotes cannot flip string state;
+                # an unfinished trailing escape waits for the next chunk
+                if (len(region) - len(region.rstrip(b'\\'))) % 2:
+                    region = region[:-1]
+                self._scanned += len(region)
+                region = self._ESCAPE.sub(b'', region)
+            else:
+                self._scanned += len(region)
+                
+            segments = region.split(b'"')
+            outside = b''.join(segments[1::2] if self._in_string else segments[0::2])
+            if (len(segments) - 1) % 2:
+                self._in_string = not self._in_string
+            steps = array.array('b', outside.translate(self._BRACE_STEPS, self._NOT_BRACES))
+            # The running depth can return to zero mid-chunk and climb again when
+            # the next reply starts right behind this one
+            closed = -self._depth in itertools.accumulate(steps)
+            self._depth += sum(steps)
+            if self._depth > 0 and not closed:
+                return messages
+            
+            # The object closed somewhere in this chunk: parse it once and keep
+            # anything after it (a pipelined reply) for the next round
+            text = self.buffer.decode('utf-8', 'surrogateescape')
+            message, end = json.JSONDecoder().raw_decode(text)
+            messages.append(message)
+            rest = text[end:]
+            self.buffer = bytearray(rest.encode('utf-8', 'surrogateescape')) if rest.strip() else bytearray()
+            self._reset_scan()
+
+class PooledConnection:
+    """An asyncio stream pair owned by the connection pool, with reuse bookkeeping"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.id = next(self._ids)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+        
+    def is_healthy(self) -> bool:
+        """Cheap liveness check - the peer must not have closed an idle keep-alive stream"""
+        if self.loop is not asyncio.get_running_loop():
+            return False  # Streams are bound to the loop that opened them
+        return not (self.reader.at_eof() or self.writer.is_closing())
+    
+    def info(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "uses": self.uses,
+            "age_s": round(time.monotonic() - self.created_at, 3),
+            "idle_s": round(time.monotonic() - self.last_used, 3)
+        }
+    
+    def close(self):
+        try:
+            self.writer.close()
+        except (OSError, RuntimeError):
+            pass  # Transport already gone or its loop is closed
+
+class UnrealConnectionPool:
+    """Keep-alive stream pool for the UnrealMCP plugin.
+    
+    Stock UnrealMCP builds close the socket after every reply. The pool learns this
+    from the peer (keep_alive=None means "not known yet") and then transparently
+    falls back to one connection per command.
+    """
+    
+    def __init__(self, host: str = UNREAL_HOST, port: int = UNREAL_PORT,
+                 max_size: int = UNREAL_POOL_SIZE, timeout: float = UNREAL_TIMEOUT,
+                 keep_alive: Optional[bool] = None,
+                 idle_timeout: float = UNREAL_POOL_IDLE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.idle_timeout = idle_timeout
+        self._idle: List[PooledConnection] = []
+        self._dedicated: List[PooledConnection] = []  # Held by a MultiplexedStream, never idle
+        self._retired = deque(maxlen=32)  # Recently closed connections, for inspection
+        self.counters = {
+            "connects": 0,
+            "reuses": 0,
+            "health_check_failures": 0,
+            "peer_closes": 0,
+            "discarded": 0
+        }
+        
+    # The pool is only touched from the event loop thread, and none of the
+    # bookkeeping below awaits, so no lock is needed
+    
+    async def acquire(self) -> Tuple[PooledConnection, bool]:
+        """Return (connection, reused) - an idle healthy stream if any, else a new one"""
+        while self._idle:
+            conn = self._idle.pop()
+            if time.monotonic() - conn.last_used > self.idle_timeout:
+                self._retire(conn, "idle_timeout")
+                continue
+            if not conn.is_healthy():
+                self.counters["health_check_failures"] += 1
+                if conn.loop is asyncio.get_running_loop():
+                    self._note_peer_closed()
+                self._retire(conn, "health_check")
+                continue
+            self.counters["reuses"] += 1
+            return conn, True
+            
+        logger.info(f"Connecting to UE at {self.host}:{self.port}")
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        self.counters["connects"] += 1
+        return PooledConnection(reader, writer), False
+    
+    def release(self, conn: PooledConnection, reusable: bool = True):
+        """Hand a connection back after a complete reply"""
+        conn.uses += 1
+        conn.last_used = time.monotonic()
+        if reusable and self.keep_alive is not False and len(self._idle) < self.max_size:
+            self._idle.append(conn)
+        else:
+            self._retire(conn, "released")
+            
+    def discard(self, conn: PooledConnection, reason: str = "error"):
+        """Drop a connection that failed mid-command"""
+        self.counters["discarded"] += 1
+        self._retire(conn, reason)
+        
+    def peer_closed(self, conn: PooledConnection):
+        """Record that the plugin closed a reused stream instead of answering on it"""
+        self._note_peer_closed()
+        self._retire(conn, "peer_closed")
+        
+    def dedicate(self, conn: PooledConnection):
+        """Keep a stream out of the idle list for a MultiplexedStream until retire_dedicated()"""
+        self._dedicated.append(conn)
+        
+    def retire_dedicated(self, conn: PooledConnection, reason: str):
+        if conn in self._dedicated:
+            self._dedicated.remove(conn)
+            self._retire(conn, reason)
+            
+    def confirm_keep_alive(self):
+        if self.keep_alive is None:
+            logger.info("UE peer keeps connections alive - pooling enabled")
+            self.keep_alive = True
+            
+    def close(self):
+        while self._idle:
+            self._retire(self._idle.pop(), "pool_closed")
+        while self._dedicated:
+            self._retire(self._dedicated.pop(), "pool_closed")
+            
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool counters and per-connection reuse counts"""
+        return {
+            "host": f"{self.host}:{self.port}",
+            "keep_alive": self.keep_alive,
+            "max_size": self.max_size,
+            "idle": [conn.info() for conn in self._idle],
+            "multiplexed": [conn.info() for conn in self._dedicated],
+            "recently_closed": list(self._retired),
+            **self.counters
+        }
+    
+    def _note_peer_closed(self):
+        self.counters["peer_closes"] += 1
+        if self.keep_alive is None:
+            logger.info("UE peer closes after each reply - using one connection per command")
+            self.keep_alive = False
+            while self._idle:
+                self._retire(self._idle.pop(), "keep_alive_disabled")
+    
+    def _retire(self, conn: PooledConnection, reason: str):
+        conn.close()
+        record = conn.info()
+        record["reason"] = reason
+        self._retired.append(record)
+
+def extract_actors(response: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Actor list from a get_all_actors reply (top level or nested under "result").
+    
+    A columnar reply is expanded into the usual actor dicts once, and the reply
+    is rewritten to hold them so later calls do not decode it again.
+    """
+    holder = response
+    if "actors" not in holder and "actor_columns" not in holder and isinstance(response.get("result"), dict):
+        holder = response["result"]
+    if isinstance(holder.get("actor_columns"), dict):
+        holder["actors"] = actors_from_columns(holder.pop("actor_columns"))
+    actors = holder.get("actors")
+    return actors if isinstance(actors, list) else None
+
+def actors_from_columns(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand {"name": [...], "class_table": [...], "class": [indexes], "location": xyz} into actor dicts.
+    
+    "location" is either little-endian float32 bytes (binary encodings) or a
+    flat list of floats (JSON), three values per actor. Optional "rotation" and
+    "scale" columns use the same layout.
+    """
+    names = columns.get("name") or []
+    table = columns.get("class_table") or []
+    classes = [table[index] for index in columns.get("class") or []]
+    coordinates = iter(float_column(columns.get("location")))
+    actors = [{"name": name, "class": actor_class, "location": {"x": x, "y": y, "z": z}}
+              for name, actor_class, x, y, z in zip(names, classes, coordinates, coordinates, coordinates)]
+    for key in ("rotation", "scale"):
+        if key in columns:
+            values = iter(float_column(columns[key]))
+            for actor, a, b, c in zip(actors, values, values, values):
+                actor[key] = [a, b, c]
+    return actors
+
+def float_column(column: Any) -> List[float]:
+    """A columnar float array: little-endian float32 bytes or a plain list"""
+    if not isinstance(column, (bytes, bytearray)):
+        return column or []
+    if np is not None:
+        return np.frombuffer(column, dtype="<f4").tolist()
+    values = array.array("f")
+    values.frombytes(column)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+def payload_summary(message: Dict[str, Any]) -> str:
+    """key=value outline of a request envelope or reply, without its body"""
+    parts = [f"{key}={message[key]}" for key in ("type", "status") if key in message]
+    params = message.get("params")
+    if isinstance(params, dict) and isinstance(params.get("commands"), list):
+        parts.append(f"commands={len(params['commands'])}")
+    results = message.get("results")
+    if isinstance(results, list):
+        failed = sum(1 for result in results if isinstance(result, dict) and result.get("status") != "success")
+        parts.append(f"results={len(results)} failed={failed}")
+    actors = extract_actors(message)
+    if actors is not None:
+        parts.append(f"actors={len(actors)}")
+    if "error" in message:
+        parts.append(f"error={truncate_text(str(message['error']), 200)!r}")
+    return " ".join(parts)
+
+def truncate_text(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text):,} chars)"
+
+def log_body(label: str, body: Any):
+    """Full request or reply at DEBUG, cut to LOG_BODY_MAX_CHARS"""
+    text = body if isinstance(body, str) else json.dumps(body)
+    logger.debug("%s body: %s", label, truncate_text(text, LOG_BODY_MAX_CHARS))
+
+# Summaries are only built when INFO is on - get_all_actors replies can be megabytes
+
+def log_request(envelope: Dict[str, Any], payload: bytes) -> bool:
+    """Log an outgoing command; returns whether its bodies were sampled for DEBUG"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Sending %s bytes=%d", payload_summary(envelope), len(payload))
+    sampled = logger.isEnabledFor(logging.DEBUG) and random.random() < LOG_BODY_SAMPLE_RATE
+    if sampled:
+        log_body("Request", envelope)
+    return sampled
+
+def log_reply(command_type: str, response: Dict[str, Any], size: int, sampled: bool):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("UE Response to %s: %s bytes=%d", command_type, payload_summary(response), size)
+    if sampled:
+        log_body("Reply", response)
+
+def location_dict(location: Any) -> Dict[str, float]:
+    """Normalize [x, y, z] or {"x", "y", "z"} locations to the get_all_actors form"""
+    if isinstance(location, dict):
+        return {axis: float(location.get(axis, 0.0)) for axis in ("x", "y", "z")}
+    if isinstance(location, (list, tuple)) and len(location) >= 3:
+        return {"x": float(location[0]), "y": float(location[1]), "z": float(location[2])}
+    return {"x": 0.0, "y": 0.0, "z": 0.0}
+
+def vector3(value: Any, keys: Tuple[str, str, str], default: float) -> List[float]:
+    """Normalize a rotation ([pitch, yaw, roll] or a dict) or scale to three floats"""
+    if isinstance(value, dict):
+        return [float(value.get(key, default)) for key in keys]
+    if isinstance(value, (list, tuple)) and len(value) >= 3:
+        return [float(component) for component in value[:3]]
+    return [default] * 3
+
+ROTATION_KEYS = ("pitch", "yaw", "roll")
+SCALE_KEYS = ("x", "y", "z")
+
+class ActorIndex:
+    """Secondary indexes over actor names.
+    
+    - class -> names hash index
+    - sorted name list for prefix and glob queries (bisect, not a full scan)
+    - tag -> names, for plugins that report actor tags
+    - the `_<timestamp>` name suffix our example scripts append
+    """
+    
+    _TIMESTAMP_SUFFIX = re.compile(r'_(\d{9,13})$')
+    _GLOB_CHARS = re.compile(r'[*?\[]')
+    
+    def __init__(self):
+        self.clear()
+        
+    def clear(self):
+        self.by_class: Dict[str, set] = {}
+        self.by_tag: Dict[str, set] = {}
+        self.by_timestamp: Dict[int, set] = {}
+        self._timestamps: List[int] = []  # Sorted distinct suffix values
+        self._names: List[str] = []  # Sorted actor names
+        
+    def rebuild(self, actors: List[Dict[str, Any]]):
+        """Index a full snapshot in one pass"""
+        self.clear()
+        for actor in actors:
+            self._add_secondary(actor)
+        self._names = sorted(actor["name"] for actor in actors)
+        self._timestamps = sorted(self.by_timestamp)
+        
+    def add(self, actor: Dict[str, Any]):
+        self._add_secondary(actor, keep_sorted=True)
+        if not self.contains(actor["name"]):
+            bisect.insort(self._names, actor["name"])
+            
+    def remove(self, actor: Dict[str, Any]):
+        name = actor["name"]
+        self._discard(self.by_class, actor.get("class"), name)
+        for tag in actor.get("tags") or []:
+            self._discard(self.by_tag, tag, name)
+        timestamp = self.timestamp_of(name)
+        if timestamp is not None and self._discard(self.by_timestamp, timestamp, name):
+            del self._timestamps[bisect.bisect_left(self._timestamps, timestamp)]
+        position = bisect.bisect_left(self._names, name)
+        if position < len(self._names) and self._names[position] == name:
+            del self._names[position]
+    
+    @classmethod
+    def is_pattern(cls, text: str) -> bool:
+        return cls._GLOB_CHARS.search(text) is not None
+    
+    def contains(self, name: str) -> bool:
+        position = bisect.bisect_left(self._names, name)
+        return position < len(self._names) and self._names[position] == name
+    
+    def timestamp_of(self, name: str) -> Optional[int]:
+        match = self._TIMESTAMP_SUFFIX.search(name)
+        return int(match.group(1)) if match else None
+    
+    def with_class(self, actor_class: str) -> set:
+        return self.by_class.get(actor_class, set())
+    
+    def with_tag(self, tag: str) -> set:
+        return self.by_tag.get(tag, set())
+    
+    def with_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._names, prefix)
+        # U+10FFFF sorts after every character that can follow the prefix
+        end = bisect.bisect_left(self._names, prefix + '\U0010ffff', start)
+        return self._names[start:end]
+    
+    def with_timestamp(self, first: int, last: Optional[int] = None) -> set:
+        """Names whose `_<timestamp>` suffix falls in [first, last]"""
+        last = first if last is None else last
+        start = bisect.bisect_left(self._timestamps, first)
+        end = bisect.bisect_right(self._timestamps, last)
+        names = set()
+        for timestamp in self._timestamps[start:end]:
+            names |= self.by_timestamp[timestamp]
+        return names
+    
+    def match(self, pattern: str) -> List[str]:
+        """Names matching a glob. Only the range sharing its literal prefix is scanned"""
+        wildcard = self._GLOB_CHARS.search(pattern)
+        if not wildcard:
+            return [pattern] if self.contains(pattern) else []
+        
+        # "*_<timestamp>" is answered straight from the suffix index
+        suffix = re.fullmatch(r'\*_(\d{9,13})', pattern)
+        if suffix:
+            return sorted(self.with_timestamp(int(suffix.group(1))))
+        
+        candidates = self.with_prefix(pattern[:wildcard.start()])
+        return [name for name in candidates if fnmatch.fnmatchcase(name, pattern)]
+    
+    def _add_secondary(self, actor: Dict[str, Any], keep_sorted: bool = False):
+        name = actor["name"]
+        self.by_class.setdefault(actor.get("class"), set()).add(name)
+        for tag in actor.get("tags") or []:
+            self.by_tag.setdefault(tag, set()).add(name)
+        timestamp = self.timestamp_of(name)
+        if timestamp is not None:
+            if keep_sorted and timestamp not in self.by_timestamp:
+                bisect.insort(self._timestamps, timestamp)
+            self.by_timestamp.setdefault(timestamp, set()).add(name)
+            
+    @staticmethod
+    def _discard(index: Dict[Any, set], key: Any, name: str) -> bool:
+        """Remove name under key, returning True when the key became empty"""
+        names = index.get(key)
+        if names is None:
+            return False
+        names.discard(name)
+        if not names:
+            del index[key]
+            return True
+        return False
+
+Point = Tuple[float, float, float]
+
+def as_point(location: Any) -> Point:
+    loc = location_dict(location)
+    return (loc["x"], loc["y"], loc["z"])
+
+class SpatialIndex:
+    """Uniform grid over actor locations for box/radius queries and free-slot search.
+    
+    Actors are points - the plugin reports locations, not bounds - so "overlap"
+    means two actors closer than a clearance distance.
+    """
+    
+    def __init__(self, cell_size: float = SPATIAL_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self.clear()
+        
+    def clear(self):
+        self.points: Dict[str, Point] = {}
+        self.cells: Dict[Tuple[int, int, int], Dict[str, Point]] = {}
+        
+    def __len__(self) -> int:
+        return len(self.points)
+    
+    def rebuild(self, actors: List[Dict[str, Any]]):
+        self.clear()
+        for actor in actors:
+            self.add(actor["name"], actor.get("location"))
+            
+    def add(self, name: str, location: Any):
+        if name in self.points:
+            self.remove(name)
+        point = as_point(location)
+        self.points[name] = point
+        self.cells.setdefault(self._cell(point), {})[name] = point
+        
+    def remove(self, name: str):
+        point = self.points.pop(name, None)
+        if point is None:
+            return
+        key = self._cell(point)
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.pop(name, None)
+            if not cell:
+                del self.cells[key]
+                
+    def query_box(self, low: Point, high: Point) -> List[str]:
+        """Names of actors inside the axis-aligned box [low, high]"""
+        hits = []
+        for cell in self._cells_overlapping(low, high):
+            for name, (x, y, z) in cell.items():
+                if low[0] <= x <= high[0] and low[1] <= y <= high[1] and low[2] <= z <= high[2]:
+                    hits.append(name)
+        return hits
+    
+    def query_radius(self, center: Point, radius: float) -> List[Tuple[str, float]]:
+        """(name, distance) of actors within radius of center, nearest first"""
+        cx, cy, cz = center
+        low = (cx - radius, cy - radius, cz - radius)
+        high = (cx + radius, cy + radius, cz + radius)
+        limit = radius * radius
+        hits = []
+        for cell in self._cells_overlapping(low, high):
+            for name, (x, y, z) in cell.items():
+                distance = (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2
+                if distance <= limit:
+                    hits.append((name, math.sqrt(distance)))
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+    
+    def is_free(self, point: Point, clearance: float) -> bool:
+        """True when no actor is closer than clearance to point"""
+        px, py, pz = point
+        limit = clearance * clearance
+        low = (px - clearance, py - clearance, pz - clearance)
+        high = (px + clearance, py + clearance, pz + clearance)
+        for cell in self._cells_overlapping(low, high):
+            for x, y, z in cell.values():
+                if (x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2 < limit:
+                    return False
+        return True
+    
+    def _cell(self, point: Point) -> Tuple[int, int, int]:
+        size = self.cell_size
+        return (math.floor(point[0] / size), math.floor(point[1] / size), math.floor(point[2] / size))
+    
+    def _cells_overlapping(self, low: Point, high: Point):
+        lo = self._cell(low)
+        hi = self._cell(high)
+        span = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if span > len(self.cells):
+            # Huge region - walking the occupied cells is cheaper than the empty grid
+            for (i, j, k), cell in self.cells.items():
+                if lo[0] <= i <= hi[0] and lo[1] <= j <= hi[1] and lo[2] <= k <= hi[2]:
+                    yield cell
+            return
+        for i in range(lo[0], hi[0] + 1):
+            for j in range(lo[1], hi[1] + 1):
+                for k in range(lo[2], hi[2] + 1):
+                    cell = self.cells.get((i, j, k))
+                    if cell:
+                        yield cell
+
+class PlacementPlanner:
+    """Moves generated spawn locations off existing actors (and off each other).
+    
+    Reads the scene's spatial index and keeps its own reservations, so a failed
+    spawn never leaves a phantom actor in the scene cache.
+    """
+    
+    def __init__(self, scene: SpatialIndex, clearance: float = PLACEMENT_CLEARANCE,
+                 max_rings: int = 64):
+        self.scene = scene
+        self.clearance = clearance
+        self.max_rings = max_rings
+        self.reserved = SpatialIndex(scene.cell_size)
+        self.moved = 0
+        
+    def is_free(self, point: Point) -> bool:
+        return self.scene.is_free(point, self.clearance) and self.reserved.is_free(point, self.clearance)
+    
+    def nearest_free_slot(self, point: Point) -> Optional[Point]:
+        """Closest free point on rings around point in its horizontal plane"""
+        if self.is_free(point):
+            return point
+        x, y, z = point
+        for ring in range(1, self.max_rings + 1):
+            radius = ring * self.clearance
+            samples = max(8, int(math.ceil(2 * math.pi * radius / self.clearance)))
+            for step in range(samples):
+                angle = 2 * math.pi * step / samples
+                candidate = (x + radius * math.cos(angle), y + radius * math.sin(angle), z)
+                if self.is_free(candidate):
+                    return candidate
+        return None
+    
+    def place(self, name: str, location: Any) -> List[float]:
+        """Free location for a new actor, reserved for it; falls back to the original"""
+        point = as_point(location)
+        slot = self.nearest_free_slot(point) or point
+        if slot != point:
+            self.moved += 1
+        self.reserved.add(name, slot)
+        return [round(slot[0], 3), round(slot[1], 3), round(slot[2], 3)]
+
+class SceneCache:
+    """In-process mirror of the level's actors, keyed by actor name.
+    
+    Filled from get_all_actors replies and kept current from the results of our own
+    spawn/delete/move commands. A snapshot is trusted for `ttl` seconds; commands
+    the cache does not understand invalidate it.
+    """
+    
+    # Commands that never change the scene
+    READ_ONLY_COMMANDS = {"ping", "get_all_actors", "save_level"}
+    
+    def __init__(self, ttl: float = SCENE_CACHE_TTL):
+        self.ttl = ttl
+        self.actors: Dict[str, Dict[str, Any]] = {}
+        self.index = ActorIndex()
+        self.spatial = SpatialIndex()
+        self.loaded_at: Optional[float] = None
+        self.counters = {"hits": 0, "misses": 0, "loads": 0, "updates": 0, "invalidations": 0}
+        
+    def is_fresh(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl
+    
+    def get(self) -> Optional[List[Dict[str, Any]]]:
+        """Cached actor list, or None when it has to be fetched again"""
+        if not self.is_fresh():
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return list(self.actors.values())
+    
+    def load(self, actors: List[Dict[str, Any]]):
+        """Bring the mirror in line with a full get_all_actors snapshot.
+        
+        Refreshes usually differ from the mirror by a few actors, so only the
+        difference is applied to the indexes, as observe() does for single
+        commands. A first load, or one where much of the level changed, rebuilds them.
+        """
+        snapshot = {actor.get("name"): actor for actor in actors if actor.get("name")}
+        removed = self.actors.keys() - snapshot.keys()
+        added = snapshot.keys() - self.actors.keys()
+        if len(removed) + len(added) > len(snapshot) // 4:
+            self.actors = snapshot
+            self.index.rebuild(list(snapshot.values()))
+            self.spatial.rebuild(list(snapshot.values()))
+        else:
+            for name in removed:
+                self._discard(name)
+            for name, actor in snapshot.items():
+                previous = self.actors.get(name)
+                if previous is None or previous.get("class") != actor.get("class") \
+                        or previous.get("tags") != actor.get("tags"):
+                    self._put(actor)
+                elif previous.get("location") != actor.get("location"):
+                    self.spatial.add(name, actor.get("location"))
+            self.actors = snapshot  # Reply order, and the reply's dicts
+        self.loaded_at = time.monotonic()
+        self.counters["loads"] += 1
+        
+    def invalidate(self):
+        if self.loaded_at is not None:
+            self.counters["invalidations"] += 1
+        self.loaded_at = None
+        
+    def observe(self, command_type: str, params: Dict[str, Any], response: Dict[str, Any]):
+        """Apply the outcome of a command we sent to the mirror"""
+        if command_type == "get_all_actors":
+            actors = extract_actors(response)
+            # A server-side page is only part of the level, never a snapshot
+            if actors is not None and "limit" not in params:
+                self.load(actors)
+            return
+        if command_type == "batch":
+            for command, reply in zip(params.get("commands", []), response.get("results") or []):
+                self.observe(command.get("type", ""), command.get("params") or {}, reply)
+            return
+        if command_type in self.READ_ONLY_COMMANDS:
+            return
+        
+        ok = response.get("status") == "success"
+        result = response.get("result") if isinstance(response.get("result"), dict) else {}
+        
+        if command_type == "spawn_actor" and ok:
+            # The editor may rename the actor, so trust the reply over the request
+            name = result.get("name") or params.get("name")
+            actor = {
+                "name": name,
+                "class": result.get("class") or params.get("type", "Actor"),
+                "location": location_dict(result.get("location", params.get("location")))
+            }
+            actor.update((key, result.get(key, params[key])) for key in ("rotation", "scale") if key in params)
+            self._put(actor)
+        elif command_type == "delete_actor" and (ok or "not found" in str(response.get("error", "")).lower()):
+            self._discard(params.get("actor_name"))
+        elif command_type in TRANSFORM_COMMANDS and ok:
+            actor = self.actors.get(params.get("actor_name"))
+            if actor is not None and "location" in params:
+                actor["location"] = location_dict(params.get("location"))
+                self.spatial.add(actor["name"], actor["location"])
+            if actor is not None:
+                actor.update((key, params[key]) for key in ("rotation", "scale") if key in params)
+        elif ok:
+            # Something we cannot mirror changed the scene
+            self.invalidate()
+            return
+        else:
+            return
+        self.counters["updates"] += 1
+        
+    def query(self, pattern: str = "", filter: str = "",
+              classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Actors matching every given criterion, answered from the indexes.
+        
+        pattern: glob over actor names ("Tower_*", "*_1712345678")
+        filter:  comma-separated terms - class:PointLight|SpotLight, prefix:Coral_,
+                 tag:Props, timestamp:1712345678 or timestamp:1712340000-1712349999
+        classes: restrict to these actor classes
+        """
+        candidates: Optional[set] = None
+        
+        def narrow(names):
+            nonlocal candidates
+            names = set(names)
+            candidates = names if candidates is None else candidates & names
+            
+        if classes is not None:
+            narrow(name for actor_class in classes for name in self.index.with_class(actor_class))
+        if pattern:
+            narrow(self.index.match(pattern))
+        for term in filter.split(","):
+            if not term.strip():
+                continue
+            key, _, value = term.strip().partition(":")
+            key, value = key.strip().lower(), value.strip()
+            if key == "class":
+                narrow(name for actor_class in value.split("|") for name in self.index.with_class(actor_class))
+            elif key == "prefix":
+                narrow(self.index.with_prefix(value))
+            elif key == "tag":
+                narrow(self.index.with_tag(value))
+            elif key == "timestamp":
+                first, _, last = value.partition("-")
+                narrow(self.index.with_timestamp(int(first), int(last) if last else None))
+            else:
+                raise ValueError(f"Unknown filter term '{term.strip()}' (use class:, prefix:, tag: or timestamp:)")
+                
+        if candidates is None:
+            return list(self.actors.values())
+        return [self.actors[name] for name in sorted(candidates) if name in self.actors]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "actors": len(self.actors),
+            "fresh": self.is_fresh(),
+            "age_s": round(time.monotonic() - self.loaded_at, 3) if self.loaded_at is not None else None,
+            "ttl_s": self.ttl,
+            **self.counters
+        }
+    
+    def _put(self, actor: Dict[str, Any]):
+        previous = self.actors.get(actor["name"])
+        if previous is not None:
+            self.index.remove(previous)
+        self.actors[actor["name"]] = actor
+        self.index.add(actor)
+        self.spatial.add(actor["name"], actor.get("location"))
+        
+    def _discard(self, name: str):
+        actor = self.actors.pop(name, None)
+        if actor is not None:
+            self.index.remove(actor)
+            self.spatial.remove(name)
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are interpolated within a bucket"""
+    
+    def __init__(self, bounds: Tuple[float, ...] = METRICS_LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, in_bucket in enumerate(self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else self.max
+                value = low + (high - low) * (rank - seen) / in_bucket
+                return min(max(value, self.min), self.max)
+            seen += in_bucket
+        return self.max
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max, 3)
+        }
+
+class CommandTimer:
+    """Stage clock for one command; each mark() times the stage since the previous one"""
+    
+    def __init__(self, metrics: "PerformanceMetrics", command_type: str):
+        self.metrics = metrics
+        self.command_type = command_type
+        self.started = self.last = time.perf_counter()
+        self.bytes_in = 0
+        
+    def mark(self, stage: Optional[str] = None):
+        """Close the current stage (None restarts the clock without recording)"""
+        now = time.perf_counter()
+        if stage:
+            self.metrics.observe(self.command_type, stage, (now - self.last) * 1000)
+        self.last = now
+        
+    def sent(self, size: int):
+        self.mark("send")
+        self.metrics.add_bytes(self.command_type, "out", size)
+        
+    def received(self, size: int, first: bool):
+        if first:
+            self.mark("first_byte")
+        self.bytes_in += size
+        self.metrics.add_bytes(self.command_type, "in", size)
+
+class PerformanceMetrics:
+    """Latency histograms, byte counts, error categories and in-flight gauges.
+    
+    Per command type, send_command records the stages connect (new sockets only),
+    send, first_byte (request written until the first reply byte - time spent in
+    Unreal plus the network) and total. MCP tools record their own durations.
+    """
+    
+    STAGES = ("connect", "send", "first_byte", "total")
+    
+    def __init__(self):
+        self.reset()
+        
+    def reset(self):
+        self.started_at = time.time()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.bytes: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.peak_in_flight = 0
+        self.tools: Dict[str, Histogram] = {}
+        self.tool_failures: Dict[str, int] = {}
+        
+    def start(self, command_type: str) -> CommandTimer:
+        self.in_flight[command_type] = self.in_flight.get(command_type, 0) + 1
+        self.peak_in_flight = max(self.peak_in_flight, sum(self.in_flight.values()))
+        return CommandTimer(self, command_type)
+    
+    def finish(self, timer: CommandTimer, error: Optional[str] = None):
+        """Record the total time and outcome of a command started with start()"""
+        timer.mark()
+        self.observe(timer.command_type, "total", (timer.last - timer.started) * 1000)
+        self.in_flight[timer.command_type] -= 1
+        if error:
+            self.count_error(timer.command_type, error)
+            
+    def count_error(self, command_type: str, category: str):
+        key = (command_type, category)
+        self.errors[key] = self.errors.get(key, 0) + 1
+        
+    def observe(self, command_type: str, stage: str, ms: float):
+        histogram = self.latency.get((command_type, stage))
+        if histogram is None:
+            histogram = self.latency[(command_type, stage)] = Histogram()
+        histogram.observe(ms)
+        
+    def add_bytes(self, command_type: str, direction: str, size: int):
+        key = (command_type, direction)
+        self.bytes[key] = self.bytes.get(key, 0) + size
+        
+    def observe_tool(self, tool: str, ms: float, failed: bool):
+        histogram = self.tools.get(tool)
+        if histogram is None:
+            histogram = self.tools[tool] = Histogram()
+        histogram.observe(ms)
+        if failed:
+            self.tool_failures[tool] = self.tool_failures.get(tool, 0) + 1
+            
+    @staticmethod
+    def error_category(error: BaseException) -> str:
+        if isinstance(error, asyncio.TimeoutError):
+            return "timeout"
+        if isinstance(error, ConnectionRefusedError):
+            return "refused"
+        if isinstance(error, OSError):
+            return "connection"
+        if isinstance(error, ValueError):
+            return "parse"
+        return "other"
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything recorded, grouped per command type and per tool"""
+        commands: Dict[str, Dict[str, Any]] = {}
+        
+        def entry(command_type: str) -> Dict[str, Any]:
+            return commands.setdefault(command_type, {"latency_ms": {}, "bytes": {}, "errors": {}})
+        
+        for (command_type, stage), histogram in sorted(self.latency.items()):
+            entry(command_type)["latency_ms"][stage] = histogram.summary()
+        for (command_type, direction), size in self.bytes.items():
+            entry(command_type)["bytes"][direction] = size
+        for (command_type, category), count in self.errors.items():
+            entry(command_type)["errors"][category] = count
+            
+        waiting = sum(h.sum for (_, stage), h in self.latency.items() if stage == "first_byte")
+        total = sum(h.sum for (_, stage), h in self.latency.items() if stage == "total")
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "commands": commands,
+            "in_flight": sum(self.in_flight.values()),
+            "peak_in_flight": self.peak_in_flight,
+            # Share of command time spent waiting for Unreal's reply rather than on our side
+            "unreal_wait_share": round(waiting / total, 3) if total else None,
+            "tools": {name: dict(histogram.summary(), failures=self.tool_failures.get(name, 0))
+                      for name, histogram in sorted(self.tools.items())}
+        }
+    
+    def prometheus(self, prefix: str = "vhci") -> str:
+        """Prometheus text exposition of the same data (durations in seconds)"""
+        lines = []
+        
+        def histogram_lines(name: str, labels: str, histogram: Histogram):
+            cumulative = 0
+            for bound, in_bucket in zip(list(histogram.bounds) + [math.inf], histogram.buckets):
+                cumulative += in_bucket
+                le = "+Inf" if bound == math.inf else f"{bound / 1000:g}"
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum / 1000:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            
+        lines.append(f"# TYPE {prefix}_command_duration_seconds histogram")
+        for (command_type, stage), histogram in sorted(self.latency.items()):
+            histogram_lines(f"{prefix}_command_duration_seconds",
+                            f'command="{command_type}",stage="{stage}"', histogram)
+        lines.append(f"# TYPE {prefix}_command_bytes_total counter")
+        for (command_type, direction), size in sorted(self.bytes.items()):
+            lines.append(f'{prefix}_command_bytes_total{{command="{command_type}",direction="{direction}"}} {size}')
+        lines.append(f"# TYPE {prefix}_command_errors_total counter")
+        for (command_type, category), count in sorted(self.errors.items()):
+            lines.append(f'{prefix}_command_errors_total{{command="{command_type}",category="{category}"}} {count}')
+        lines.append(f"# TYPE {prefix}_commands_in_flight gauge")
+        for command_type, count in sorted(self.in_flight.items()):
+            lines.append(f'{prefix}_commands_in_flight{{command="{command_type}"}} {count}')
+        lines.append(f"# TYPE {prefix}_tool_duration_seconds histogram")
+        for tool, histogram in sorted(self.tools.items()):
+            histogram_lines(f"{prefix}_tool_duration_seconds", f'tool="{tool}"', histogram)
+        lines.append(f"# TYPE {prefix}_tool_failures_total counter")
+        for tool, count in sorted(self.tool_failures.items()):
+            lines.append(f'{prefix}_tool_failures_total{{tool="{tool}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+# Process-wide metrics shared by every connection and tool
+METRICS = PerformanceMetrics()
+
+class TransportPolicy:
+    """Retry, timeout and circuit-breaker decisions for one UnrealConnection.
+    
+    - Refused connections are retried with exponential backoff and full jitter
+      (nothing was sent, so retrying cannot repeat a command).
+    - Timeouts shrink to UNREAL_TIMEOUT_MULTIPLIER x the recent p99 of each command
+      type, never below UNREAL_TIMEOUT_FLOOR or above the configured timeout. A
+      timeout forgets the learned latencies, so the next commands get the full one.
+    - After UNREAL_BREAKER_THRESHOLD consecutive transport failures the circuit
+      opens and commands fail at once; after a cooldown a ping probes the editor
+      and closes the circuit again, or doubles the cooldown.
+    """
+    
+    def __init__(self, retry_attempts: int = UNREAL_RETRY_ATTEMPTS,
+                 breaker_threshold: int = UNREAL_BREAKER_THRESHOLD,
+                 adaptive_timeouts: bool = UNREAL_ADAPTIVE_TIMEOUT):
+        self.retry_attempts = retry_attempts
+        self.breaker_threshold = breaker_threshold
+        self.adaptive_timeouts = adaptive_timeouts
+        self.latencies: Dict[str, deque] = {}
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.cooldown = UNREAL_BREAKER_COOLDOWN
+        self.reopen_at = 0.0
+        self.counters = {"retries": 0, "opened": 0, "probes": 0, "fast_failures": 0}
+        
+    def backoff(self, attempt: int) -> float:
+        self.counters["retries"] += 1
+        return random.uniform(0, min(UNREAL_RETRY_MAX_DELAY, UNREAL_RETRY_BASE_DELAY * 2 ** attempt))
+    
+    def timeout_for(self, command_type: str, default: float) -> float:
+        window = self.latencies.get(command_type)
+        if not self.adaptive_timeouts or window is None or len(window) < UNREAL_LATENCY_MIN_SAMPLES:
+            return default
+        ordered = sorted(window)
+        p99 = ordered[int(0.99 * (len(ordered) - 1))]
+        return min(default, max(UNREAL_TIMEOUT_FLOOR, p99 * UNREAL_TIMEOUT_MULTIPLIER))
+    
+    def record_success(self, command_type: str, seconds: float):
+        window = self.latencies.get(command_type)
+        if window is None:
+            window = self.latencies[command_type] = deque(maxlen=UNREAL_LATENCY_WINDOW)
+        window.append(seconds)
+        self.consecutive_failures = 0
+        
+    def record_failure(self, command_type: str, timed_out: bool):
+        if timed_out:
+            self.latencies.pop(command_type, None)
+        self.consecutive_failures += 1
+        if self.state == "closed" and self.consecutive_failures >= self.breaker_threshold:
+            self.open()
+            
+    def open(self):
+        if self.state == "closed":
+            self.counters["opened"] += 1
+            logger.warning(f"UE not responding after {self.consecutive_failures} failures - "
+                           f"failing fast for {self.cooldown:.1f}s")
+        self.state = "open"
+        self.reopen_at = time.monotonic() + self.cooldown
+        
+    def close(self):
+        if self.state != "closed":
+            logger.info("UE responding again - circuit closed")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.cooldown = UNREAL_BREAKER_COOLDOWN
+        
+    def probe_due(self) -> bool:
+        return time.monotonic() >= self.reopen_at
+    
+    def probe_failed(self):
+        self.cooldown = min(UNREAL_BREAKER_MAX_COOLDOWN, self.cooldown * 2)
+        self.open()
+        
+    def retry_in(self) -> float:
+        return max(0.0, self.reopen_at - time.monotonic())
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "cooldown_s": self.cooldown,
+            "retry_in_s": round(self.retry_in(), 3) if self.state == "open" else None,
+            "timeouts_s": {command_type: round(self.timeout_for(command_type, UNREAL_TIMEOUT), 3)
+                           for command_type in sorted(self.latencies)},
+            **self.counters
+        }
+
+class SceneJournal:
+    """Append-only JSONL record of every scene-changing command and its outcome.
+    
+    One compact line per command: {"ts", "type", "params", "ok"} plus "error" for
+    failures and "name" when the editor renamed a spawned actor. Batches are
+    written as their inner commands, so the journal reads the same whether the
+    plugin batched or not.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.entries_written = 0
+        
+    def record(self, command_type: str, params: Dict[str, Any], response: Dict[str, Any]):
+        if command_type == "batch":
+            commands = params.get("commands", [])
+            results = response.get("results")
+            if not isinstance(results, list):
+                if "unknown command" in str(response.get("error", "")).lower():
+                    return  # Plugin without batching - the commands are resent one by one
+                results = [response] * len(commands)  # The batch failed as a whole
+            self.record_many([(command.get("type", ""), command.get("params") or {}, reply)
+                              for command, reply in zip(commands, results)])
+        elif command_type not in SceneCache.READ_ONLY_COMMANDS:
+            self.record_many([(command_type, params, response)])
+            
+    def record_many(self, commands: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]):
+        now = round(time.time(), 3)
+        lines = []
+        for command_type, params, response in commands:
+            if command_type in SceneCache.READ_ONLY_COMMANDS:
+                continue
+            entry = {"ts": now, "type": command_type, "params": params, "ok": response.get("status") == "success"}
+            if not entry["ok"]:
+                entry["error"] = str(response.get("error", "Unknown error"))
+            result = response.get("result")
+            if command_type == "spawn_actor" and isinstance(result, dict) and result.get("name") not in (None, params.get("name")):
+                entry["name"] = result["name"]
+            lines.append(json.dumps(entry, separators=(",", ":")))
+        if lines:
+            # One write per command or batch keeps journaling off the per-actor hot path
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+            self.entries_written += len(lines)
+            
+    @staticmethod
+    def read(path: str) -> List[Dict[str, Any]]:
+        """Journal entries in order; a torn last line (crash mid-write) is skipped"""
+        entries = []
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping unreadable journal line in {path}")
+        return entries
+    
+    @staticmethod
+    def fold(entries: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], set, List[Dict[str, Any]]]:
+        """Net effect of a journal: (actors as spawn params, deleted names, other commands).
+        
+        Spawning, moving and deleting one actor folds into nothing, so replaying a
+        long session sends one command per surviving actor at most. Actors the
+        journal only moved have no "type" - they are moved if present, never spawned.
+        Commands the fold does not understand are kept in order.
+        """
+        actors: Dict[str, Dict[str, Any]] = {}
+        deleted = set()
+        other = []
+        for entry in entries:
+            command_type, params = entry.get("type"), entry.get("params") or {}
+            if command_type == "delete_actor":
+                if entry.get("ok") or "not found" in str(entry.get("error", "")).lower():
+                    actors.pop(params.get("actor_name"), None)
+                    deleted.add(params.get("actor_name"))
+            elif not entry.get("ok"):
+                continue
+            elif command_type == "spawn_actor":
+                spec = dict(params, name=entry.get("name") or params.get("name"))
+                actors[spec["name"]] = spec
+                deleted.discard(spec["name"])
+            elif command_type in TRANSFORM_COMMANDS:
+                spec = actors.setdefault(params.get("actor_name"), {"name": params.get("actor_name")})
+                if "location" in params:
+                    location = location_dict(params["location"])
+                    spec["location"] = [location[axis] for axis in "xyz"]
+                spec.update((key, params[key]) for key in ("rotation", "scale") if key in params)
+            else:
+                other.append({"type": command_type, "params": params})
+        return actors, deleted, other
+
+class TransformQueue:
+    """Coalesces actor moves into batched transform commands.
+    
+    A move is held for up to `window` seconds so moves queued around the same
+    time go out in one batch. A later move of an actor that is still pending
+    replaces its location, rotation or scale (last write wins) instead of adding
+    a command, and every caller that queued a move for that actor gets the reply
+    of the one command sent. Batches are sent one at a time, in queue order, so
+    an actor never ends up at an older position.
+    """
+    
+    def __init__(self, conn: "UnrealConnection", window: float = TRANSFORM_FLUSH_WINDOW,
+                 max_pending: int = UNREAL_BATCH_SIZE):
+        self.conn = conn
+        self.window = window
+        self.max_pending = max_pending
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.counters = {"queued": 0, "coalesced": 0, "sent": 0, "flushes": 0}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sending: Optional[asyncio.Lock] = None  # Created on first use, inside the event loop
+        self._drain_scheduled = False
+        self._tasks: set = set()
+        
+    def put(self, name: str, location: Any = None, rotation: Any = None, scale: Any = None) -> asyncio.Future:
+        """Queue a transform; the future resolves to the reply of the command that carried it"""
+        loop = asyncio.get_running_loop()
+        transform = self.pending.get(name)
+        if transform is None:
+            transform = self.pending[name] = {}
+            self.waiters[name] = []
+        else:
+            self.counters["coalesced"] += 1
+        for key, value in (("location", location), ("rotation", rotation), ("scale", scale)):
+            if value is not None:
+                transform[key] = value
+        self.counters["queued"] += 1
+        future = loop.create_future()
+        self.waiters[name].append(future)
+        
+        if len(self.pending) >= self.max_pending:
+            self._send_soon()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._send_soon)
+        return future
+    
+    async def move(self, name: str, location: Any = None, rotation: Any = None, scale: Any = None) -> Dict[str, Any]:
+        return await self.put(name, location, rotation, scale)
+    
+    async def flush(self):
+        """Send everything pending now instead of waiting for the window"""
+        await self._drain()
+        
+    @staticmethod
+    def command(name: str, transform: Dict[str, Any]) -> Dict[str, Any]:
+        """set_actor_location when only the location changes, else set_actor_transform"""
+        if set(transform) == {"location"}:
+            return {"type": "set_actor_location",
+                    "params": {"actor_name": name, "location": location_dict(transform["location"])}}
+        params = spawn_params(transform)  # Same [x, y, z] / [pitch, yaw, roll] lists as spawn_actor
+        return {"type": "set_actor_transform",
+                "params": dict({key: params[key] for key in transform}, actor_name=name)}
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"pending": len(self.pending), "window_s": self.window, **self.counters}
+    
+    def _take(self) -> List[Tuple[str, Dict[str, Any], List[asyncio.Future]]]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(name, transform, self.waiters.pop(name)) for name, transform in self.pending.items()]
+        self.pending = {}
+        return batch
+    
+    def _send_soon(self):
+        if self._drain_scheduled:
+            return  # The drain already waiting will take these moves too
+        self._drain_scheduled = True
+        task = asyncio.ensure_future(self._drain())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        
+    async def _drain(self):
+        if self._sending is None:
+            self._sending = asyncio.Lock()
+        async with self._sending:
+            # Taken only once the previous batch is done, so moves queued meanwhile coalesce too
+            self._drain_scheduled = False
+            batch = self._take()
+            if not batch:
+                return
+            commands = [self.command(name, transform) for name, transform, _ in batch]
+            try:
+                replies = await self.conn.send_batch(commands)
+            except Exception as e:
+                logger.error(f"Transform batch failed: {e}")
+                replies = [{"status": "error", "error": str(e)}] * len(commands)
+        self.counters["sent"] += len(commands)
+        self.counters["flushes"] += 1
+        for (_, _, futures), reply in zip(batch, replies):
+            for future in futures:
+                if not future.done():
+                    future.set_result(reply)
+
+class StreamLostError(ConnectionResetError):
+    """A command whose stream (multiplexed or a reused pooled socket) closed before its reply arrived.
+    
+    `written` is False when the request never reached the socket, so sending it
+    again cannot run the command twice.
+    """
+    
+    def __init__(self, message: str, written: bool = True):
+        super().__init__(message)
+        self.written = written
+
+class MultiplexedStream:
+    """Many commands in flight on one keep-alive stream, matched to replies by "id".
+    
+    Requests carry an "id" the plugin echoes in its reply, so replies may come
+    back in any order. One reader task dispatches them to the waiting commands.
+    If a reply arrives without an id, the peer has stopped echoing them: it is
+    matched to the oldest outstanding request (a plugin that ignores ids answers
+    in order), `ids_missing` tells the owner to stop multiplexing, and the
+    stream closes once drained. When the stream is lost, every outstanding
+    command fails with StreamLostError; the plugin may already have run them.
+    """
+    
+    def __init__(self, pool: UnrealConnectionPool, conn: PooledConnection, framing: str,
+                 max_in_flight: int = UNREAL_MULTIPLEX_MAX_IN_FLIGHT):
+        self.pool = pool
+        self.conn = conn
+        self.framer = JsonMessageFramer(framing)
+        self.pending: Dict[int, Tuple[asyncio.Future, Optional[CommandTimer]]] = {}  # In wire order
+        self.closed = False
+        self.close_reason = ""
+        self.ids_missing = False
+        self.replies = 0
+        self.peak_in_flight = 0
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+        self._write_lock = asyncio.Lock()  # drain() must not be awaited concurrently on Python < 3.10
+        pool.dedicate(conn)
+        self._reader = asyncio.ensure_future(self._read_replies())
+        
+    def usable(self) -> bool:
+        return not self.closed and not self.ids_missing and self.conn.loop is asyncio.get_running_loop()
+    
+    async def request(self, request_id: int, payload: bytes, timeout: float,
+                      timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        """Send one request and wait for the reply carrying its id"""
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                async with self._write_lock:
+                    if self.closed:
+                        raise StreamLostError(f"UE connection lost ({self.close_reason})", written=False)
+                    self.pending[request_id] = (future, timer)
+                    self.peak_in_flight = max(self.peak_in_flight, len(self.pending))
+                    try:
+                        self.conn.writer.write(payload)
+                        await asyncio.wait_for(self.conn.writer.drain(), self.pool.timeout)
+                    except OSError as e:
+                        self.close("write_failed")
+                        raise StreamLostError(f"UE connection lost ({e})") from e
+                if timer:
+                    timer.sent(len(payload))
+                return await asyncio.wait_for(future, timeout)
+            finally:
+                # A reply arriving after a timeout finds no entry and is dropped
+                self.pending.pop(request_id, None)
+                if future.done() and not future.cancelled():
+                    future.exception()  # Failed by close() while this request was still writing
+                
+    def close(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        for future, _ in self.pending.values():
+            if not future.done():
+                future.set_exception(StreamLostError(f"UE connection lost ({reason})"))
+        self.pool.retire_dedicated(self.conn, reason)
+        if self._reader is not asyncio.current_task() and not self._reader.done():
+            try:
+                self._reader.cancel()
+            except RuntimeError:
+                pass  # Its event loop is already closed
+            
+    async def _read_replies(self):
+        reason = "closed_by_peer"
+        try:
+            while not (self.ids_missing and not self.pending):
+                chunk = await self.conn.reader.read(UNREAL_READ_SIZE)
+                if not chunk:
+                    break
+                before = self.framer.pending
+                messages = self.framer.feed(chunk)
+                if messages:
+                    # Byte counts are shared out evenly between replies completed by one read
+                    size = (before + len(chunk) - self.framer.pending) // len(messages)
+                    for message in messages:
+                        self._dispatch(message, size)
+            else:
+                reason = "ids_missing"
+        except asyncio.CancelledError:
+            reason = "cancelled"
+        except OSError:
+            reason = "closed_by_peer"
+        except ValueError as e:
+            reason = f"bad_stream: {e}"
+        finally:
+            self.close(reason)
+            
+    def _dispatch(self, message: Dict[str, Any], size: int):
+        self.replies += 1
+        self.conn.uses += 1
+        self.conn.last_used = time.monotonic()
+        request_id = message.get("id")
+        if request_id is None:
+            if not self.ids_missing:
+                logger.warning("UE reply without a request id - matching replies in order")
+                self.ids_missing = True
+            request_id = next(iter(self.pending), None)
+        entry = self.pending.get(request_id)
+        if entry is None:
+            logger.debug("Dropping late UE reply for request %s", request_id)
+            return
+        future, timer = entry
+        del self.pending[request_id]  # Before the next reply is matched in order
+        if timer:
+            timer.received(size, first=True)
+        if not future.done():
+            future.set_result(message)
+
+class UnrealConnection:
+    """Enhanced connection to Unreal Engine via UnrealMCP plugin.
+    
+    Requests are always plain JSON. If the plugin advertises framed replies in its
+    ping capabilities, each request asks for one with a "framing" field. If it
+    echoes the "id" of the capability ping, commands carry ids and share one
+    MultiplexedStream instead of holding a pooled socket each.
+    """
+    
+    # Preferred reply framing when the plugin offers more than one
+    FRAMING_PREFERENCE = (FRAMING_LENGTH, FRAMING_NDJSON)
+    
+    def __init__(self, pool: Optional[UnrealConnectionPool] = None, negotiate: bool = UNREAL_NEGOTIATE,
+                 scene: Optional[SceneCache] = None, metrics: Optional[PerformanceMetrics] = None,
+                 policy: Optional[TransportPolicy] = None, journal: Optional[SceneJournal] = None):
+        self.pool = pool or UnrealConnectionPool()
+        self.scene = scene or SceneCache()
+        self.metrics = metrics or METRICS
+        self.policy = policy or TransportPolicy()
+        self.journal = journal
+        self.transforms = TransformQueue(self)
+        self.negotiate = negotiate
+        self.capabilities: Optional[Dict[str, Any]] = None  # None until the plugin was asked
+        self.renegotiate_at = 0.0  # Set after a failed negotiation: stock capabilities until then
+        self.framing = FRAMING_RAW
+        self.supports_batch: Optional[bool] = None  # None until advertised or probed
+        self.multiplex = False  # Set by negotiation when the plugin echoes request ids
+        self.encoding = "json"  # Negotiated wire encoding and compression (binary frames need length framing)
+        self.compression = "none"
+        self.columnar = False  # Plugin can send get_all_actors as parallel arrays
+        self._request_ids = itertools.count(1)
+        self._stream: Optional[MultiplexedStream] = None
+        self._stream_opening: Optional[asyncio.Future] = None
+        self._negotiation: Optional[asyncio.Future] = None
+        self._probe: Optional[asyncio.Future] = None
+        
+    async def send_command(self, command_type: str, params: Dict[str, Any],
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send command to UnrealMCP plugin and return response"""
+        if not await self._circuit_allows():
+            self.metrics.count_error(command_type, "circuit_open")
+            return {"status": "error", "error": f"Unreal Engine is not responding - skipped "
+                                                f"(next check in {self.policy.retry_in():.1f}s)"}
+            
+        timeout = timeout or self.policy.timeout_for(command_type, self.pool.timeout)
+        timer = self.metrics.start(command_type)
+        error = None
+        request_id = None
+        try:
+            if self._negotiation_due():
+                await self._negotiate()
+                
+            envelope = {"type": command_type, "params": params}
+            if self.framing != FRAMING_RAW:
+                envelope["framing"] = self.framing
+            if self.multiplex:
+                request_id = envelope["id"] = next(self._request_ids)
+            if self.encoding != "json" or self.compression != "none":
+                # Replies come back the same way; the request itself is a binary frame too
+                envelope.update(encoding=self.encoding, compression=self.compression,
+                                compress_over=UNREAL_COMPRESS_OVER)
+                payload = encode_binary_frame(envelope, self.encoding, self.compression, UNREAL_COMPRESS_OVER)
+            else:
+                payload = json.dumps(envelope).encode('utf-8')
+            sampled = log_request(envelope, payload)
+            
+            attempt = 0
+            resent = False
+            while True:
+                timer.mark()  # Negotiation is timed as its own ping
+                sent_at = time.perf_counter()
+                try:
+                    if request_id is not None:
+                        response = await self._exchange_multiplexed(command_type, request_id, payload,
+                                                                     timeout, timer)
+                    else:
+                        response = await self._exchange(payload, self.framing, timeout, timer)
+                    break
+                except StreamLostError as e:
+                    # Only a command that is safe to run twice is sent again on a fresh socket
+                    if request_id is not None or resent or command_type not in SceneCache.READ_ONLY_COMMANDS:
+                        raise
+                    resent = True
+                    logger.warning(f"UE connection lost during {command_type} - sending it again ({e})")
+                except ConnectionRefusedError:
+                    if attempt >= self.policy.retry_attempts:
+                        raise
+                    delay = self.policy.backoff(attempt)
+                    attempt += 1
+                    logger.warning(f"UE refused the connection - retry {attempt} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    
+            self.policy.record_success(command_type, time.perf_counter() - sent_at)
+            log_reply(command_type, response, timer.bytes_in, sampled)
+            if response.get("status") != "success":
+                error = "error_reply"
+            self.scene.observe(command_type, params, response)
+            
+        except asyncio.TimeoutError as e:
+            error = self.metrics.error_category(e)
+            self.policy.record_failure(command_type, timed_out=True)
+            logger.error(f"UE command failed: {command_type} timed out")
+            response = {"status": "error", "error": f"Timed out after {timeout:.1f}s"}
+        except Exception as e:
+            error = self.metrics.error_category(e)
+            # One dropped multiplexed stream fails every command on it; that is one failure, not many
+            if isinstance(e, OSError) and not (isinstance(e, StreamLostError) and request_id is not None):
+                self.policy.record_failure(command_type, timed_out=False)
+            logger.error(f"UE command failed: {e}")
+            response = {"status": "error", "error": str(e)}
+        finally:
+            self.metrics.finish(timer, error)
+            
+        if self.journal:
+            self.journal.record(command_type, params, response)
+        return response
+    
+    async def _circuit_allows(self) -> bool:
+        """False while the circuit is open; once the cooldown is over, one shared ping decides"""
+        if self.policy.state == "closed":
+            return True
+        if not self.policy.probe_due():
+            self.policy.counters["fast_failures"] += 1
+            return False
+        task = self._probe
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._probe = asyncio.ensure_future(self._send_probe())
+        await asyncio.shield(task)
+        if self.policy.state != "closed":
+            self.policy.counters["fast_failures"] += 1
+            return False
+        return True
+    
+    async def _send_probe(self):
+        self.policy.counters["probes"] += 1
+        ping = json.dumps({"type": "ping", "params": {}}).encode('utf-8')
+        try:
+            response = await self._exchange(ping, FRAMING_RAW, UNREAL_BREAKER_PROBE_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            logger.info(f"UE probe failed: {e or type(e).__name__}")
+            self.policy.probe_failed()
+            return
+        if response.get("status") == "success":
+            self.policy.close()
+            if self.renegotiate_at:
+                self.renegotiate_at = time.monotonic()  # Editor is back - ask for its capabilities again
+        else:
+            self.policy.probe_failed()
+    
+    async def get_actors(self, refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """All actors in the level, from the scene cache when it is fresh.
+        
+        Returns None when the plugin could not provide the list.
+        """
+        if not refresh:
+            actors = self.scene.get()
+            if actors is not None:
+                return actors
+        if self._negotiation_due():
+            await self._negotiate()
+        response = await self.send_command("get_all_actors", {"columnar": True} if self.columnar else {})
+        if response.get("status") != "success":
+            return None
+        return extract_actors(response) or []
+    
+    async def get_actors_page(self, offset: int, limit: int,
+                              refresh: bool = False) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """One page of the level's actors and the total actor count.
+        
+        Plugins advertising the "paging" capability return just the page;
+        otherwise (or while the scene cache is fresh) the full list is sliced here.
+        """
+        if self._negotiation_due():
+            await self._negotiate()
+        if (self.capabilities or {}).get("paging") and (refresh or not self.scene.is_fresh()):
+            params = {"offset": offset, "limit": limit}
+            if self.columnar:
+                params["columnar"] = True
+            response = await self.send_command("get_all_actors", params)
+            actors = extract_actors(response)
+            if response.get("status") == "success" and actors is not None:
+                total = response.get("total")
+                if isinstance(total, int):
+                    return actors, total
+                return actors[offset:offset + limit], len(actors)  # Paging ignored - got everything
+            
+        actors = await self.get_actors(refresh=refresh)
+        if actors is None:
+            return None
+        return actors[offset:offset + limit], len(actors)
+    
+    async def send_batch(self, commands: List[Dict[str, Any]],
+                         concurrency: int = UNREAL_PIPELINE_DEPTH) -> List[Dict[str, Any]]:
+        """Send many {"type", "params"} commands with as few round trips as possible.
+        
+        Commands are packed into "batch" requests of UNREAL_BATCH_SIZE. Plugins
+        without a batch verb get pipelined single commands instead, at most
+        `concurrency` in flight. Returns one reply per command, in order.
+        """
+        replies: List[Dict[str, Any]] = []
+        if self._negotiation_due():
+            await self._negotiate()
+            
+        if self.supports_batch is not False:
+            for start in range(0, len(commands), UNREAL_BATCH_SIZE):
+                chunk = commands[start:start + UNREAL_BATCH_SIZE]
+                chunk_replies = await self._send_batch_request(chunk)
+                if chunk_replies is None:
+                    break  # Plugin has no batch verb
+                replies.extend(chunk_replies)
+                
+        if len(replies) < len(commands):
+            replies.extend(await self._send_pipelined(commands[len(replies):], concurrency))
+        return replies
+    
+    async def spawn_actors_batch(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Spawn many actors and report per-item status like create_game_elements"""
+        results = {"created_elements": [], "errors": []}
+        commands = [{"type": "spawn_actor", "params": spawn_params(spec)} for spec in specs]
+        replies = await self.send_batch(commands)
+        
+        for command, reply in zip(commands, replies):
+            params = command["params"]
+            if reply.get("status") == "success":
+                results["created_elements"].append({
+                    "type": params.get("type"),
+                    "name": params.get("name"),
+                    "result": reply
+                })
+            else:
+                results["errors"].append(f"Failed to spawn {params.get('name')}: {reply.get('error', 'Unknown error')}")
+        return results
+    
+    async def _send_batch_request(self, commands: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """One round trip for many commands - None if the plugin lacks the batch verb"""
+        timeout = self.pool.timeout + UNREAL_BATCH_ITEM_TIMEOUT * len(commands)
+        response = await self.send_command("batch", {"commands": commands}, timeout=timeout)
+        
+        results = response.get("results")
+        if response.get("status") == "success" and isinstance(results, list) and len(results) == len(commands):
+            if self.supports_batch is None:
+                logger.info("UE plugin supports batched commands")
+                self.supports_batch = True
+            return results
+        
+        error = str(response.get("error", ""))
+        if self.supports_batch is None and "unknown command" in error.lower():
+            logger.info("UE plugin has no batch command - pipelining single commands")
+            self.supports_batch = False
+            return None
+        
+        # The batch failed as a whole (timeout, dropped connection...), so every item did
+        return [{"status": "error", "error": error or "Batch request failed"} for _ in commands]
+    
+    async def delete_actors_bulk(self, names: List[str], concurrency: int = UNREAL_PIPELINE_DEPTH,
+                                 progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """Delete many actors in batches, reporting progress after each batch"""
+        results = {"deleted": [], "failed": []}
+        for start in range(0, len(names), UNREAL_BATCH_SIZE):
+            chunk = names[start:start + UNREAL_BATCH_SIZE]
+            replies = await self.send_batch(
+                [{"type": "delete_actor", "params": {"actor_name": name}} for name in chunk], concurrency)
+            
+            for name, reply in zip(chunk, replies):
+                if reply.get("status") == "success":
+                    results["deleted"].append(name)
+                else:
+                    results["failed"].append({"name": name, "error": reply.get("error", "Unknown error")})
+                    
+            done = start + len(chunk)
+            logger.info(f"Deleted {len(results['deleted'])}/{len(names)} actors ({done} processed)")
+            if progress:
+                await progress(done, len(names))
+        return results
+    
+    async def _send_pipelined(self, commands: List[Dict[str, Any]],
+                              concurrency: int = UNREAL_PIPELINE_DEPTH) -> List[Dict[str, Any]]:
+        """Fallback for plugins without batching: keep several single commands in flight"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def send_one(command: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.send_command(command["type"], command.get("params", {}))
+            
+        return await asyncio.gather(*[send_one(command) for command in commands])
+    
+    async def _exchange(self, payload: bytes, framing: str, timeout: Optional[float] = None,
+                        timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        """Send one request on a pooled stream and wait for its reply"""
+        # A reused stream may have been closed by the peer since the health
+        # check, so a request that never went out gets one retry on a fresh
+        # connection. Once written, the plugin may have run it: the caller decides
+        while True:
+            conn, reused = await self.pool.acquire()
+            if timer:
+                timer.mark(None if reused else "connect")
+            framer = JsonMessageFramer(framing)
+            written = False
+            try:
+                conn.writer.write(payload)
+                await asyncio.wait_for(conn.writer.drain(), self.pool.timeout)
+                written = True
+                if timer:
+                    timer.sent(len(payload))
+                response, peer_closed = await self._receive(conn.reader, framer, timeout or self.pool.timeout,
+                                                            timer)
+            except OSError as e:
+                self.pool.discard(conn)
+                if reused and not written:
+                    continue
+                if reused:
+                    raise StreamLostError(f"UE connection lost after the request was sent - "
+                                          f"outcome unknown ({e})") from e
+                raise
+            except asyncio.TimeoutError:
+                self.pool.discard(conn, "timeout")
+                raise
+            except asyncio.CancelledError:
+                self.pool.discard(conn, "cancelled")
+                raise
+            except ValueError:
+                self.pool.discard(conn, "bad_response")
+                raise
+                
+            if response is None and reused:
+                self.pool.peer_closed(conn)
+                continue
+            break
+            
+        if response is None:
+            self.pool.discard(conn, "no_response")
+            return {"status": "error", "error": "No response received"}
+        
+        if reused:
+            self.pool.confirm_keep_alive()
+        self.pool.release(conn, reusable=not peer_closed and not framer.pending)
+        return response
+    
+    async def _exchange_multiplexed(self, command_type: str, request_id: int, payload: bytes, timeout: float,
+                                    timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        """Send one request on the shared multiplexed stream, opening it if needed"""
+        # A stream the peer dropped gets one retry on a fresh one - but only for requests
+        # that never went out or are safe to run twice; a spawn may already have happened
+        for attempt in range(2):
+            stream = self._stream
+            if stream is not None and not stream.usable():
+                self._stream = None
+                if stream.ids_missing or (stream.close_reason == "closed_by_peer" and stream.replies <= 1):
+                    logger.warning(f"UE multiplexing unavailable ({stream.close_reason or 'ids_missing'}) - "
+                                   f"one command per pooled socket from now on")
+                    self.multiplex = False
+                elif not stream.closed:
+                    stream.close("event_loop_changed")
+            if not self.multiplex:
+                # The plugin stopped echoing ids or closes after each reply; the id is ignored
+                return await self._exchange(payload, self.framing, timeout, timer)
+            if self._stream is None:
+                task = self._stream_opening
+                if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+                    task = self._stream_opening = asyncio.ensure_future(self._open_stream())
+                # Shared, so a burst of first commands opens one socket rather than one each
+                await asyncio.shield(task)
+                if timer:
+                    timer.mark("connect")
+            try:
+                return await self._stream.request(request_id, payload, timeout, timer)
+            except StreamLostError as e:
+                if attempt:
+                    raise
+                if e.written and command_type not in SceneCache.READ_ONLY_COMMANDS:
+                    raise StreamLostError(f"UE connection lost after {command_type} was sent - "
+                                          f"outcome unknown ({e})") from e
+                    
+    async def _open_stream(self):
+        conn, _ = await self.pool.acquire()
+        self._stream = MultiplexedStream(self.pool, conn, self.framing)
+        
+    async def _receive(self, reader: asyncio.StreamReader, framer: JsonMessageFramer,
+                       timeout: float, timer: Optional[CommandTimer] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Read one reply within the receive deadline, returning (reply, peer_closed)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                chunk = await asyncio.wait_for(reader.read(UNREAL_READ_SIZE), deadline - loop.time())
+                if timer and chunk:
+                    timer.received(len(chunk), first=not framer.pending)
+                if not chunk:
+                    return framer.finish(), True
+                messages = framer.feed(chunk)
+                if messages:
+                    return messages[0], False
+                    
+        except asyncio.TimeoutError:
+            if not framer.pending:
+                raise
+            logger.warning("Receive deadline reached, using available data")
+            return framer.finish(), True
+    
+    def _negotiation_due(self) -> bool:
+        """True before the first negotiation, and once a failed one may be retried"""
+        if not self.negotiate:
+            return False
+        return self.capabilities is None or 0 < self.renegotiate_at <= time.monotonic()
+    
+    async def _negotiate(self):
+        """Ask the plugin once which optional protocol extensions it supports"""
+        task = self._negotiation
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._negotiation = asyncio.ensure_future(self._request_capabilities())
+        # Shielded so one cancelled caller does not abort the shared handshake
+        await asyncio.shield(task)
+        
+    async def _request_capabilities(self):
+        ping_id = next(self._request_ids)
+        ping = json.dumps({"type": "ping", "id": ping_id, "params": {
+            "client_capabilities": {"framing": list(self.FRAMING_PREFERENCE), "multiplex": UNREAL_MULTIPLEX,
+                                    "encoding": available_encodings(), "compression": available_compressions(),
+                                    "columnar": UNREAL_COLUMNAR_ACTORS}
+        }})
+        if not await self._circuit_allows():
+            self._negotiation_failed("circuit open")
+            return
+        timer = self.metrics.start("ping")
+        attempt = 0
+        try:
+            while True:
+                sent_at = time.perf_counter()
+                try:
+                    response = await self._exchange(ping.encode('utf-8'), FRAMING_RAW, timer=timer)
+                    break
+                except ConnectionRefusedError:
+                    if attempt >= self.policy.retry_attempts:
+                        raise
+                    delay = self.policy.backoff(attempt)
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            self.metrics.finish(timer, self.metrics.error_category(e))
+            if not isinstance(e, ValueError):
+                self.policy.record_failure("ping", timed_out=isinstance(e, asyncio.TimeoutError))
+            self._negotiation_failed(e or type(e).__name__)
+            return
+        self.metrics.finish(timer)
+        self.policy.record_success("ping", time.perf_counter() - sent_at)
+        self.renegotiate_at = 0.0
+        
+        # Stock UnrealMCP answers a plain pong - that simply means no extensions
+        result = response.get("result")
+        capabilities = result.get("capabilities") if isinstance(result, dict) else None
+        self.capabilities = capabilities if isinstance(capabilities, dict) else {}
+        if "batch" in self.capabilities:
+            self.supports_batch = bool(self.capabilities["batch"])
+        offered = self.capabilities.get("framing") or []
+        self.framing = next((mode for mode in self.FRAMING_PREFERENCE if mode in offered), FRAMING_RAW)
+        # Stock UnrealMCP ignores the id; only a peer that echoes it can answer out of order
+        self.multiplex = UNREAL_MULTIPLEX and response.get("id") == ping_id
+        if self.framing == FRAMING_LENGTH:
+            # Binary frames are only unambiguous inside length-prefixed replies
+            offered = self.capabilities.get("encoding") or []
+            self.encoding = next((name for name in available_encodings() if name in offered), "json")
+            offered = self.capabilities.get("compression") or []
+            self.compression = next((name for name in available_compressions() if name in offered), "none")
+        self.columnar = UNREAL_COLUMNAR_ACTORS and bool(self.capabilities.get("columnar"))
+        logger.info(f"UE capabilities: {self.capabilities or 'none'} (reply framing: {self.framing}, "
+                    f"multiplexed: {self.multiplex}, encoding: {self.encoding}/{self.compression}, "
+                    f"columnar actors: {self.columnar})")
+        
+    def _negotiation_failed(self, reason: Any):
+        """Carry on with stock capabilities and ask again after UNREAL_NEGOTIATE_RETRY"""
+        logger.warning(f"Capability negotiation failed: {reason} - using stock protocol, "
+                       f"retrying in {UNREAL_NEGOTIATE_RETRY:.0f}s")
+        if self.capabilities is None:
+            self.capabilities = {}
+        self.renegotiate_at = time.monotonic() + UNREAL_NEGOTIATE_RETRY
+
+def spawn_params(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize an actor spec into spawn_actor params (accepts "class" for "type")"""
+    params = {key: value for key, value in spec.items() if key != "class"}
+    params["type"] = spec.get("type") or spec.get("class") or "StaticMeshActor"
+    params.setdefault("location", [0, 0, 0])
+    for key, axes in (("location", "xyz"), ("scale", "xyz"), ("rotation", ("pitch", "yaw", "roll"))):
+        value = params.get(key)
+        if isinstance(value, dict):
+            params[key] = [value.get(axis, 0) for axis in axes]
+    return params
+
+# Shared client used by every MCP tool so pooled sockets are reused across calls
+_shared_connection: Optional[UnrealConnection] = None
+
+def get_unreal_connection() -> UnrealConnection:
+    """Return the process-wide UnrealConnection"""
+    global _shared_connection
+    if _shared_connection is None:
+        journal = SceneJournal(SCENE_JOURNAL_PATH) if SCENE_JOURNAL_PATH else None
+        _shared_connection = UnrealConnection(journal=journal)
+    return _shared_connection
+
+@dataclass
+class SceneDiff:
+    """Commands that turn the current level into a desired one"""
+    spawns: List[Dict[str, Any]]  # spawn_actor params
+    moves: List[Tuple[str, List[float]]]
+    deletes: List[str]
+    unchanged: int = 0
+    transforms: List[Dict[str, Any]] = field(default_factory=list)  # set_actor_transform params (rotated or scaled)
+    
+    def __len__(self) -> int:
+        return len(self.spawns) + len(self.moves) + len(self.transforms) + len(self.deletes)
+    
+    def commands(self) -> List[Dict[str, Any]]:
+        """Deletes first (a respawn reuses the name), then spawns, then moves and transforms"""
+        return ([{"type": "delete_actor", "params": {"actor_name": name}} for name in self.deletes] +
+                [{"type": "spawn_actor", "params": spec} for spec in self.spawns] +
+                [{"type": "set_actor_location", "params": {"actor_name": name, "location": location}}
+                 for name, location in self.moves] +
+                [{"type": "set_actor_transform", "params": params} for params in self.transforms])
+
+def diff_scene(desired: Dict[str, Dict[str, Any]], current: List[Dict[str, Any]],
+               absent: Any = (), delete_extra: bool = False,
+               tolerance: float = SCENE_DIFF_TOLERANCE) -> SceneDiff:
+    """Compare desired actors (spawn specs by name) with a get_all_actors list.
+    
+    Missing actors are spawned, misplaced ones moved and ones whose class changed
+    respawned. A desired rotation or scale the live actor does not have (actors
+    that report none count as unrotated and unscaled) sends the whole transform
+    instead of a move. Names in `absent` are deleted if present; with
+    delete_extra every actor not in `desired` is, except PROTECTED_ACTOR_CLASSES.
+    """
+    live = {actor.get("name"): actor for actor in current if actor.get("name")}
+    diff = SceneDiff(spawns=[], moves=[], deletes=[])
+    for name, spec in desired.items():
+        actor = live.get(name)
+        wanted_class = spec.get("type") or spec.get("class")
+        if actor is None:
+            if wanted_class:  # Specs without a class only describe moves
+                diff.spawns.append(spawn_params(spec))
+            continue
+        if wanted_class and actor.get("class") and actor["class"] != wanted_class:
+            diff.deletes.append(name)
+            diff.spawns.append(spawn_params(spec))
+            continue
+        moved = False
+        if "location" in spec:
+            want = location_dict(spec["location"])
+            have = location_dict(actor.get("location"))
+            moved = any(abs(want[axis] - have[axis]) > tolerance for axis in "xyz")
+        turned = "rotation" in spec and any(
+            abs((want - have + 180.0) % 360.0 - 180.0) > SCENE_ROTATION_TOLERANCE  # 270 and -90 are the same yaw
+            for want, have in zip(vector3(spec["rotation"], ROTATION_KEYS, 0.0),
+                                  vector3(actor.get("rotation"), ROTATION_KEYS, 0.0)))
+        resized = "scale" in spec and any(
+            abs(want - have) > SCENE_SCALE_TOLERANCE
+            for want, have in zip(vector3(spec["scale"], SCALE_KEYS, 1.0), vector3(actor.get("scale"), SCALE_KEYS, 1.0)))
+        if turned or resized:
+            params = {"actor_name": name}
+            if "location" in spec:
+                params["location"] = [location_dict(spec["location"])[axis] for axis in "xyz"]
+            if "rotation" in spec:
+                params["rotation"] = vector3(spec["rotation"], ROTATION_KEYS, 0.0)
+            if "scale" in spec:
+                params["scale"] = vector3(spec["scale"], SCALE_KEYS, 1.0)
+            diff.transforms.append(params)
+        elif moved:
+            diff.moves.append((name, [want[axis] for axis in "xyz"]))
+        else:
+            diff.unchanged += 1
+        
+    doomed = set(live) - set(desired) if delete_extra else set(absent) & set(live) - set(desired)
+    diff.deletes.extend(sorted(name for name in doomed
+                               if live[name].get("class") not in PROTECTED_ACTOR_CLASSES))
+    return diff
+
+async def apply_scene_diff(ue_conn: UnrealConnection, diff: SceneDiff) -> Dict[str, Any]:
+    """Send a SceneDiff with batched (or pipelined) commands; returns counts and failures"""
+    commands = diff.commands()
+    replies = await ue_conn.send_batch(commands) if commands else []
+    results = {"deleted": 0, "spawned": 0, "moved": 0, "failed": []}
+    counted = {"delete_actor": "deleted", "spawn_actor": "spawned", "set_actor_location": "moved",
+               "set_actor_transform": "moved"}
+    for command, reply in zip(commands, replies):
+        params = command["params"]
+        if reply.get("status") == "success":
+            results[counted[command["type"]]] += 1
+        else:
+            results["failed"].append({"name": params.get("name") or params.get("actor_name"),
+                                      "command": command["type"], "error": reply.get("error", "Unknown error")})
+    return results
+
+async def replay_journal_file(ue_conn: UnrealConnection, path: str, dry_run: bool = False) -> Dict[str, Any]:
+    """Bring the live level back to the state a journal describes.
+    
+    The journal is folded to its net effect and diffed against a fresh actor
+    list, so only actors that are missing, misplaced or should be gone are sent.
+    Commands the fold cannot mirror are then replayed in journal order.
+    """
+    entries = SceneJournal.read(path)
+    desired, deleted, other = SceneJournal.fold(entries)
+    current = await ue_conn.get_actors(refresh=True)
+    if current is None:
+        raise ConnectionError("Could not read the current actor list from Unreal Engine")
+    diff = diff_scene(desired, current, absent=deleted)
+    report = {"entries": len(entries), "actors": len(desired), "diff": diff,
+              "other": len(other), "dry_run": dry_run}
+    if dry_run:
+        return report
+    
+    report.update(await apply_scene_diff(ue_conn, diff))
+    if other:
+        # Unknown commands may depend on each other, so keep one in flight
+        replies = await ue_conn.send_batch(other, concurrency=1)
+        report["failed"].extend({"name": command["params"].get("actor_name", ""), "command": command["type"],
+                                 "error": reply.get("error", "Unknown error")}
+                                for command, reply in zip(other, replies) if reply.get("status") != "success")
+    return report
+
+# Layout options a scene spec entry may pass to the generators, besides name/shape/count
+SCENE_LAYOUT_OPTIONS = {"radius", "spacing", "columns", "center", "start_angle", "face_center", "turns", "rise",
+                        "min_distance", "seed", "attempts", "points", "closed"}
+# Entry keys copied into spawn_actor params
+SCENE_SPAWN_KEYS = {"type", "location", "rotation", "scale", "intensity", "color"}
+
+def load_scene_spec(spec: str) -> Dict[str, Any]:
+    """Parse a scene document given as a file path or inline JSON/YAML/TOML text"""
+    text, kind = spec, ""
+    if "\n" not in spec and not spec.lstrip().startswith(("{", "[")) and os.path.isfile(spec):
+        with open(spec, encoding="utf-8") as handle:
+            text = handle.read()
+        kind = os.path.splitext(spec)[1].lower()
+    elif spec.strip().lower().endswith((".json", ".yaml", ".yml", ".toml")):
+        raise ValueError(f"Scene spec file not found: {spec.strip()}")
+        
+    if kind in (".yaml", ".yml") or (not kind and not text.lstrip().startswith("{") and yaml is not None):
+        if yaml is None:
+            raise ValueError("YAML scene specs need PyYAML (pip install pyyaml)")
+        document = yaml.safe_load(text)
+    elif kind == ".toml":
+        if tomllib is None:
+            raise ValueError("TOML scene specs need Python 3.11+ or tomli (pip install tomli)")
+        document = tomllib.loads(text)
+    else:
+        try:
+            document = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Scene spec is neither a file nor valid JSON: {e}") from None
+    if not isinstance(document, dict):
+        raise ValueError("A scene spec must be a mapping with actors, layouts and/or lights")
+    return document
+
+def scene_color(value: Any) -> List[float]:
+    if isinstance(value, str):
+        if value.lower() not in NAMED_COLORS:
+            raise ValueError(f"Unknown color '{value}' (use {', '.join(NAMED_COLORS)} or [r, g, b])")
+        return NAMED_COLORS[value.lower()]
+    return [float(channel) for channel in value]
+
+def expand_scene(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """spawn_actor params for every actor a scene spec describes, keyed by name.
+    
+    "actors" and "lights" entries are single actors; "layouts" entries expand to
+    <name>_<i> through the layout generators. Names are stable, so the same spec
+    always describes the same actors.
+    """
+    actors: Dict[str, Dict[str, Any]] = {}
+    
+    def add(params: Dict[str, Any]):
+        if params["name"] in actors:
+            raise ValueError(f"Duplicate actor name in scene spec: {params['name']}")
+        actors[params["name"]] = spawn_params(params)
+        
+    def base(entry: Dict[str, Any], default_type: str) -> Dict[str, Any]:
+        if not entry.get("name"):
+            raise ValueError(f"Scene spec entry without a name: {entry}")
+        params = {key: entry[key] for key in SCENE_SPAWN_KEYS if key in entry}
+        params.update(entry.get("params") or {})  # Any other spawn_actor params, passed through
+        params.setdefault("type", default_type)
+        if "color" in params:
+            params["color"] = scene_color(params["color"])
+        return params
+    
+    for section, default_type in (("actors", "StaticMeshActor"), ("lights", "PointLight")):
+        for entry in document.get(section) or []:
+            add(dict(base(entry, default_type), name=str(entry["name"])))
+            
+    for entry in document.get("layouts") or []:
+        params = base(entry, "StaticMeshActor")
+        shape, count = entry.get("shape", "grid"), int(entry.get("count", 0))
+        options = {key: entry[key] for key in SCENE_LAYOUT_OPTIONS if key in entry}
+        if shape == "spline":
+            layout = spline_layout(count, options.pop("points", []), bool(options.pop("closed", False)))
+        else:
+            if shape == "scatter":
+                # A fixed seed per entry keeps scatter positions identical between applies
+                options.setdefault("seed", zlib.crc32(str(entry["name"]).encode("utf-8")))
+            try:
+                layout = build_layout(shape, count, **options)
+            except TypeError as e:
+                raise ValueError(f"Layout '{entry['name']}': {e}") from None
+        colors = entry.get("colors")
+        palette = RAINBOW_PALETTE if colors == "rainbow" else [scene_color(color) for color in colors or []]
+        for i, transform in enumerate(layout.transforms()):
+            item = dict(params, **transform, name=f"{entry['name']}_{i}")
+            if "scale" in params:
+                item["scale"] = params["scale"]  # The entry's scale wins over the generator's
+            if palette:
+                item["color"] = palette[i % len(palette)]
+            add(item)
+            
+    if len(actors) > SCENE_MAX_ACTORS:
+        raise ValueError(f"Scene spec describes {len(actors)} actors (limit {SCENE_MAX_ACTORS})")
+    return actors
+
+def scene_hashes(params: Dict[str, Any]) -> List[str]:
+    """[hash of everything, hash of everything but the location] for one actor's spawn params"""
+    body = {key: value for key, value in params.items() if key != "location"}
+    return [hashlib.sha1(json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+            for value in (params, body)]
+
+def scene_state_path(scene: str) -> str:
+    return os.path.join(SCENE_STATE_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", scene) + ".json")
+
+# States that could not be written to SCENE_STATE_DIR, so later applies in this process still see them
+_unsaved_scene_states: Dict[str, Dict[str, List[str]]] = {}
+
+def load_scene_state(scene: str) -> Dict[str, List[str]]:
+    """Hashes recorded by the last apply_scene of this scene, by actor name"""
+    if scene in _unsaved_scene_states:
+        return _unsaved_scene_states[scene]
+    try:
+        with open(scene_state_path(scene), encoding="utf-8") as handle:
+            return json.load(handle).get("actors", {})
+    except (OSError, ValueError):
+        return {}
+    
+def save_scene_state(scene: str, actors: Dict[str, List[str]]):
+    """Record the applied hashes; if that fails they are kept in memory and OSError is raised"""
+    try:
+        os.makedirs(SCENE_STATE_DIR, exist_ok=True)
+        path = scene_state_path(scene)
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump({"scene": scene, "actors": actors}, handle, separators=(",", ":"))
+        os.replace(path + ".tmp", path)  # Never leave a half-written state behind
+    except OSError:
+        _unsaved_scene_states[scene] = actors
+        raise
+    _unsaved_scene_states.pop(scene, None)
+
+async def apply_scene_spec(ue_conn: UnrealConnection, document: Dict[str, Any], dry_run: bool = False,
+                           refresh: bool = False) -> Dict[str, Any]:
+    """Bring the level in line with a scene spec, sending only what changed.
+    
+    Each actor's spawn params are hashed and compared with the hashes stored by the
+    previous apply of the same scene. Unchanged actors that are present and in
+    place cost nothing; a new location is a move; any other change respawns the
+    actor; actors dropped from the spec are deleted. Actors the scene never
+    created are left alone. The spec's "scene" name keys that stored state, so
+    it is required.
+    """
+    scene = str(document.get("scene") or "").strip()
+    if not scene:
+        # A shared default would let one unnamed spec delete another's actors
+        raise ValueError('A scene spec needs a "scene" name, e.g. {"scene": "plaza", ...}')
+    actors = expand_scene(document)
+    hashes = {name: scene_hashes(params) for name, params in actors.items()}
+    previous = load_scene_state(scene)
+    current = await ue_conn.get_actors(refresh=refresh)
+    if current is None:
+        raise ConnectionError("Could not read the current actor list from Unreal Engine")
+    
+    removed = set(previous) - set(actors)
+    diff = diff_scene(actors, current, absent=removed)
+    live = {actor.get("name") for actor in current}
+    queued = set(diff.deletes)
+    moved = {name for name, _ in diff.moves} | {params["actor_name"] for params in diff.transforms}
+    for name, (_, body) in hashes.items():
+        # Scale, color and other params have no set command, so those changes respawn
+        if name in live and name not in queued and name in previous and previous[name][1] != body:
+            diff.deletes.append(name)
+            diff.spawns.append(actors[name])
+            moved.discard(name)
+    diff.moves = [(name, location) for name, location in diff.moves if name in moved]
+    diff.transforms = [params for params in diff.transforms if params["actor_name"] in moved]
+    diff.unchanged = len(actors) - len({spec["name"] for spec in diff.spawns} | moved)
+    
+    report = {"scene": scene, "actors": len(actors), "removed": len(removed & live), "diff": diff,
+              "dry_run": dry_run}
+    if dry_run:
+        return report
+    
+    report.update(await apply_scene_diff(ue_conn, diff))
+    failed = {failure["name"] for failure in report["failed"]}
+    state = {name: hashes[name] for name in actors if name not in failed}
+    state.update({name: previous[name] for name in removed & failed})  # Retry failed deletes next time
+    try:
+        save_scene_state(scene, state)
+    except OSError as e:
+        # The level has changed either way; report what was applied
+        logger.warning(f"Could not save state of scene '{scene}': {e}")
+        report["state_error"] = str(e)
+    return report
+
+
+class Layout:
+    """Transforms from a layout generator, one row per item.
+    
+    Rows are NumPy arrays when NumPy is installed and lists of [x, y, z]
+    otherwise. rotations (pitch, yaw, roll in degrees) and scales are None
+    when every item keeps the default.
+    """
+    
+    def __init__(self, locations: Any, rotations: Any = None, scales: Any = None):
+        self.locations = locations
+        self.rotations = rotations
+        self.scales = scales
+        
+    def __len__(self) -> int:
+        return len(self.locations)
+    
+    def transforms(self, precision: int = 3) -> List[Dict[str, List[float]]]:
+        """Per-item location/rotation/scale lists ready for spawn_actor params"""
+        columns = {"location": self.locations, "rotation": self.rotations, "scale": self.scales}
+        rows = {}
+        for key, values in columns.items():
+            if values is None:
+                continue
+            if np is not None:
+                rows[key] = np.round(np.asarray(values, dtype=float), precision).tolist()
+            else:
+                rows[key] = [[round(value, precision) for value in row] for row in values]
+        return [dict(zip(rows, values)) for values in zip(*rows.values())]
+
+def _rows(xs: Any, ys: Any, zs: Any) -> Any:
+    if np is not None:
+        return np.column_stack((xs, ys, zs))
+    return [[x, y, z] for x, y, z in zip(xs, ys, zs)]
+
+def _yaw_rows(yaws: Any) -> Any:
+    if np is not None:
+        zeros = np.zeros(len(yaws))
+        return np.column_stack((zeros, yaws, zeros))
+    return [[0.0, yaw, 0.0] for yaw in yaws]
+
+def _polar_layout(angles: Any, radii: Any, heights: Any, center: Point, yaw_offset: float) -> Layout:
+    cx, cy, _ = center
+    if np is not None:
+        xs = cx + radii * np.cos(angles)
+        ys = cy + radii * np.sin(angles)
+        return Layout(_rows(xs, ys, heights), _yaw_rows(np.degrees(angles) + yaw_offset))
+    xs = [cx + r * math.cos(a) for a, r in zip(angles, radii)]
+    ys = [cy + r * math.sin(a) for a, r in zip(angles, radii)]
+    return Layout(_rows(xs, ys, heights), _yaw_rows([math.degrees(a) + yaw_offset for a in angles]))
+
+def ring_layout(count: int, radius: float = 500.0, center: Point = (0.0, 0.0, 0.0),
+                start_angle: float = 0.0, face_center: bool = False) -> Layout:
+    """count items evenly around a horizontal circle, yawed outward (or inward)"""
+    yaw_offset = 180.0 if face_center else 0.0
+    start = math.radians(start_angle)
+    if np is not None:
+        angles = start + np.arange(count) * (2 * math.pi / max(count, 1))
+        return _polar_layout(angles, np.full(count, float(radius)), np.full(count, float(center[2])),
+                             center, yaw_offset)
+    step = 2 * math.pi / max(count, 1)
+    angles = [start + i * step for i in range(count)]
+    return _polar_layout(angles, [radius] * count, [center[2]] * count, center, yaw_offset)
+
+def spiral_layout(count: int, radius: float = 500.0, turns: float = 3.0, rise: float = 0.0,
+                  center: Point = (0.0, 0.0, 0.0)) -> Layout:
+    """Archimedean spiral from center out to radius; rise > 0 lifts each item into a helix"""
+    last = max(count - 1, 1)
+    if np is not None:
+        fractions = np.arange(count) / last
+        return _polar_layout(2 * math.pi * turns * fractions, radius * fractions,
+                             center[2] + rise * np.arange(count), center, 0.0)
+    fractions = [i / last for i in range(count)]
+    return _polar_layout([2 * math.pi * turns * f for f in fractions], [radius * f for f in fractions],
+                         [center[2] + rise * i for i in range(count)], center, 0.0)
+
+def grid_layout(count: int, spacing: float = 200.0, columns: Optional[int] = None,
+                center: Point = (0.0, 0.0, 0.0)) -> Layout:
+    """Row-major grid in the XY plane centred on center; columns=count gives a single row"""
+    columns = max(1, min(columns or math.ceil(math.sqrt(count)), max(count, 1)))
+    rows = max(1, math.ceil(count / columns))
+    cx, cy, cz = center
+    x0 = cx - (columns - 1) * spacing / 2
+    y0 = cy - (rows - 1) * spacing / 2
+    if np is not None:
+        index = np.arange(count)
+        return Layout(_rows(x0 + (index % columns) * spacing, y0 + (index // columns) * spacing,
+                            np.full(count, float(cz))))
+    return Layout([[x0 + (i % columns) * spacing, y0 + (i // columns) * spacing, cz] for i in range(count)])
+
+def stack_layout(count: int, spacing: float = 100.0, center: Point = (0.0, 0.0, 0.0)) -> Layout:
+    """Vertical column of count items starting at center"""
+    cx, cy, cz = center
+    if np is not None:
+        return Layout(_rows(np.full(count, float(cx)), np.full(count, float(cy)), cz + np.arange(count) * spacing))
+    return Layout([[cx, cy, cz + i * spacing] for i in range(count)])
+
+# Grid cells within two steps of a scatter cell, nearest first and without the
+# corners, which are always further than min_distance away
+_SCATTER_NEIGHBOURS = sorted(((di, dj) for di in range(-2, 3) for dj in range(-2, 3)
+                              if abs(di) + abs(dj) < 4), key=lambda d: d[0] ** 2 + d[1] ** 2)
+
+def scatter_layout(count: int, radius: float = 1000.0, min_distance: float = 150.0,
+                   center: Point = (0.0, 0.0, 0.0), seed: Optional[int] = None,
+                   attempts: int = 12) -> Layout:
+    """Poisson-disk scatter (Bridson) inside a horizontal disc.
+    
+    Items are never closer than min_distance, so a small disc can hold fewer
+    than count items.
+    """
+    rng = random.Random(seed)
+    cx, cy, cz = center
+    cell = min_distance / math.sqrt(2)
+    limit = min_distance * min_distance
+    bound = radius * radius
+    grid: Dict[Tuple[int, int], Tuple[float, float]] = {}
+    points: List[Tuple[float, float]] = []
+    active: List[Tuple[float, float]] = []
+    
+    def fits(x: float, y: float) -> bool:
+        if (x - cx) ** 2 + (y - cy) ** 2 > bound:
+            return False
+        i, j = math.floor(x / cell), math.floor(y / cell)
+        for di, dj in _SCATTER_NEIGHBOURS:
+            other = grid.get((i + di, j + dj))
+            if other and (other[0] - x) ** 2 + (other[1] - y) ** 2 < limit:
+                return False
+        return True
+    
+    def accept(x: float, y: float):
+        grid[(math.floor(x / cell), math.floor(y / cell))] = (x, y)
+        points.append((x, y))
+        active.append((x, y))
+        
+    if count > 0:
+        accept(cx, cy)
+    two_pi = 2 * math.pi
+    reach = min_distance * 1.0001
+    while active and len(points) < count:
+        slot = rng.randrange(len(active))
+        ax, ay = active[slot]
+        # Evenly spaced candidates just outside min_distance (Roberts' variant of
+        # Bridson) pack as tightly as random ones with far fewer attempts
+        start = two_pi * rng.random()
+        for attempt in range(attempts):
+            angle = start + two_pi * attempt / attempts
+            x, y = ax + reach * math.cos(angle), ay + reach * math.sin(angle)
+            if fits(x, y):
+                accept(x, y)
+                break
+        else:
+            # Nothing fits around this point any more
+            active[slot] = active[-1]
+            active.pop()
+    locations = [[x, y, cz] for x, y in points]
+    return Layout(np.array(locations, dtype=float).reshape(-1, 3) if np is not None else locations)
+
+def spline_layout(count: int, points: List[Any], closed: bool = False) -> Layout:
+    """count items along a Catmull-Rom spline through points, yawed along the curve"""
+    control = [as_point(point) for point in points]
+    if len(control) < 2:
+        raise ValueError("spline_layout needs at least two points")
+    size = len(control)
+    segments = size if closed else size - 1
+    
+    if np is not None:
+        ctrl = np.asarray(control, dtype=float)
+        u = np.linspace(0.0, segments, count, endpoint=not closed)
+        seg = np.minimum(np.floor(u).astype(int), segments - 1)
+        t = (u - seg)[:, None]
+        offsets = seg[:, None] + np.arange(-1, 3)
+        offsets = offsets % size if closed else np.clip(offsets, 0, size - 1)
+        p0, p1, p2, p3 = (ctrl[offsets[:, k]] for k in range(4))
+        a, b, c = -p0 + p2, 2 * p0 - 5 * p1 + 4 * p2 - p3, -p0 + 3 * p1 - 3 * p2 + p3
+        locations = 0.5 * (2 * p1 + a * t + b * t ** 2 + c * t ** 3)
+        tangents = 0.5 * (a + 2 * b * t + 3 * c * t ** 2)
+        return Layout(locations, _yaw_rows(np.degrees(np.arctan2(tangents[:, 1], tangents[:, 0]))))
+    
+    def ctrl_at(index: int) -> Point:
+        return control[index % size] if closed else control[min(max(index, 0), size - 1)]
+    
+    locations, yaws = [], []
+    span = segments / count if closed else segments / max(count - 1, 1)
+    for i in range(count):
+        u = i * span
+        seg = min(int(u), segments - 1)
+        t = u - seg
+        p0, p1, p2, p3 = (ctrl_at(seg + k) for k in range(-1, 3))
+        a = [-q0 + q2 for q0, q2 in zip(p0, p2)]
+        b = [2 * q0 - 5 * q1 + 4 * q2 - q3 for q0, q1, q2, q3 in zip(p0, p1, p2, p3)]
+        c = [-q0 + 3 * q1 - 3 * q2 + q3 for q0, q1, q2, q3 in zip(p0, p1, p2, p3)]
+        locations.append([0.5 * (2 * q1 + ai * t + bi * t * t + ci * t ** 3) for q1, ai, bi, ci in zip(p1, a, b, c)])
+        tangent = [0.5 * (ai + 2 * bi * t + 3 * ci * t * t) for ai, bi, ci in zip(a, b, c)]
+        yaws.append(math.degrees(math.atan2(tangent[1], tangent[0])))
+    return Layout(locations, _yaw_rows(yaws))
+
+# Shape words the parser understands, mapped to (generator, fixed keyword arguments)
+LAYOUT_GENERATORS: Dict[str, Tuple[Callable[..., Layout], Dict[str, Any]]] = {
+    "ring": (ring_layout, {}),
+    "circle": (ring_layout, {}),
+    "grid": (grid_layout, {}),
+    "row": (grid_layout, {"columns": None}),
+    "line": (grid_layout, {"columns": None}),
+    "spiral": (spiral_layout, {}),
+    "helix": (spiral_layout, {"rise": 50.0}),
+    "stack": (stack_layout, {}),
+    "tower": (stack_layout, {}),
+    "column": (stack_layout, {}),
+    "scatter": (scatter_layout, {}),
+}
+
+def build_layout(shape: str, count: int, **options) -> Layout:
+    """Run the generator registered for shape ("circle", "row", "tower", ...)"""
+    if shape not in LAYOUT_GENERATORS:
+        raise ValueError(f"Unknown layout shape: {shape}")
+    generator, fixed = LAYOUT_GENERATORS[shape]
+    kwargs = dict(fixed, **options)
+    if "columns" in fixed and kwargs["columns"] is None:
+        kwargs["columns"] = count
+    return generator(count, **kwargs)
+
+class KeywordMatcher:
+    """Finds every keyword of a {group: {feature: [phrases]}} table in one pass.
+    
+    The description is tokenized once and each word (and the few multi-word
+    phrases starting at it) is looked up in a dict, so only whole words match
+    (with an optional plural "s"): "craft" no longer fires inside "aircraft"
+    nor "ui" inside "build".
+    """
+    
+    TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+    
+    def __init__(self, table: Dict[str, Dict[str, List[str]]]):
+        self.table = table
+        owners: Dict[str, set] = {}
+        for group, features in table.items():
+            for feature, phrases in features.items():
+                for phrase in phrases:
+                    owners.setdefault(" ".join(phrase.lower().split()), set()).add(f"{group}:{feature}")
+        self.phrase_features: Dict[str, frozenset] = {phrase: frozenset(found) for phrase, found in owners.items()}
+        # First word of each multi-word phrase -> longest phrase length starting with it
+        self.phrase_starts: Dict[str, int] = {}
+        for phrase in self.phrase_features:
+            words = phrase.split()
+            if len(words) > 1:
+                self.phrase_starts[words[0]] = max(self.phrase_starts.get(words[0], 0), len(words))
+                
+    def features(self, text: str) -> frozenset:
+        """Every "group:feature" whose phrases occur in text"""
+        words = self.TOKEN.findall(text.lower())
+        lookup = self.phrase_features
+        found = set()
+        for i, word in enumerate(words):
+            hit = lookup.get(word) or (word[-1] == "s" and lookup.get(word[:-1]))
+            if hit:
+                found.update(hit)
+            longest = self.phrase_starts.get(word)
+            for size in range(2, (longest or 0) + 1):
+                phrase = " ".join(words[i:i + size])
+                hit = lookup.get(phrase) or (phrase[-1] == "s" and lookup.get(phrase[:-1]))
+                if hit:
+                    found.update(hit)
+        return frozenset(found)
+    
+    def first(self, features: frozenset, group: str, default: str) -> str:
+        """First feature of group (in table order) present in features"""
+        for feature in self.table[group]:
+            if f"{group}:{feature}" in features:
+                return feature
+        return default
+
+# Everything parse_game_description looks for, grouped by the question it answers.
+# Inflections other than a plural "s" are listed explicitly.
+DESCRIPTION_KEYWORDS: Dict[str, Dict[str, List[str]]] = {
+    "genre": {
+        'fps': ['first person', 'fps', 'shooting', 'shooter', 'gun', 'weapon'],
+        'platformer': ['platform', 'platformer', 'platforming', 'jump', 'jumping', 'side scroll',
+                       'side scrolling', 'side scroller'],
+        'rpg': ['rpg', 'role playing', 'role-playing', 'quest', 'inventory', 'stats'],
+        'survival': ['survival', 'craft', 'crafting', 'resource', 'hunger', 'health'],
+        'puzzle': ['puzzle', 'solve', 'solving', 'logic', 'brain'],
+        'racing': ['race', 'racing', 'racer', 'car', 'speed', 'track'],
+        'vr': ['vr', 'virtual reality', 'immersive'],
+        'multiplayer': ['multiplayer', 'online', 'coop', 'co-op', 'pvp']
+    },
+    "action": {
+        'create': ['create', 'build', 'make', 'place', 'add', 'spawn', 'generate']
+    },
+    "section": {
+        'level': ['level', 'world', 'environment', 'map', 'scene', 'castle', 'building', 'location', 'area'],
+        'character': ['player', 'character', 'avatar', 'controller'],
+        'vr': ['vr', 'virtual reality', 'headset', 'hand tracking'],
+        'ui': ['ui', 'menu', 'hud', 'interface']
+    },
+    "environment": {
+        'medieval': ['castle', 'medieval', 'knight', 'sword', 'dungeon'],
+        'modern': ['city', 'cities', 'urban', 'building', 'street', 'office'],
+        'sci_fi': ['space', 'futuristic', 'alien', 'robot', 'laser'],
+        'nature': ['forest', 'mountain', 'river', 'tree', 'outdoor'],
+        'underwater': ['ocean', 'underwater', 'sea', 'coral', 'fish']
+    },
+    "scale": {
+        'large': ['large', 'huge', 'massive', 'open world'],
+        'small': ['small', 'tiny', 'compact']
+    },
+    "movement": {
+        'teleport': ['teleport', 'teleporting', 'teleportation', 'vr'],
+        'flying': ['fly', 'flying', 'flight']
+    },
+    "ability": {
+        'jump': ['jump', 'jumping'],
+        'combat': ['shoot', 'shooting', 'gun', 'weapon'],
+        'interaction': ['interact', 'interaction', 'interactive', 'grab', 'grabbing', 'pick up']
+    },
+    "mechanic": {
+        'combat': ['fight', 'fighting', 'combat', 'weapon', 'enemy', 'enemies'],
+        'inventory': ['inventory', 'item', 'collect', 'collecting', 'collectible', 'pickup'],
+        'crafting': ['craft', 'crafting', 'recipe', 'construction'],  # Not 'build': that is a spawn verb
+        'physics': ['physics', 'grab', 'grabbing', 'throw', 'throwing', 'realistic']
+    },
+    "vr": {
+        'hand': ['hand', 'grab', 'grabbing', 'gesture', 'finger'],
+        'ui': ['menu', 'ui', 'interface']
+    },
+    "ui_style": {
+        'medieval': ['medieval', 'fantasy'],
+        'sci_fi': ['sci-fi', 'sci fi', 'futuristic']
+    }
+}
+
+# Built once at import; every parse tokenizes the description once
+DESCRIPTION_MATCHER = KeywordMatcher(DESCRIPTION_KEYWORDS)
+
+# Colours the plugin understands as linear RGB in 0..1
+NAMED_COLORS: Dict[str, List[float]] = {
+    'red': [1.0, 0.0, 0.0],
+    'green': [0.0, 1.0, 0.0],
+    'blue': [0.0, 0.0, 1.0],
+    'yellow': [1.0, 1.0, 0.0],
+    'magenta': [1.0, 0.0, 1.0],
+    'pink': [1.0, 0.4, 0.7],
+    'cyan': [0.0, 1.0, 1.0],
+    'orange': [1.0, 0.5, 0.0],
+    'purple': [0.5, 0.0, 1.0],
+    'white': [1.0, 1.0, 1.0],
+    'warm': [1.0, 0.8, 0.6],
+    'cool': [0.7, 0.85, 1.0]
+}
+RAINBOW_PALETTE = [NAMED_COLORS[name] for name in ('red', 'green', 'blue', 'yellow', 'magenta', 'cyan', 'orange', 'purple')]
 
 @dataclass
-class GameElement:
-    """Represents a game element to be created"""
-    type: str  # 'level', 'character', 'mechanic', 'vr', 'ui', etc.
-    name: str
-    properties: Dict[str, Any]
-    dependencies: List[str]  # Other elements this depends on
+class SpawnPlan:
+    """A counted arrangement of one kind of actor pulled out of a description"""
+    kind: str  # 'light', 'cube', ...
+    actor_class: str
+    count: int
+    shape: str  # Key of LAYOUT_GENERATORS
+    options: Dict[str, Any]  # Generator keyword arguments (radius, spacing, center, ...)
+    palette: List[List[float]]  # Light colours, cycled over the items
+    intensity: Optional[float] = None
+    scale: Optional[List[float]] = None
+    requested: Optional[int] = None  # Count asked for, when it was cut to LAYOUT_MAX_ITEMS
+    
+    def describe(self) -> str:
+        text = f"{self.count} {self.kind} {self.shape}"
+        if self.requested is not None:
+            text += f" (⚠️ {self.requested:,} requested - capped at LAYOUT_MAX_ITEMS)"
+        return text
+    
+    def spawns(self, prefix: str, stamp: Optional[int] = None) -> List[Dict[str, Any]]:
+        """spawn_actor params for every item, named <prefix>_<i>[_<stamp>]"""
+        spawns = []
+        suffix = f"_{stamp}" if stamp is not None else ""
+        layout = build_layout(self.shape, self.count, **self.options)
+        for i, transform in enumerate(layout.transforms()):
+            params = dict(transform, type=self.actor_class, name=f"{prefix}_{i}{suffix}")
+            if self.scale:
+                params['scale'] = self.scale
+            if self.intensity is not None:
+                params['intensity'] = self.intensity
+            if self.palette:
+                params['color'] = self.palette[i % len(self.palette)]
+            spawns.append(params)
+        return spawns
 
-class UnrealConnection:
-    """Enhanced connection to Unreal Engine via UnrealMCP plugin"""
+class SpawnPlanExtractor:
+    """Pulls "<count> <modifiers> <things> in a <shape> ..." phrases out of a description.
+    
+    Each match becomes a SpawnPlan; dimensions, colours and brightness are read
+    from the words up to the next match. All grammars are compiled once here.
+    """
+    
+    # noun -> (kind, actor class, default height above the origin)
+    KINDS = {
+        'light': ('light', 'PointLight', 200.0), 'lamp': ('light', 'PointLight', 200.0),
+        'orb': ('light', 'PointLight', 200.0), 'point light': ('light', 'PointLight', 200.0),
+        'spotlight': ('spotlight', 'SpotLight', 400.0), 'spot light': ('spotlight', 'SpotLight', 400.0),
+        'cube': ('cube', 'StaticMeshActor', 0.0), 'box': ('cube', 'StaticMeshActor', 0.0),
+        'block': ('cube', 'StaticMeshActor', 0.0), 'crate': ('cube', 'StaticMeshActor', 0.0),
+        'sphere': ('sphere', 'StaticMeshActor', 0.0), 'ball': ('sphere', 'StaticMeshActor', 0.0),
+        'pillar': ('pillar', 'StaticMeshActor', 0.0), 'platform': ('platform', 'StaticMeshActor', 0.0),
+        'structure': ('structure', 'StaticMeshActor', 0.0), 'tree': ('tree', 'StaticMeshActor', 0.0),
+        'camera': ('camera', 'CameraActor', 200.0), 'actor': ('actor', 'Actor', 0.0),
+        'object': ('object', 'StaticMeshActor', 0.0)
+    }
+    NUMBERS = {
+        'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+        'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'a dozen': 12, 'dozen': 12, 'fifteen': 15,
+        'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'a hundred': 100, 'hundred': 100
+    }
+    SIZES = {'tiny': 0.25, 'small': 0.5, 'big': 2.0, 'large': 2.0, 'huge': 4.0, 'giant': 4.0, 'massive': 8.0}
+    BRIGHTNESS = {'dim': 0.3, 'soft': 0.5, 'bright': 2.0, 'glowing': 2.0, 'brilliant': 3.0}
+    PALETTE_WORDS = ('colored', 'coloured', 'colorful', 'colourful', 'multicolored', 'rainbow')
+    SHAPES = tuple(LAYOUT_GENERATORS)
+    DEFAULT_COUNT = 5  # "a tower of cubes"
+    DEFAULT_INTENSITY = 5000.0
+    UNITS = {'m': 100.0, 'meter': 100.0, 'meters': 100.0, 'metre': 100.0, 'metres': 100.0,
+             'cm': 1.0, 'unit': 1.0, 'units': 1.0}
+    
+    @staticmethod
+    def _words(words) -> str:
+        return "|".join(sorted((re.escape(word).replace(r"\ ", r"\s+") for word in words), key=len, reverse=True))
     
     def __init__(self):
-        self.connected = False
+        modifier = self._words(list(NAMED_COLORS) + list(self.SIZES) + list(self.BRIGHTNESS)
+                               + list(self.PALETTE_WORDS) + ['tall', 'flat'])
+        shape = self._words(self.SHAPES)
+        number = rf"\d+|{self._words(self.NUMBERS)}"
+        distance = rf"(\d+(?:\.\d+)?)\s*({self._words(self.UNITS)})?\b"
+        self.mention = re.compile(
+            rf"\b(?:(?P<lead>{shape})\s+of\s+)?"  # "a ring of 8 lights"
+            rf"(?:\b(?P<count>{number})\s+)?"
+            rf"(?P<modifiers>(?:\b(?:{modifier})\b(?:\s*,\s*|\s+and\s+|\s+))*)"
+            rf"\b(?P<noun>{self._words(self.KINDS)})(?:s|es)?\b"
+            rf"(?:\s+(?:in|into|on|along|forming)\s+(?:an?|the)\s+(?:\w+\s+)?(?P<shape>{shape})\b)?"
+        )
+        self.color = re.compile(rf"\b({self._words(NAMED_COLORS)})\b")
+        self.radius = re.compile(rf"\bradius\s+(?:of\s+)?{distance}|{distance}\s+radius\b|\b(?:wide|across)\s+{distance}")
+        self.spacing = re.compile(rf"\b{distance}\s+apart\b|\bspac(?:ed|ing)\s+(?:of\s+|by\s+)?{distance}")
+        self.height = re.compile(rf"\b(?:at\s+(?:a\s+)?height\s+(?:of\s+)?|elevation\s+(?:of\s+)?){distance}"
+                                 rf"|{distance}\s+(?:high|up|above\s+the\s+ground)\b")
+        self.intensity = re.compile(r"\b(?:intensity|brightness)\s+(?:of\s+)?(\d+(?:\.\d+)?)")
         
-    async def send_command(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Send command to UnrealMCP plugin and return response"""
-        try:
-            # Create socket connection (UnrealMCP closes after each command)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5.0)  # Shorter timeout
-            
-            logger.info(f"Connecting to UE at {UNREAL_HOST}:{UNREAL_PORT}")
-            
-            # Connect and send command
-            sock.connect((UNREAL_HOST, UNREAL_PORT))
-            message = json.dumps({"type": command_type, "params": params})
-            logger.info(f"Sending: {message}")
-            sock.send(message.encode('utf-8'))
-            
-            # Receive response with timeout handling
-            response_data = b""
-            sock.settimeout(5.0)  # Set receive timeout
-            
-            try:
-                while True:
-                    chunk = sock.recv(4096)
-                    if not chunk:
-                        break
-                    response_data += chunk
-                    
-                    # Try to parse - if we have complete JSON, break
-                    try:
-                        json.loads(response_data.decode('utf-8'))
-                        break  # Got complete JSON
-                    except json.JSONDecodeError:
-                        continue  # Need more data
-                        
-            except socket.timeout:
-                logger.warning("Socket receive timeout, using available data")
+    def extract(self, desc_lower: str) -> List[SpawnPlan]:
+        """Every counted or shaped arrangement in a lower-cased description"""
+        matches = [match for match in self.mention.finditer(desc_lower)
+                   if match.group('count') or match.group('lead') or match.group('shape')]
+        plans = []
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(desc_lower)
+            plans.append(self._plan(match, desc_lower[match.end():end]))
+        return plans
+    
+    def _plan(self, match, tail: str) -> SpawnPlan:
+        noun = " ".join(match.group('noun').split())
+        kind, actor_class, height = self.KINDS[noun]
+        count_text = match.group('count')
+        if count_text:
+            count = int(count_text) if count_text.isdigit() else self.NUMBERS[" ".join(count_text.split())]
+        else:
+            count = self.DEFAULT_COUNT
+        requested = count if count > LAYOUT_MAX_ITEMS else None
+        count = min(count, LAYOUT_MAX_ITEMS)
+        shape = match.group('shape') or match.group('lead') or ('row' if count <= 10 else 'grid')
+        modifiers = match.group('modifiers').split()
+        
+        radius = self._distance(self.radius, tail)
+        spacing = self._distance(self.spacing, tail)
+        height = self._distance(self.height, tail, height)
+        
+        is_light = actor_class in ('PointLight', 'SpotLight')
+        palette = []
+        intensity = None
+        if is_light:
+            named = [NAMED_COLORS[name] for name in self.color.findall(" ".join(modifiers) + " " + tail)]
+            palette = named or (RAINBOW_PALETTE if any(word in self.PALETTE_WORDS for word in modifiers) else [])
+            found = self.intensity.search(tail)
+            intensity = float(found.group(1)) if found else self.DEFAULT_INTENSITY
+            for word in modifiers:
+                intensity *= self.BRIGHTNESS.get(word, 1.0)
                 
-            sock.close()
-            
-            if not response_data:
-                return {"status": "error", "error": "No response received"}
-            
-            # Parse JSON response
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"UE Response: {response}")
-            return response
+        scale = None
+        factor = math.prod(self.SIZES.get(word, 1.0) for word in modifiers)
+        if not is_light and (factor != 1.0 or 'tall' in modifiers or 'flat' in modifiers):
+            scale = [factor, factor, factor * (3.0 if 'tall' in modifiers else 0.2 if 'flat' in modifiers else 1.0)]
             
-        except Exception as e:
-            logger.error(f"UE command failed: {e}")
-            return {"status": "error", "error": str(e)}
+        # Bigger items need more room when no spacing was given
+        spread = max(factor, 1.0) if scale else 1.0
+        options: Dict[str, Any] = {'center': (0.0, 0.0, height)}
+        generator = LAYOUT_GENERATORS[shape][0]
+        if generator in (ring_layout, spiral_layout, scatter_layout):
+            if radius is None and spacing is not None and generator is ring_layout:
+                radius = count * spacing / (2 * math.pi)
+            # Default rings and scatters grow with the count so items stay apart
+            options['radius'] = radius if radius is not None else max(500.0, count * 150.0 / (2 * math.pi)) * spread
+            if generator is scatter_layout and spacing is not None:
+                options['min_distance'] = spacing
+        elif spacing is not None or spread > 1.0:
+            options['spacing'] = spacing if spacing is not None else (100.0 if generator is stack_layout else 200.0) * spread
+        return SpawnPlan(kind=kind, actor_class=actor_class, count=count, shape=shape, options=options,
+                         palette=palette, intensity=intensity, scale=scale, requested=requested)
+        
+    def _distance(self, pattern, text: str, default: Optional[float] = None) -> Optional[float]:
+        found = pattern.search(text)
+        if not found:
+            return default
+        # Each alternative has its own (value, unit) pair of groups
+        groups = found.groups()
+        for i in range(0, len(groups), 2):
+            if groups[i] is not None:
+                return float(groups[i]) * self.UNITS.get(groups[i + 1] or 'units', 1.0)
+        return default
+
+# Built once at import, like DESCRIPTION_MATCHER
+PLAN_EXTRACTOR = SpawnPlanExtractor()
+
+class ParseCache:
+    """LRU cache of parsed GameElement lists, keyed on normalized description text.
+    
+    Entries are stored pickled: every hit unpickles a fresh copy, so callers can
+    edit the elements they get back without corrupting the cache, and the pickle
+    size bounds memory (max_bytes) as well as the entry count.
+    """
+    
+    def __init__(self, max_entries: int = PARSE_CACHE_SIZE, max_bytes: int = PARSE_CACHE_MAX_BYTES,
+                 max_length: int = PARSE_CACHE_MAX_LENGTH, enabled: bool = PARSE_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_length = max_length
+        self.enabled = enabled
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.size_bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "uncacheable": 0}
+        
+    @staticmethod
+    def normalize(description: str) -> str:
+        """Case, spacing and trailing punctuation never change a parse"""
+        return " ".join(description.lower().split()).rstrip(".!")
+    
+    def get_or_parse(self, description: str, parse: Callable[[str], List[GameElement]]) -> List[GameElement]:
+        if not self.enabled or self.max_entries <= 0:
+            return parse(description)
+        if len(description) > self.max_length:
+            self.counters["uncacheable"] += 1
+            return parse(description)
+        key = self.normalize(description)
+        blob = self.entries.get(key)
+        if blob is not None:
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return pickle.loads(blob)
+        self.counters["misses"] += 1
+        elements = parse(description)
+        blob = pickle.dumps(elements, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            self.counters["uncacheable"] += 1
+            return elements
+        self.entries[key] = blob
+        self.size_bytes += len(blob)
+        while len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.counters["evictions"] += 1
+        return elements
+    
+    def clear(self):
+        self.entries.clear()
+        self.size_bytes = 0
+        
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else None,
+            **self.counters
+        }
+
+# Shared by every GameCreationIntelligence, since create_objects builds a new one per call
+PARSE_CACHE = ParseCache()
 
 class GameCreationIntelligence:
     """AI system that understands game development and breaks down complex requests"""
     
-    def __init__(self):
-        self.ue_conn = UnrealConnection()
+    def __init__(self, ue_conn: Optional[UnrealConnection] = None, avoid_overlaps: bool = False):
+        self.ue_conn = ue_conn or get_unreal_connection()
+        self.avoid_overlaps = avoid_overlaps
+        self._planner: Optional[PlacementPlanner] = None
         
     def parse_game_description(self, description: str) -> List[GameElement]:
-        """Parse natural language into structured game elements"""
+        """Parse natural language into structured game elements (memoized in PARSE_CACHE)"""
+        return PARSE_CACHE.get_or_parse(description, self._parse_description)
+    
+    def _parse_description(self, description: str) -> List[GameElement]:
         elements = []
         desc_lower = description.lower()
+        features = DESCRIPTION_MATCHER.features(desc_lower)
         
         # Game Type Detection
-        game_type = self._detect_game_type(desc_lower)
+        game_type = self._detect_game_type(features)
+        
+        # Counted arrangements ("10 lights in a circle") become one batched placement plan
+        plans = PLAN_EXTRACTOR.extract(desc_lower)
+        if plans:
+            elements.append(GameElement(
+                type='layout',
+                name='placement_plan',
+                properties={'plans': plans},
+                dependencies=[]
+            ))
         
-        # Environment/Level Elements - More flexible detection
-        if any(word in desc_lower for word in ['level', 'world', 'environment', 'map', 'scene', 'castle', 'building', 'place', 'location', 'area', 'create', 'build', 'make']):
-            level_element = self._parse_level_requirements(description, game_type)
+        # Environment/Level Elements - named outright, or a bare "create ..." with nothing to count
+        if 'section:level' in features or ('action:create' in features and not plans):
+            level_element = self._parse_level_requirements(features, game_type)
             if level_element:
                 elements.append(level_element)
         
         # Character/Player Elements  
-        if any(word in desc_lower for word in ['player', 'character', 'avatar', 'controller']):
-            char_element = self._parse_character_requirements(description, game_type)
+        if 'section:character' in features:
+            char_element = self._parse_character_requirements(features, game_type)
             if char_element:
                 elements.append(char_element)
                 
         # Gameplay Mechanics
-        mechanics = self._parse_gameplay_mechanics(description, game_type)
+        mechanics = self._parse_gameplay_mechanics(features, game_type)
         elements.extend(mechanics)
         
         # VR-Specific Elements
-        if any(word in desc_lower for word in ['vr', 'virtual reality', 'headset', 'hand tracking']):
-            vr_elements = self._parse_vr_requirements(description)
+        if 'section:vr' in features:
+            vr_elements = self._parse_vr_requirements(features)
             elements.extend(vr_elements)
             
         # UI/UX Elements
-        if any(word in desc_lower for word in ['ui', 'menu', 'hud', 'interface']):
-            ui_element = self._parse_ui_requirements(description, game_type)
+        if 'section:ui' in features:
+            ui_element = self._parse_ui_requirements(features, game_type)
             if ui_element:
                 elements.append(ui_element)
         
         return elements
     
-    def _detect_game_type(self, description: str) -> str:
+    def _detect_game_type(self, features: frozenset) -> str:
         """Detect the primary game genre/type"""
-        type_keywords = {
-            'fps': ['first person', 'fps', 'shooting', 'gun', 'weapon'],
-            'platformer': ['platform', 'jump', 'side scroll'],
-            'rpg': ['rpg', 'role playing', 'quest', 'inventory', 'stats'],
-            'survival': ['survival', 'craft', 'resource', 'hunger', 'health'],
-            'puzzle': ['puzzle', 'solve', 'logic', 'brain'],
-            'racing': ['race', 'car', 'speed', 'track'],
-            'vr': ['vr', 'virtual reality', 'immersive'],
-            'multiplayer': ['multiplayer', 'online', 'coop', 'pvp']
-        }
-        
-        for game_type, keywords in type_keywords.items():
-            if any(keyword in description for keyword in keywords):
-                return game_type
-        
-        return 'generic'
+        return DESCRIPTION_MATCHER.first(features, "genre", 'generic')
     
-    def _parse_level_requirements(self, description: str, game_type: str) -> Optional[GameElement]:
+    def _parse_level_requirements(self, features: frozenset, game_type: str) -> Optional[GameElement]:
         """Extract level/environment requirements"""
-        # Environment keywords
-        environments = {
-            'medieval': ['castle', 'medieval', 'knight', 'sword', 'dungeon'],
-            'modern': ['city', 'urban', 'building', 'street', 'office'],
-            'sci_fi': ['space', 'futuristic', 'alien', 'robot', 'laser'],
-            'nature': ['forest', 'mountain', 'river', 'tree', 'outdoor'],
-            'underwater': ['ocean', 'underwater', 'sea', 'coral', 'fish']
-        }
+        detected_env = DESCRIPTION_MATCHER.first(features, "environment", 'generic')
         
-        detected_env = 'generic'
-        for env_type, keywords in environments.items():
-            if any(keyword in description.lower() for keyword in keywords):
-                detected_env = env_type
-                break
-                
         # Size and scale detection
-        scale = 'medium'
-        if any(word in description.lower() for word in ['large', 'huge', 'massive', 'open world']):
-            scale = 'large'
-        elif any(word in description.lower() for word in ['small', 'tiny', 'compact']):
-            scale = 'small'
+        scale = DESCRIPTION_MATCHER.first(features, "scale", 'medium')
             
         return GameElement(
             type='level',
@@ -201,7 +3162,7 @@ class GameCreationIntelligence:
             dependencies=[]
         )
     
-    def _parse_character_requirements(self, description: str, game_type: str) -> Optional[GameElement]:
+    def _parse_character_requirements(self, features: frozenset, game_type: str) -> Optional[GameElement]:
         """Extract character/player requirements"""
         char_props = {
             'controller_type': 'first_person' if game_type == 'fps' else 'third_person',
@@ -210,21 +3171,11 @@ class GameCreationIntelligence:
         }
         
         # Movement type detection
-        if any(word in description.lower() for word in ['teleport', 'vr']):
-            char_props['movement'] = 'teleport'
-        elif any(word in description.lower() for word in ['fly', 'flight']):
-            char_props['movement'] = 'flying'
+        char_props['movement'] = DESCRIPTION_MATCHER.first(features, "movement", 'standard')
             
         # Special abilities
-        abilities = []
-        if 'jump' in description.lower():
-            abilities.append('jump')
-        if any(word in description.lower() for word in ['shoot', 'gun', 'weapon']):
-            abilities.append('combat')
-        if any(word in description.lower() for word in ['interact', 'grab', 'pick up']):
-            abilities.append('interaction')
-            
-        char_props['abilities'] = abilities
+        char_props['abilities'] = [ability for ability in DESCRIPTION_KEYWORDS["ability"]
+                                   if f"ability:{ability}" in features]
         
         return GameElement(
             type='character',
@@ -233,13 +3184,12 @@ class GameCreationIntelligence:
             dependencies=['level']
         )
     
-    def _parse_gameplay_mechanics(self, description: str, game_type: str) -> List[GameElement]:
+    def _parse_gameplay_mechanics(self, features: frozenset, game_type: str) -> List[GameElement]:
         """Extract gameplay mechanic requirements"""
         mechanics = []
-        desc_lower = description.lower()
         
         # Combat system
-        if any(word in desc_lower for word in ['fight', 'combat', 'weapon', 'enemy']):
+        if 'mechanic:combat' in features:
             mechanics.append(GameElement(
                 type='mechanic',
                 name='combat_system',
@@ -248,7 +3198,7 @@ class GameCreationIntelligence:
             ))
         
         # Inventory system
-        if any(word in desc_lower for word in ['inventory', 'item', 'collect', 'pickup']):
+        if 'mechanic:inventory' in features:
             mechanics.append(GameElement(
                 type='mechanic', 
                 name='inventory_system',
@@ -257,7 +3207,7 @@ class GameCreationIntelligence:
             ))
             
         # Crafting system
-        if any(word in desc_lower for word in ['craft', 'recipe', 'build', 'construct']):
+        if 'mechanic:crafting' in features:
             mechanics.append(GameElement(
                 type='mechanic',
                 name='crafting_system', 
@@ -266,7 +3216,7 @@ class GameCreationIntelligence:
             ))
             
         # Physics interactions
-        if any(word in desc_lower for word in ['physics', 'grab', 'throw', 'realistic']):
+        if 'mechanic:physics' in features:
             mechanics.append(GameElement(
                 type='mechanic',
                 name='physics_system',
@@ -276,13 +3226,12 @@ class GameCreationIntelligence:
         
         return mechanics
     
-    def _parse_vr_requirements(self, description: str) -> List[GameElement]:
+    def _parse_vr_requirements(self, features: frozenset) -> List[GameElement]:
         """Extract VR-specific requirements"""
         vr_elements = []
-        desc_lower = description.lower()
         
         # Hand tracking
-        if any(word in desc_lower for word in ['hand', 'grab', 'gesture', 'finger']):
+        if 'vr:hand' in features:
             vr_elements.append(GameElement(
                 type='vr',
                 name='hand_tracking',
@@ -303,7 +3252,7 @@ class GameCreationIntelligence:
         ))
         
         # VR UI
-        if any(word in desc_lower for word in ['menu', 'ui', 'interface']):
+        if 'vr:ui' in features:
             vr_elements.append(GameElement(
                 type='vr',
                 name='vr_ui',
@@ -313,7 +3262,7 @@ class GameCreationIntelligence:
         
         return vr_elements
     
-    def _parse_ui_requirements(self, description: str, game_type: str) -> Optional[GameElement]:
+    def _parse_ui_requirements(self, features: frozenset, game_type: str) -> Optional[GameElement]:
         """Extract UI/UX requirements"""
         ui_props = {
             'hud': True,
@@ -323,10 +3272,7 @@ class GameCreationIntelligence:
         }
         
         # Style detection
-        if any(word in description.lower() for word in ['medieval', 'fantasy']):
-            ui_props['style'] = 'medieval'
-        elif any(word in description.lower() for word in ['sci-fi', 'futuristic']):
-            ui_props['style'] = 'sci_fi'
+        ui_props['style'] = DESCRIPTION_MATCHER.first(features, "ui_style", 'modern')
             
         return GameElement(
             type='ui',
@@ -335,46 +3281,129 @@ class GameCreationIntelligence:
             dependencies=['character']
         )
     
-    async def create_game_elements(self, elements: List[GameElement]) -> Dict[str, Any]:
-        """Execute creation of all game elements in proper dependency order"""
-        results = {"created_elements": [], "errors": []}
+    async def create_game_elements(self, elements: List[GameElement],
+                                   max_concurrency: int = CREATION_CONCURRENCY) -> Dict[str, Any]:
+        """Execute creation of all game elements in proper dependency order.
         
-        # Sort by dependencies (simple topological sort)
-        sorted_elements = self._sort_by_dependencies(elements)
+        Elements run in waves - everything in a wave only depends on earlier waves,
+        so a wave's elements are created concurrently (at most max_concurrency at once).
+        """
+        results = {"created_elements": [], "errors": [], "waves": []}
         
-        for element in sorted_elements:
-            try:
-                logger.info(f"Creating {element.type}: {element.name}")
-                result = await self._create_single_element(element)
+        waves, blocked = self._schedule_waves(elements)
+        if blocked:
+            error_msg = f"Dependency cycle - skipped: {', '.join(element.name for element in blocked)}"
+            logger.error(error_msg)
+            results["errors"].append(error_msg)
+            
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        run_start = time.perf_counter()
+        timings: Dict[int, Tuple[float, float]] = {}  # id(element) -> (start, end) in ms
+        
+        async def run_element(element: GameElement) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    logger.info(f"Creating {element.type}: {element.name}")
+                    return await self._create_single_element(element), None
+                except Exception as e:
+                    error_msg = f"Failed to create {element.name}: {str(e)}"
+                    logger.error(error_msg)
+                    return None, error_msg
+                finally:
+                    timings[id(element)] = ((start - run_start) * 1000, (time.perf_counter() - run_start) * 1000)
+        
+        for wave_index, wave in enumerate(waves):
+            results["waves"].append([element.name for element in wave])
+            outcomes = await asyncio.gather(*[run_element(element) for element in wave])
+            
+            for element, (result, error_msg) in zip(wave, outcomes):
+                if error_msg:
+                    results["errors"].append(error_msg)
+                    continue
+                start_ms, end_ms = timings[id(element)]
                 results["created_elements"].append({
                     "type": element.type,
                     "name": element.name,
-                    "result": result
+                    "result": result,
+                    "wave": wave_index,
+                    "started_ms": round(start_ms, 2),
+                    "duration_ms": round(end_ms - start_ms, 2)
                 })
-            except Exception as e:
-                error_msg = f"Failed to create {element.name}: {str(e)}"
-                logger.error(error_msg)
-                results["errors"].append(error_msg)
         
+        results["total_ms"] = round((time.perf_counter() - run_start) * 1000, 2)
+        results["critical_path"] = self._critical_path(elements, timings)
         return results
     
-    def _sort_by_dependencies(self, elements: List[GameElement]) -> List[GameElement]:
-        """Sort elements by dependency order"""
-        # Simple sorting - create levels first, then characters, then mechanics
-        order = ['level', 'character', 'vr', 'mechanic', 'ui']
-        
-        sorted_elements = []
-        for element_type in order:
-            for element in elements:
-                if element.type == element_type:
-                    sorted_elements.append(element)
-        
-        # Add any remaining elements
-        for element in elements:
-            if element not in sorted_elements:
-                sorted_elements.append(element)
+    def _resolve_dependencies(self, elements: List[GameElement]) -> List[List[int]]:
+        """Map each element's dependency names to element indices.
+        
+        A dependency names another element ('inventory_system') or, failing that,
+        every element of a type ('level'). Unknown names are not part of this plan
+        and are ignored.
+        """
+        by_name: Dict[str, List[int]] = {}
+        by_type: Dict[str, List[int]] = {}
+        for index, element in enumerate(elements):
+            by_name.setdefault(element.name, []).append(index)
+            by_type.setdefault(element.type, []).append(index)
+            
+        resolved = []
+        for index, element in enumerate(elements):
+            targets = set()
+            for dependency in element.dependencies:
+                matches = by_name.get(dependency) or by_type.get(dependency)
+                if not matches:
+                    logger.debug(f"{element.name}: dependency '{dependency}' not in plan")
+                    continue
+                targets.update(match for match in matches if match != index)
+            resolved.append(sorted(targets))
+        return resolved
+    
+    def _schedule_waves(self, elements: List[GameElement]) -> Tuple[List[List[GameElement]], List[GameElement]]:
+        """Topologically group elements into waves (Kahn's algorithm).
+        
+        Returns (waves, blocked) where blocked elements sit on, or depend on, a cycle.
+        """
+        dependencies = self._resolve_dependencies(elements)
+        dependents: List[List[int]] = [[] for _ in elements]
+        remaining = [len(deps) for deps in dependencies]
+        for index, deps in enumerate(dependencies):
+            for dependency in deps:
+                dependents[dependency].append(index)
                 
-        return sorted_elements
+        waves = []
+        current = [index for index, count in enumerate(remaining) if count == 0]
+        while current:
+            waves.append([elements[index] for index in current])
+            ready = []
+            for index in current:
+                for dependent in dependents[index]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+            current = sorted(ready)
+            
+        blocked = [elements[index] for index, count in enumerate(remaining) if count > 0]
+        return waves, blocked
+    
+    def _critical_path(self, elements: List[GameElement],
+                       timings: Dict[int, Tuple[float, float]]) -> Dict[str, Any]:
+        """Longest chain of dependent elements by measured creation time"""
+        dependencies = self._resolve_dependencies(elements)
+        best: Dict[int, Tuple[float, List[int]]] = {}
+        
+        def longest(index: int) -> Tuple[float, List[int]]:
+            if index not in best:
+                start, end = timings[id(elements[index])]
+                chains = [longest(dep) for dep in dependencies[index] if id(elements[dep]) in timings]
+                duration, path = max(chains, key=lambda chain: chain[0], default=(0.0, []))
+                best[index] = (duration + end - start, path + [index])
+            return best[index]
+        
+        chains = [longest(index) for index, element in enumerate(elements) if id(element) in timings]
+        duration, path = max(chains, key=lambda chain: chain[0], default=(0.0, []))
+        return {"elements": [elements[index].name for index in path], "duration_ms": round(duration, 2)}
     
     async def _create_single_element(self, element: GameElement) -> Dict[str, Any]:
         """Create a single game element using UE commands"""
@@ -389,6 +3418,8 @@ class GameCreationIntelligence:
             return await self._create_vr_element(element)
         elif element.type == 'ui':
             return await self._create_ui(element)
+        elif element.type == 'layout':
+            return await self._create_layout(element)
         else:
             return {"status": "error", "error": f"Unknown element type: {element.type}"}
     
@@ -397,61 +3428,58 @@ class GameCreationIntelligence:
         env = element.properties.get('environment', 'generic')
         scale = element.properties.get('scale', 'medium')
         
-        results = []
+        spawns = []
         
         # Create basic level geometry
         if env == 'medieval':
             # Create castle walls
-            wall_result = await self.ue_conn.send_command('spawn_actor', {
+            spawns.append({
                 'type': 'StaticMeshActor',
                 'name': 'CastleWall_Main',
                 'location': [0, 0, 0]
             })
-            results.append(wall_result)
             
             # Add towers
             for i, pos in enumerate([[500, 500, 0], [500, -500, 0], [-500, 500, 0], [-500, -500, 0]]):
-                tower_result = await self.ue_conn.send_command('spawn_actor', {
+                spawns.append({
                     'type': 'StaticMeshActor', 
                     'name': f'Tower_{i}',
                     'location': pos
                 })
-                results.append(tower_result)
                 
         elif env == 'underwater':
             # Create ocean floor
-            floor_result = await self.ue_conn.send_command('spawn_actor', {
+            spawns.append({
                 'type': 'StaticMeshActor',
                 'name': 'OceanFloor',
                 'location': [0, 0, -500]
             })
-            results.append(floor_result)
             
             # Add coral reefs
             for i in range(5):
-                coral_result = await self.ue_conn.send_command('spawn_actor', {
+                spawns.append({
                     'type': 'StaticMeshActor',
                     'name': f'Coral_{i}',
                     'location': [i * 200 - 400, i * 150 - 300, -450]
                 })
-                results.append(coral_result)
         
         else:
             # Generic level - create basic ground plane
-            ground_result = await self.ue_conn.send_command('spawn_actor', {
+            spawns.append({
                 'type': 'StaticMeshActor',
                 'name': 'GroundPlane',
                 'location': [0, 0, 0]
             })
-            results.append(ground_result)
         
         # Add lighting
-        light_result = await self.ue_conn.send_command('spawn_actor', {
+        spawns.append({
             'type': 'DirectionalLight',
             'name': 'MainLight',
             'location': [0, 0, 1000]
         })
-        results.append(light_result)
+        
+        # All level geometry goes out in one batched round trip
+        results = await self._spawn_all(spawns)
         
         return {"status": "success", "results": results}
     
@@ -461,11 +3489,11 @@ class GameCreationIntelligence:
         abilities = element.properties.get('abilities', [])
         
         # Create basic pawn
-        pawn_result = await self.ue_conn.send_command('spawn_actor', {
+        pawn_result = (await self._spawn_all([{
             'type': 'Pawn',
             'name': 'PlayerPawn',
             'location': [0, 0, 100]
-        })
+        }]))[0]
         
         # TODO: Add components for abilities (combat, interaction, etc.)
         # This would require more complex Blueprint creation
@@ -477,25 +3505,59 @@ class GameCreationIntelligence:
         # Mechanics typically require Blueprint logic
         # For now, create placeholder actors that represent the systems
         
-        mechanic_result = await self.ue_conn.send_command('spawn_actor', {
+        mechanic_result = (await self._spawn_all([{
             'type': 'Actor',
             'name': f'{element.name}_manager',
             'location': [0, 0, 0]
-        })
+        }]))[0]
         
         return {"status": "success", "mechanic": mechanic_result}
     
     async def _create_vr_element(self, element: GameElement) -> Dict[str, Any]:
         """Create VR-specific elements"""
         # VR elements would typically involve pawn setup and input configuration
-        vr_result = await self.ue_conn.send_command('spawn_actor', {
+        vr_result = (await self._spawn_all([{
             'type': 'Pawn',
             'name': f'VR_{element.name}',
             'location': [0, 0, 120]  # Head height
-        })
+        }]))[0]
         
         return {"status": "success", "vr_element": vr_result}
     
+    async def _create_layout(self, element: GameElement) -> Dict[str, Any]:
+        """Spawn every extracted arrangement (ring, grid, stack, ...) in one batch"""
+        plans: List[SpawnPlan] = element.properties['plans']
+        stamp = int(time.time() * 1000)  # Keeps names unique across runs (see ActorIndex timestamps)
+        spawns = []
+        for index, plan in enumerate(plans):
+            spawns.extend(plan.spawns(f"{plan.kind.title()}{plan.shape.title()}_{index}", stamp))
+        results = await self._spawn_all(spawns)
+        
+        failed = [result for result in results if result.get('status') == 'error']
+        status = "error" if failed and len(failed) == len(results) else "success"
+        return {"status": status, "spawned": len(results) - len(failed), "failed": len(failed),
+                "plans": [plan.describe() for plan in plans],
+                "error": failed[0].get('error') if failed else None}
+    
+    async def _spawn_all(self, spawns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Spawn actors in one batch, nudging them off existing actors if asked to"""
+        if self.avoid_overlaps:
+            planner = await self._placement_planner()
+            for params in spawns:
+                params['location'] = planner.place(params['name'], params.get('location', [0, 0, 0]))
+        return await self.ue_conn.send_batch([
+            {'type': 'spawn_actor', 'params': params} for params in spawns
+        ])
+    
+    async def _placement_planner(self) -> PlacementPlanner:
+        if self._planner is None:
+            # Overlap checks need to know where existing actors are
+            await self.ue_conn.get_actors()
+            # Concurrent elements may have built one while we awaited
+            if self._planner is None:
+                self._planner = PlacementPlanner(self.ue_conn.scene.spatial)
+        return self._planner
+    
     async def _create_ui(self, element: GameElement) -> Dict[str, Any]:
         """Create UI elements"""
         # UI creation would typically use UMG (Unreal Motion Graphics)
@@ -503,12 +3565,104 @@ class GameCreationIntelligence:
         
         return {"status": "success", "ui": "UI system initialized"}
 
+class RecordingConnection(UnrealConnection):
+    """Offline stand-in for dry runs: records every request and answers it locally.
+    
+    Only _exchange is replaced, so batching, chunking and envelope building run
+    exactly as on a live connection and the recorded payloads are the bytes that
+    would be sent. Replies are synthesized; get_all_actors reports `actors`.
+    """
+    
+    def __init__(self, supports_batch: bool = True, actors: Optional[List[Dict[str, Any]]] = None):
+        # Own metrics, so planning never shows up in get_performance_stats
+        super().__init__(pool=UnrealConnectionPool(), negotiate=False, metrics=PerformanceMetrics())
+        self.supports_batch = supports_batch
+        self.actors = list(actors or [])
+        self.requests: List[Dict[str, Any]] = []
+        
+    async def _exchange(self, payload: bytes, framing: str, timeout: Optional[float] = None,
+                        timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        envelope = json.loads(payload)
+        params = envelope.get("params") or {}
+        reply = self._reply(envelope["type"], params)
+        self.requests.append({
+            "type": envelope["type"],
+            "commands": len(params.get("commands", [])) if envelope["type"] == "batch" else 1,
+            "bytes": len(payload),
+            "reply_bytes": len(json.dumps(reply)),
+            "payload": envelope
+        })
+        return reply
+    
+    def _reply(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if command_type == "batch":
+            if not self.supports_batch:
+                return {"status": "error", "error": "Unknown command: batch"}
+            return {"status": "success", "results": [
+                self._reply(command.get("type", ""), command.get("params") or {}) for command in params["commands"]
+            ]}
+        if command_type == "spawn_actor":
+            return {"status": "success", "result": {"name": params.get("name"), "class": params.get("type"),
+                                                    "location": params.get("location")}}
+        if command_type == "get_all_actors":
+            return {"status": "success", "actors": self.actors}
+        return {"status": "success", "result": {}}
+    
+    def summary(self) -> Dict[str, Any]:
+        """Round trips, command count and byte totals of everything recorded"""
+        return {
+            "round_trips": len(self.requests),
+            "commands": sum(request["commands"] for request in self.requests),
+            "request_bytes": sum(request["bytes"] for request in self.requests),
+            "reply_bytes_estimate": sum(request["reply_bytes"] for request in self.requests)
+        }
+
+async def plan_creation(description: str, avoid_overlaps: bool = False, supports_batch: bool = True,
+                        actors: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Run the whole create_objects pipeline against a RecordingConnection.
+    
+    Nothing reaches Unreal. `actors` stands in for the level when avoiding
+    overlaps; `supports_batch=False` plans for a stock plugin without "batch".
+    """
+    recorder = RecordingConnection(supports_batch=supports_batch, actors=actors)
+    creator = GameCreationIntelligence(ue_conn=recorder, avoid_overlaps=avoid_overlaps)
+    elements = creator.parse_game_description(description)
+    results = await creator.create_game_elements(elements)
+    return {
+        "description": description,
+        "elements": [{"type": element["type"], "name": element["name"], "wave": element["wave"]}
+                     for element in results["created_elements"]],
+        "waves": results["waves"],
+        "errors": results["errors"],
+        "requests": [{key: request[key] for key in ("type", "commands", "bytes", "payload")}
+                     for request in recorder.requests],
+        **recorder.summary()
+    }
+
 # Initialize MCP Server
 mcp = FastMCP("VHCI Scene Builder")
 
+def timed_tool(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Record an MCP tool's duration in METRICS; replies starting with ❌ count as failures"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await fn(*args, **kwargs)
+            failed = isinstance(result, str) and result.lstrip().startswith("❌")
+            return result
+        finally:
+            METRICS.observe_tool(fn.__name__, (time.perf_counter() - start) * 1000, failed)
+    return wrapper
+
 @mcp.tool()
+@timed_tool
 async def create_objects(
-    description: str
+    description: str,
+    avoid_overlaps: bool = False,
+    dry_run: bool = False,
+    max_payload_chars: int = 20000
 ) -> str:
     """
     🏗️ VHCI Lab Scene Builder
@@ -523,6 +3677,11 @@ async def create_objects(
                     - "Build a tower of cubes"
                     - "Add rainbow lighting to the scene"
                     - "Create a ring of structures"
+        avoid_overlaps: Move generated actors to the nearest free spot instead of
+                        on top of actors already in the level
+        dry_run: Plan only - return the exact requests that would be sent, with
+                 round trips and byte sizes, without contacting Unreal
+        max_payload_chars: Dry runs list request payloads up to this many characters
     
     Returns:
         Detailed report of all created game elements and systems
@@ -530,9 +3689,12 @@ async def create_objects(
     
     logger.info(f"Creating objects: {description}")
     
+    if dry_run:
+        return await format_creation_plan(description, avoid_overlaps, max_payload_chars)
+    
     try:
         # Initialize game creation intelligence
-        creator = GameCreationIntelligence()
+        creator = GameCreationIntelligence(avoid_overlaps=avoid_overlaps)
         
         # Parse the natural language description
         game_elements = creator.parse_game_description(description)
@@ -553,7 +3715,16 @@ async def create_objects(
 """
         
         for element in creation_results["created_elements"]:
-            response += f"✅ **{element['type'].title()}**: {element['name']}\n"
+            response += f"✅ **{element['type'].title()}**: {element['name']} ({element['duration_ms']:.0f} ms)\n"
+            if element['type'] == 'layout':
+                result = element['result']
+                for plan in result['plans']:
+                    response += f"   • {plan}\n"
+                response += f"   {result['spawned']} actors spawned" + (f", {result['failed']} failed ({result['error']})" if result['failed'] else "") + "\n"
+        
+        critical_path = creation_results["critical_path"]
+        if critical_path["elements"]:
+            response += f"\n⏱️ Critical path: {' → '.join(critical_path['elements'])} ({critical_path['duration_ms']:.0f} ms of {creation_results['total_ms']:.0f} ms)\n"
             
         if creation_results["errors"]:
             response += "\n## ⚠️ Issues Encountered:\n"
@@ -578,9 +3749,134 @@ async def create_objects(
         logger.error(f"Object creation failed: {e}")
         return f"❌ **Object Creation Failed**: {str(e)}\n\nPlease ensure Unreal Engine is running with the UnrealMCP plugin enabled on port 55557."
 
+async def format_creation_plan(description: str, avoid_overlaps: bool, max_payload_chars: int) -> str:
+    """Markdown report of plan_creation for create_objects(dry_run=True)"""
+    # Overlap checks use the last known level, but never fetch it
+    scene = get_unreal_connection().scene
+    actors = list(scene.actors.values()) if avoid_overlaps and scene.is_fresh() else []
+    plan = await plan_creation(description, avoid_overlaps, supports_batch=True, actors=actors)
+    
+    response = f"""
+🧪 **VHCI Lab Scene Builder - Dry Run (nothing sent to Unreal)**
+
+**Description**: {description}
+
+## 📋 Planned Elements:
+"""
+    for wave_index, wave in enumerate(plan["waves"]):
+        response += f"**Wave {wave_index + 1}**: {', '.join(wave)}\n"
+    if avoid_overlaps and not actors:
+        response += "\n⚠️ Level contents unknown (scene cache empty) - overlaps only checked between new actors\n"
+    for error in plan["errors"]:
+        response += f"❌ {error}\n"
+        
+    response += f"""
+## 📦 Requests:
+- Round trips: {plan['round_trips']}
+- Commands: {plan['commands']}
+- Request bytes: {plan['request_bytes']:,}
+- Reply bytes (estimated): {plan['reply_bytes_estimate']:,}
+"""
+    
+    # Payloads per request, one command per line, until the character budget runs out
+    used = 0
+    for number, request in enumerate(plan["requests"], 1):
+        payload = request["payload"]
+        commands = payload["params"]["commands"] if request["type"] == "batch" else [payload]
+        lines = []
+        for command in commands:
+            line = json.dumps(command)
+            if used + len(line) > max_payload_chars:
+                break
+            lines.append(line)
+            used += len(line)
+        if not lines:
+            response += f"\n... {len(plan['requests']) - number + 1} more request(s) not shown (raise max_payload_chars)\n"
+            break
+        response += f"\n**Request {number}** - {request['type']} ({request['commands']} command(s), {request['bytes']:,} bytes)\n"
+        response += "```json\n" + "\n".join(lines) + "\n```\n"
+        if len(lines) < len(commands):
+            response += f"... {len(commands) - len(lines)} more command(s) in this request not shown\n"
+    return response
+
+@mcp.tool()
+@timed_tool
+async def spawn_actors(
+    actors: List[Dict[str, Any]]
+) -> str:
+    """
+    🧱 Spawn Many Actors at Once
+    
+    Place a list of actors using batched commands - thousands of actors take
+    a handful of round trips instead of one per actor.
+    
+    Args:
+        actors: Actor specs, each with "name", "type" (or "class") and optional
+                "location", "rotation" and "scale" as [x, y, z] lists, plus any
+                extra spawn_actor params (e.g. "intensity", "color")
+                Example: [{"name": "Cube_1", "type": "StaticMeshActor", "location": [0, 0, 100]}]
+    
+    Returns:
+        Summary of spawned actors and any per-actor failures
+    """
+    
+    logger.info(f"Spawning {len(actors)} actors in batch")
+    
+    try:
+        missing = [i for i, spec in enumerate(actors) if not spec.get("name")]
+        if missing:
+            return f"❌ Every actor needs a name (missing at positions: {', '.join(map(str, missing[:10]))})"
+        
+        ue_client = get_unreal_connection()
+        results = await ue_client.spawn_actors_batch(actors)
+        
+        response = f"🧱 **Batch Spawn Complete**\n\n"
+        response += f"✅ Spawned: {len(results['created_elements'])} of {len(actors)} actors\n"
+        
+        if results["errors"]:
+            response += "\n## ⚠️ Issues Encountered:\n"
+            for error in results["errors"][:50]:
+                response += f"❌ {error}\n"
+            if len(results["errors"]) > 50:
+                response += f"... and {len(results['errors']) - 50} more\n"
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Batch spawn failed: {e}")
+        return f"❌ **Batch Spawn Failed**: {str(e)}"
+
+def summarize_delete_failures(failed: List[Dict[str, str]], limit: int = 20) -> str:
+    """Group failed deletions by error so thousands of failures stay readable"""
+    by_error: Dict[str, List[str]] = {}
+    for failure in failed:
+        by_error.setdefault(failure["error"], []).append(failure["name"])
+        
+    lines = []
+    for error, names in sorted(by_error.items(), key=lambda item: -len(item[1])):
+        shown = ', '.join(names[:limit])
+        more = f" (+{len(names) - limit} more)" if len(names) > limit else ""
+        lines.append(f"❌ {len(names)} × {error}: {shown}{more}")
+    return "\n".join(lines) + "\n"
+
+def progress_reporter(ctx: Optional[Context]) -> Optional[Callable[[int, int], Awaitable[None]]]:
+    """Forward bulk-operation progress to the MCP client when it asked for it"""
+    if ctx is None:
+        return None
+    
+    async def report(done: int, total: int):
+        try:
+            await ctx.report_progress(done, total)
+        except Exception as e:  # Progress is best effort, never fail the operation
+            logger.debug(f"Progress report failed: {e}")
+    return report
+
 @mcp.tool()
+@timed_tool
 async def clear_workspace(
-    confirm: bool = False
+    confirm: bool = False,
+    refresh: bool = False,
+    ctx: Context = None
 ) -> str:
     """
     🗑️ Clear Unreal Engine Workspace
@@ -589,6 +3885,7 @@ async def clear_workspace(
     
     Args:
         confirm: Set to True to confirm you want to delete all actors
+        refresh: Re-read the actor list from Unreal instead of the scene cache
     
     Returns:
         Status of workspace clearing operation
@@ -600,26 +3897,23 @@ async def clear_workspace(
     logger.info("Clearing workspace - removing all actors")
     
     try:
-        ue_client = UnrealConnection()
+        ue_client = get_unreal_connection()
         
         # Get all actors first
-        actors_response = await ue_client.send_command("get_all_actors", {})
+        actors = await ue_client.get_actors(refresh=refresh)
         
-        if actors_response.get("status") == "success":
-            actors = actors_response.get("actors", [])
-            deleted_count = 0
-            
-            for actor in actors:
-                # Skip essential actors like PlayerStart, WorldSettings, etc.
-                actor_class = actor.get("class", "")
-                if actor_class not in ["WorldSettings", "PlayerStart", "DefaultPawn", "LevelBounds"]:
-                    delete_result = await ue_client.send_command("delete_actor", {
-                        "actor_name": actor.get("name")
-                    })
-                    if delete_result.get("status") == "success":
-                        deleted_count += 1
+        if actors is not None:
+            # Skip essential actors like PlayerStart, WorldSettings, etc.
+            names = [actor.get("name") for actor in actors
+                     if actor.get("class", "") not in PROTECTED_ACTOR_CLASSES]
+            results = await ue_client.delete_actors_bulk(names, progress=progress_reporter(ctx))
+            deleted_count = len(results["deleted"])
             
-            return f"✅ **Workspace Cleared Successfully**\n\n📊 Removed {deleted_count} actors from the level\n🎯 Workspace is now ready for new creations"
+            response = f"✅ **Workspace Cleared Successfully**\n\n📊 Removed {deleted_count} actors from the level\n🎯 Workspace is now ready for new creations"
+            if results["failed"]:
+                response += f"\n\n⚠️ {len(results['failed'])} actors could not be removed:\n"
+                response += summarize_delete_failures(results["failed"])
+            return response
         
         return "❌ Failed to get actor list for workspace clearing"
         
@@ -628,8 +3922,16 @@ async def clear_workspace(
         return f"❌ **Workspace Clearing Failed**: {str(e)}"
 
 @mcp.tool()
+@timed_tool
 async def list_actors(
-    filter_type: str = "all"
+    filter_type: str = "all",
+    refresh: bool = False,
+    pattern: str = "",
+    filter: str = "",
+    offset: int = 0,
+    limit: int = LIST_ACTORS_PAGE_SIZE,
+    format: str = "detailed",
+    fields: str = "name,class,location"
 ) -> str:
     """
     📋 List All Actors in Scene
@@ -638,6 +3940,14 @@ async def list_actors(
     
     Args:
         filter_type: Type of actors to list ("all", "lights", "meshes", "cameras", "audio")
+        refresh: Re-read the actor list from Unreal instead of the scene cache
+        pattern: Glob over actor names, e.g. "Tower_*" or "*_1712345678"
+        filter: Comma-separated terms - "class:PointLight|SpotLight", "prefix:Coral_",
+                "tag:Props", "timestamp:1712345678" or "timestamp:1712340000-1712349999"
+        offset: Index of the first actor to list, for paging through large levels
+        limit: Actors per page (0 lists every match)
+        format: "detailed" (one block per actor) or "table" (one compact row per actor)
+        fields: Comma-separated fields to show - any of name, class, location
     
     Returns:
         Detailed list of actors with their properties
@@ -645,56 +3955,145 @@ async def list_actors(
     
     logger.info(f"Listing actors with filter: {filter_type}")
     
+    columns = [field.strip().lower() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in columns if field not in ACTOR_LIST_FIELDS]
+    if unknown or not columns:
+        return f"❌ Unknown fields {', '.join(unknown) or '(none)'} - use {', '.join(ACTOR_LIST_FIELDS)}"
+    if format not in ("detailed", "table"):
+        return f"❌ Unknown format '{format}' - use detailed or table"
+    offset = max(0, offset)
+    
     try:
-        ue_client = UnrealConnection()
-        response = await ue_client.send_command("get_all_actors", {})
+        ue_client = get_unreal_connection()
+        classes = ACTOR_TYPE_FILTERS.get(filter_type)
+        if classes or pattern or filter or limit <= 0:
+            # Filters are answered from the full list in the scene cache
+            actors = await ue_client.get_actors(refresh=refresh)
+            if actors is not None and (classes or pattern or filter):
+                actors = ue_client.scene.query(pattern, filter, classes)
+            page = None if actors is None else (actors[offset:offset + limit] if limit > 0 else actors[offset:],
+                                                len(actors))
+        else:
+            page = await ue_client.get_actors_page(offset, limit, refresh=refresh)
         
-        if response.get("status") == "success":
-            actors = response.get("actors", [])
-            
-            # Filter actors based on type
-            if filter_type != "all":
-                type_filters = {
-                    "lights": ["PointLight", "DirectionalLight", "SpotLight", "SkyLight"],
-                    "meshes": ["StaticMeshActor", "SkeletalMeshActor"],
-                    "cameras": ["CameraActor", "PlayerCameraManager"],
-                    "audio": ["AudioSource", "SoundActor"]
-                }
-                
-                if filter_type in type_filters:
-                    actors = [a for a in actors if a.get("class") in type_filters[filter_type]]
-            
-            response_text = f"📋 **Scene Actor List** ({filter_type})\n\n"
-            response_text += f"📊 **Total Actors Found**: {len(actors)}\n\n"
-            
-            for i, actor in enumerate(actors, 1):
-                name = actor.get("name", "Unknown")
-                actor_class = actor.get("class", "Unknown")
-                location = actor.get("location", {})
-                
-                response_text += f"**{i}. {name}**\n"
-                response_text += f"   🏷️ Type: {actor_class}\n"
-                
-                if location:
-                    x = location.get("x", 0)
-                    y = location.get("y", 0) 
-                    z = location.get("z", 0)
-                    response_text += f"   📍 Location: ({x:.1f}, {y:.1f}, {z:.1f})\n"
-                
-                response_text += "\n"
-            
-            return response_text
+        if page is None:
+            return "❌ Failed to retrieve actor list from Unreal Engine"
         
-        return "❌ Failed to retrieve actor list from Unreal Engine"
+        actors, total = page
+        lines = [f"📋 **Scene Actor List** ({filter_type})\n",
+                 f"📊 **Total Actors Found**: {total}\n"]
+        lines.extend(format_actor_list(actors, offset + 1, columns, table=(format == "table")))
+        if actors and (offset or offset + len(actors) < total):
+            lines.append(f"\n📄 Showing {offset + 1}-{offset + len(actors)} of {total}")
+            if offset + len(actors) < total:
+                lines.append(f"➡️ Next page: offset={offset + len(actors)}")
+        elif not actors and offset:
+            lines.append(f"📄 Offset {offset} is past the last actor")
+        return "\n".join(lines) + "\n"
         
     except Exception as e:
         logger.error(f"List actors failed: {e}")
         return f"❌ **List Actors Failed**: {str(e)}"
 
+def format_actor_list(actors: List[Dict[str, Any]], first: int, columns: List[str], table: bool) -> List[str]:
+    """Lines for list_actors - a markdown table or one block per actor, numbered from `first`"""
+    
+    def cell(actor: Dict[str, Any], field: str) -> str:
+        if field == "location":
+            location = actor.get("location") or {}
+            if not location:
+                return "-"
+            return f"({location.get('x', 0):.1f}, {location.get('y', 0):.1f}, {location.get('z', 0):.1f})"
+        return str(actor.get(field, "Unknown"))
+    
+    if table:
+        lines = ["| # | " + " | ".join(columns) + " |", "|---" * (len(columns) + 1) + "|"]
+        lines.extend(f"| {i} | " + " | ".join(cell(actor, field) for field in columns) + " |"
+                     for i, actor in enumerate(actors, first))
+        return lines
+    
+    labels = {"class": "   🏷️ Type: ", "location": "   📍 Location: "}
+    lines = []
+    for i, actor in enumerate(actors, first):
+        if "name" in columns:
+            lines.append(f"**{i}. {actor.get('name', 'Unknown')}**")
+        else:
+            lines.append(f"**{i}.**")
+        for field in columns:
+            if field != "name" and (field != "location" or actor.get("location")):
+                lines.append(labels[field] + cell(actor, field))
+        lines.append("")
+    return lines
+
+@mcp.tool()
+@timed_tool
+async def find_actors_in_region(
+    x: float,
+    y: float,
+    z: float,
+    radius: float = 500.0,
+    box_extent: Optional[List[float]] = None,
+    refresh: bool = False,
+    limit: int = 100
+) -> str:
+    """
+    📍 Find Actors in a Region
+    
+    List actors near a point, answered from the scene cache's spatial grid.
+    
+    Args:
+        x: X coordinate of the region center
+        y: Y coordinate of the region center
+        z: Z coordinate of the region center
+        radius: Search radius around the center (used when box_extent is not given)
+        box_extent: Optional [ex, ey, ez] half-sizes to search an axis-aligned box instead
+        refresh: Re-read the actor list from Unreal instead of the scene cache
+        limit: Maximum number of actors to list
+    
+    Returns:
+        Actors in the region, nearest first
+    """
+    
+    logger.info(f"Finding actors near ({x}, {y}, {z})")
+    
+    try:
+        ue_client = get_unreal_connection()
+        if await ue_client.get_actors(refresh=refresh) is None:
+            return "❌ Failed to retrieve actor list from Unreal Engine"
+        
+        scene = ue_client.scene
+        if box_extent:
+            ex, ey, ez = (abs(float(value)) for value in box_extent[:3])
+            names = scene.spatial.query_box((x - ex, y - ey, z - ez), (x + ex, y + ey, z + ez))
+            hits = sorted(((name, math.dist((x, y, z), scene.spatial.points[name])) for name in names),
+                          key=lambda hit: hit[1])
+            region = f"box ±({ex:.0f}, {ey:.0f}, {ez:.0f})"
+        else:
+            hits = scene.spatial.query_radius((x, y, z), radius)
+            region = f"radius {radius:.0f}"
+        
+        lines = [f"📍 **Actors in Region** ({region} around ({x:.1f}, {y:.1f}, {z:.1f}))\n",
+                 f"📊 **Total Actors Found**: {len(hits)}\n"]
+        for i, (name, distance) in enumerate(hits[:limit], 1):
+            actor = scene.actors.get(name, {})
+            lines.append(f"**{i}. {name}** - {actor.get('class', 'Unknown')}, {distance:.1f} units away")
+        if len(hits) > limit:
+            lines.append(f"\n... and {len(hits) - limit} more")
+        return "\n".join(lines) + "\n"
+        
+    except Exception as e:
+        logger.error(f"Find actors in region failed: {e}")
+        return f"❌ **Find Actors Failed**: {str(e)}"
+
 @mcp.tool()
+@timed_tool
 async def delete_actors(
-    actor_names: str,
-    confirm: bool = False
+    actor_names: str = "",
+    confirm: bool = False,
+    refresh: bool = False,
+    pattern: str = "",
+    filter: str = "",
+    ctx: Context = None
 ) -> str:
     """
     🗑️ Delete Specific Actors
@@ -702,8 +4101,14 @@ async def delete_actors(
     Remove specific actors from the scene by name or pattern.
     
     Args:
-        actor_names: Comma-separated list of actor names or patterns to delete
+        actor_names: Comma-separated list of actor names or glob patterns to delete
         confirm: Set to True to confirm deletion
+        refresh: Re-read the actor list from Unreal before matching patterns
+        pattern: Glob over actor names, e.g. "Coral_*"
+        filter: Index terms as in list_actors, e.g. "class:PointLight,timestamp:1712345678"
+        
+    Actors matched by a pattern or filter never include protected classes
+    (WorldSettings, PlayerStart, ...).
     
     Returns:
         Status of deletion operation
@@ -711,30 +4116,38 @@ async def delete_actors(
     
     if not confirm:
         return "⚠️ Actor deletion requires confirmation. Use delete_actors(actor_names='...', confirm=True)"
+    if not (actor_names or pattern or filter):
+        return "⚠️ Nothing to delete - pass actor_names, pattern or filter"
     
     logger.info(f"Deleting actors: {actor_names}")
     
     try:
-        ue_client = UnrealConnection()
-        names_to_delete = [name.strip() for name in actor_names.split(",")]
-        deleted_count = 0
-        failed_deletes = []
-        
-        for actor_name in names_to_delete:
-            delete_result = await ue_client.send_command("delete_actor", {
-                "actor_name": actor_name
-            })
-            
-            if delete_result.get("status") == "success":
-                deleted_count += 1
-            else:
-                failed_deletes.append(actor_name)
+        ue_client = get_unreal_connection()
+        names_to_delete = []
+        patterns = [pattern] if pattern else []
+        for name in (name.strip() for name in actor_names.split(",")):
+            if name:
+                (patterns if ActorIndex.is_pattern(name) else names_to_delete).append(name)
+                
+        if patterns or filter:
+            if await ue_client.get_actors(refresh=refresh) is None:
+                return "❌ Failed to retrieve actor list from Unreal Engine for pattern matching"
+            for name_pattern in patterns or [""]:
+                names_to_delete.extend(
+                    actor["name"] for actor in ue_client.scene.query(name_pattern, filter)
+                    if actor.get("class") not in PROTECTED_ACTOR_CLASSES
+                )
+        names_to_delete = list(dict.fromkeys(names_to_delete))
+        if not names_to_delete:
+            return "⚠️ No actors matched - nothing was deleted"
+        
+        results = await ue_client.delete_actors_bulk(names_to_delete, progress=progress_reporter(ctx))
         
         response = f"🗑️ **Actor Deletion Complete**\n\n"
-        response += f"✅ Successfully deleted: {deleted_count} actors\n"
+        response += f"✅ Successfully deleted: {len(results['deleted'])} actors\n"
         
-        if failed_deletes:
-            response += f"❌ Failed to delete: {', '.join(failed_deletes)}\n"
+        if results["failed"]:
+            response += summarize_delete_failures(results["failed"])
         
         return response
         
@@ -743,6 +4156,7 @@ async def delete_actors(
         return f"❌ **Delete Actors Failed**: {str(e)}"
 
 @mcp.tool()
+@timed_tool
 async def move_actor(
     actor_name: str,
     x: float,
@@ -752,7 +4166,9 @@ async def move_actor(
     """
     🎯 Move Actor to New Location
     
-    Move a specific actor to a new position in 3D space.
+    Move a specific actor to a new position in 3D space. Moves arriving within
+    TRANSFORM_FLUSH_WINDOW of each other are batched, and repeated moves of the
+    same actor collapse into the last one.
     
     Args:
         actor_name: Name of the actor to move
@@ -767,11 +4183,8 @@ async def move_actor(
     logger.info(f"Moving actor {actor_name} to ({x}, {y}, {z})")
     
     try:
-        ue_client = UnrealConnection()
-        result = await ue_client.send_command("set_actor_location", {
-            "actor_name": actor_name,
-            "location": {"x": x, "y": y, "z": z}
-        })
+        ue_client = get_unreal_connection()
+        result = await ue_client.transforms.move(actor_name, location=[x, y, z])
         
         if result.get("status") == "success":
             return f"✅ **Actor Moved Successfully**\n\n🎯 {actor_name} moved to position ({x}, {y}, {z})"
@@ -783,6 +4196,59 @@ async def move_actor(
         return f"❌ **Move Actor Failed**: {str(e)}"
 
 @mcp.tool()
+@timed_tool
+async def move_actors(
+    transforms: List[Dict[str, Any]]
+) -> str:
+    """
+    🎯 Move Many Actors at Once
+    
+    Move, rotate or scale a list of actors using batched commands. Several
+    transforms for the same actor collapse into one command (last write wins per
+    field), so animation frames or layout tweaks cost one command per actor.
+    
+    Args:
+        transforms: Each with "name" and any of "location" [x, y, z],
+                    "rotation" [pitch, yaw, roll] and "scale" [x, y, z]
+                    Example: [{"name": "Cube_1", "location": [0, 0, 300], "rotation": [0, 90, 0]}]
+    
+    Returns:
+        Summary of moved actors, commands saved by coalescing and any failures
+    """
+    
+    logger.info(f"Moving {len(transforms)} actors in batch")
+    
+    try:
+        invalid = [i for i, transform in enumerate(transforms)
+                   if not transform.get("name") or not any(key in transform for key in ("location", "rotation", "scale"))]
+        if invalid:
+            return (f"❌ Every transform needs a name and a location, rotation or scale "
+                    f"(invalid at positions: {', '.join(map(str, invalid[:10]))})")
+        
+        queue = get_unreal_connection().transforms
+        futures = {}
+        for transform in transforms:
+            futures[transform["name"]] = queue.put(transform["name"], transform.get("location"),
+                                                   transform.get("rotation"), transform.get("scale"))
+        await queue.flush()
+        replies = await asyncio.gather(*futures.values())
+        
+        failed = [{"name": name, "error": reply.get("error", "Unknown error")}
+                  for name, reply in zip(futures, replies) if reply.get("status") != "success"]
+        response = f"🎯 **Batch Move Complete**\n\n"
+        response += f"✅ Moved: {len(futures) - len(failed)} of {len(futures)} actors\n"
+        response += (f"📦 {len(transforms)} transforms sent as {len(futures)} commands "
+                     f"({len(transforms) - len(futures)} coalesced away)\n")
+        if failed:
+            response += "\n## ⚠️ Issues Encountered:\n" + summarize_delete_failures(failed)
+        return response
+        
+    except Exception as e:
+        logger.error(f"Batch move failed: {e}")
+        return f"❌ **Batch Move Failed**: {str(e)}"
+
+@mcp.tool()
+@timed_tool
 async def save_level(
     level_name: str = ""
 ) -> str:
@@ -801,7 +4267,7 @@ async def save_level(
     logger.info(f"Saving level: {level_name}")
     
     try:
-        ue_client = UnrealConnection()
+        ue_client = get_unreal_connection()
         result = await ue_client.send_command("save_level", {
             "level_name": level_name if level_name else None
         })
@@ -815,5 +4281,206 @@ async def save_level(
         logger.error(f"Save level failed: {e}")
         return f"❌ **Save Level Failed**: {str(e)}"
 
+@mcp.tool()
+@timed_tool
+async def apply_scene(
+    spec: str,
+    dry_run: bool = False,
+    refresh: bool = False
+) -> str:
+    """
+    🗺️ Apply Scene Spec
+    
+    Build or update a scene from a declarative document listing actors, lights and
+    layouts. Applying the same spec again sends nothing; after an edit, only the
+    changed actors are spawned, moved or deleted.
+    
+    Args:
+        spec: Path to a .json/.yaml/.toml scene file, or the document itself, with a
+              "scene" name identifying it between applies, e.g.
+              {"scene": "plaza", "actors": [{"name": "Fountain", "location": [0, 0, 0]}],
+               "lights": [{"name": "Lamp", "location": [0, 0, 400], "color": "orange"}],
+               "layouts": [{"name": "Pillar", "shape": "ring", "count": 12, "radius": 800}]}
+        dry_run: Only report what would change
+        refresh: Re-read the actor list from Unreal instead of the scene cache
+    
+    Returns:
+        Counts of unchanged, spawned, moved and deleted actors
+    """
+    
+    logger.info(f"Applying scene spec ({len(spec)} chars)")
+    
+    try:
+        document = load_scene_spec(spec)
+        report = await apply_scene_spec(get_unreal_connection(), document, dry_run=dry_run, refresh=refresh)
+        diff = report["diff"]
+        lines = [f"🗺️ **Scene '{report['scene']}'{' (dry run)' if dry_run else ''}**: {report['actors']} actors\n",
+                 f"✅ {diff.unchanged} unchanged"]
+        if dry_run:
+            lines.append(f"📤 Would send {len(diff.spawns)} spawns, {len(diff.moves) + len(diff.transforms)} moves and "
+                         f"{len(diff.deletes)} deletes ({report['removed']} of them for actors dropped from the spec)")
+        elif len(diff):
+            lines.append(f"📤 Spawned {report['spawned']}, moved {report['moved']}, deleted {report['deleted']}")
+            if report["failed"]:
+                lines.append("")
+                lines.append(summarize_delete_failures(
+                    [{"name": failure["name"], "error": f"{failure['command']}: {failure['error']}"}
+                     for failure in report["failed"]]).rstrip())
+        else:
+            lines.append("📭 Nothing to send - the level already matches the spec")
+        if report.get("state_error"):
+            lines.append(f"\n⚠️ Scene state not saved ({report['state_error']}) - kept in memory until the "
+                         f"server restarts; set VHCI_SCENE_STATE_DIR to a writable directory")
+        return "\n".join(lines) + "\n"
+        
+    except ValueError as e:
+        return f"❌ **Invalid Scene Spec**: {str(e)}"
+    except Exception as e:
+        logger.error(f"Apply scene failed: {e}")
+        return f"❌ **Apply Scene Failed**: {str(e)}"
+
+@mcp.tool()
+@timed_tool
+async def replay_journal(
+    path: str = "",
+    dry_run: bool = False
+) -> str:
+    """
+    ♻️ Rebuild Scene from Journal
+    
+    Restore the level recorded in a scene journal, e.g. after an editor crash.
+    Only actors that are missing, misplaced or should have been deleted are sent,
+    so a mostly intact level costs a handful of commands.
+    
+    Args:
+        path: Journal file to replay (defaults to SCENE_JOURNAL_PATH)
+        dry_run: Only report what would be sent
+    
+    Returns:
+        Counts of spawned, moved and deleted actors
+    """
+    
+    path = path or SCENE_JOURNAL_PATH or ""
+    logger.info(f"Replaying journal: {path}")
+    if not path:
+        return "❌ No journal given - pass a path or set SCENE_JOURNAL_PATH"
+    
+    try:
+        report = await replay_journal_file(get_unreal_connection(), path, dry_run=dry_run)
+        diff = report["diff"]
+        lines = [f"♻️ **Journal Replay{' (dry run)' if dry_run else ''}**: {path}\n",
+                 f"📜 {report['entries']} journal entries → {report['actors']} actors",
+                 f"✅ {diff.unchanged} already in place"]
+        if dry_run:
+            lines.append(f"📤 Would send {len(diff.spawns)} spawns, {len(diff.moves) + len(diff.transforms)} moves, "
+                         f"{len(diff.deletes)} deletes and {report['other']} other commands")
+        else:
+            lines.append(f"📤 Spawned {report['spawned']}, moved {report['moved']}, deleted {report['deleted']}, "
+                         f"replayed {report['other']} other commands")
+            if report["failed"]:
+                lines.append("")
+                lines.append(summarize_delete_failures(
+                    [{"name": failure["name"], "error": f"{failure['command']}: {failure['error']}"}
+                     for failure in report["failed"]]).rstrip())
+        return "\n".join(lines) + "\n"
+        
+    except Exception as e:
+        logger.error(f"Journal replay failed: {e}")
+        return f"❌ **Journal Replay Failed**: {str(e)}"
+
+@mcp.tool()
+async def get_performance_stats(
+    format: str = "summary",
+    reset: bool = False,
+    path: str = ""
+) -> str:
+    """
+    📈 Performance Statistics
+    
+    Latency, throughput and error counts for every command sent to Unreal and
+    every tool call since startup (or the last reset), to tell whether the editor
+    or this server is the bottleneck.
+    
+    Args:
+        format: "summary" (markdown), "json" (also includes connection pool, scene
+                cache, move queue and parse cache stats) or "prometheus" (text exposition)
+        reset: Clear the recorded metrics after reading them
+        path: Also write the output to this file name (no directories) under
+              $VHCI_STATS_DIR (default ~/.cache/vhci-stats)
+    
+    Returns:
+        The statistics in the requested format
+    """
+    
+    if format not in ("summary", "json", "prometheus"):
+        return f"❌ Unknown format '{format}' - use summary, json or prometheus"
+    
+    ue_client = get_unreal_connection()
+    snapshot = METRICS.snapshot()
+    if format == "prometheus":
+        output = METRICS.prometheus()
+    elif format == "json":
+        output = json.dumps(dict(snapshot, pool=ue_client.pool.stats(), transport=ue_client.policy.stats(),
+                                 scene_cache=ue_client.scene.stats(), transforms=ue_client.transforms.stats(),
+                                 parse_cache=PARSE_CACHE.stats()), indent=2)
+    else:
+        output = format_performance_summary(snapshot, ue_client.pool.stats(), ue_client.policy.stats(),
+                                            ue_client.transforms.stats())
+        
+    if path and (os.path.basename(path) != path or path in (".", "..")):
+        return f"❌ '{path}' is not a plain file name - stats are only written to {METRICS_EXPORT_DIR}"
+        
+    if reset:
+        METRICS.reset()
+    if path:
+        target = os.path.join(METRICS_EXPORT_DIR, path)
+        try:
+            os.makedirs(METRICS_EXPORT_DIR, exist_ok=True)
+            with open(target, "w") as handle:
+                handle.write(output)
+        except OSError as e:
+            return f"❌ Could not write {target}: {e}"
+        return f"📈 Performance stats ({format}) written to {target}"
+    return output
+
+def format_performance_summary(snapshot: Dict[str, Any], pool: Dict[str, Any], transport: Dict[str, Any],
+                               transforms: Optional[Dict[str, Any]] = None) -> str:
+    """Markdown view of PerformanceMetrics.snapshot() for get_performance_stats"""
+    response = f"📈 **Performance Statistics** (since {snapshot['since']})\n\n"
+    if not snapshot["commands"] and not snapshot["tools"]:
+        return response + "No commands or tool calls recorded yet."
+    
+    if snapshot["commands"]:
+        response += "## Commands (ms)\n"
+        response += "| command | count | p50 | p95 | p99 | connect p50 | first byte p50 | bytes out | bytes in | errors |\n"
+        response += "|---|---|---|---|---|---|---|---|---|---|\n"
+        for command_type, entry in snapshot["commands"].items():
+            latency = entry["latency_ms"]
+            total = latency.get("total", {})
+            errors = ", ".join(f"{category} {count}" for category, count in entry["errors"].items()) or "-"
+            response += (f"| {command_type} | {total.get('count', 0)} | {total.get('p50', 0):.1f} | "
+                         f"{total.get('p95', 0):.1f} | {total.get('p99', 0):.1f} | "
+                         f"{latency.get('connect', {}).get('p50', 0):.1f} | "
+                         f"{latency.get('first_byte', {}).get('p50', 0):.1f} | "
+                         f"{entry['bytes'].get('out', 0):,} | {entry['bytes'].get('in', 0):,} | {errors} |\n")
+        if snapshot["unreal_wait_share"] is not None:
+            response += (f"\n⏱️ {snapshot['unreal_wait_share']:.0%} of command time was spent waiting for "
+                         f"Unreal's first reply byte; the rest is connecting, sending and decoding on our side.\n")
+        response += (f"🔌 In flight: {snapshot['in_flight']} (peak {snapshot['peak_in_flight']}) · "
+                     f"connects {pool['connects']}, reuses {pool['reuses']}"
+                     f"{' · multiplexed' if pool['multiplexed'] else ''}\n")
+        response += (f"🛡️ Circuit {transport['state']} · opened {transport['opened']}x, "
+                     f"{transport['fast_failures']} fast failures, {transport['retries']} retries\n")
+        if transforms and transforms["queued"]:
+            response += (f"🎯 Moves: {transforms['queued']} queued, {transforms['coalesced']} coalesced away, "
+                         f"{transforms['sent']} commands in {transforms['flushes']} batches\n")
+        
+    if snapshot["tools"]:
+        response += "\n## Tools (ms)\n| tool | calls | p50 | p95 | max | failures |\n|---|---|---|---|---|---|\n"
+        for tool, summary in snapshot["tools"].items():
+            response += (f"| {tool} | {summary['count']} | {summary['p50']:.1f} | {summary['p95']:.1f} | "
+                         f"{summary['max']:.1f} | {summary['failures']} |\n")
+    return response
+
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file